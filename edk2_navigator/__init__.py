@@ -33,18 +33,24 @@ __author__ = "EDK2 Navigator Development Team"
 from .dsc_parser import DSCParser, DSCContext, ModuleInfo
 from .dependency_graph import DependencyGraphBuilder, DependencyGraph
 from .cache_manager import CacheManager
+from .parse_cache import ParseCache
 from .utils import (
     validate_edk2_workspace,
     parse_dsc_section,
     parse_inf_file,
+    enable_parse_cache,
+    disable_parse_cache,
     normalize_path,
     find_inf_files,
+    iter_inf_files,
     extract_module_path_from_component,
     resolve_build_flags,
     is_conditional_line,
     evaluate_conditional,
+    make_conditional_evaluator,
     get_edk2_module_type,
-    get_edk2_module_guid
+    get_edk2_module_guid,
+    get_edk2_defines
 )
 from .exceptions import (
     EDK2NavigatorError,
@@ -72,19 +78,25 @@ __all__ = [
     'DependencyGraphBuilder',
     'DependencyGraph',
     'CacheManager',
+    'ParseCache',
     
     # Utility functions
     'validate_edk2_workspace',
     'parse_dsc_section',
     'parse_inf_file',
+    'enable_parse_cache',
+    'disable_parse_cache',
     'normalize_path',
     'find_inf_files',
+    'iter_inf_files',
     'extract_module_path_from_component',
     'resolve_build_flags',
     'is_conditional_line',
     'evaluate_conditional',
+    'make_conditional_evaluator',
     'get_edk2_module_type',
     'get_edk2_module_guid',
+    'get_edk2_defines',
     
     # Exceptions
     'EDK2NavigatorError',
@@ -5,8 +5,8 @@ import os
 import sys
 import json
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
 
 # Add EDK2 BaseTools to Python path
@@ -42,6 +42,8 @@ class DSCContext:
     build_target: str
     toolchain: str
     timestamp: datetime
+    # Path -> (mtime_ns, size) of every file the parse read or looked for; None if missing
+    input_files: Dict[str, Optional[Tuple[int, int]]] = field(default_factory=dict)
 
 class DSCParser:
     """Parser for EDK2 DSC files using BaseTools"""
@@ -83,6 +85,11 @@ class DSCParser:
                 "TOOLCHAIN": "VS2019"
             }
         
+        from .utils import file_stamp
+        
+        # Stamped before reading so an edit made during the parse still shows up later
+        input_files = {str(dsc_path): file_stamp(dsc_path)}
+        
         # Read and parse DSC file content
         try:
             with open(dsc_path, 'r', encoding='utf-8', errors='ignore') as f:
@@ -91,7 +98,7 @@ class DSCParser:
             raise FileNotFoundError(f"Could not read DSC file {dsc_path}: {e}")
         
         # Parse DSC content
-        included_modules = self._parse_components_section(dsc_content, dsc_path)
+        included_modules = self._parse_components_section(dsc_content, dsc_path, input_files)
         library_mappings = self._parse_library_classes_section(dsc_content)
         preprocessor_definitions = self._parse_defines_section(dsc_content)
         
@@ -106,12 +113,14 @@ class DSCParser:
             architecture=build_flags.get("ARCH", "X64"),
             build_target=build_flags.get("TARGET", "DEBUG"),
             toolchain=build_flags.get("TOOLCHAIN", "VS2019"),
-            timestamp=datetime.now()
+            timestamp=datetime.now(),
+            input_files=input_files
         )
     
-    def _parse_components_section(self, dsc_content: str, dsc_path: Path) -> List[ModuleInfo]:
+    def _parse_components_section(self, dsc_content: str, dsc_path: Path,
+                                  input_files: Optional[Dict[str, Optional[Tuple[int, int]]]] = None) -> List[ModuleInfo]:
         """Parse [Components] section and extract module information"""
-        from .utils import parse_dsc_section, extract_module_path_from_component, parse_inf_file
+        from .utils import parse_dsc_section, extract_module_path_from_component, parse_inf_file, file_stamp
         
         components = parse_dsc_section(dsc_content, 'Components')
         modules = []
@@ -122,17 +131,21 @@ class DSCParser:
             if not module_path:
                 continue
             
-            # Resolve full path to INF file
-            # First try relative to workspace root
-            inf_path = self.workspace_dir / module_path
-            if not inf_path.exists():
-                # Try relative to EDK2 directory (most common case)
-                inf_path = self.edk2_path / module_path
-                if not inf_path.exists():
-                    # Try relative to DSC file directory
-                    inf_path = dsc_path.parent / module_path
-                    if not inf_path.exists():
-                        continue
+            # Resolve full path to INF file: relative to the workspace root, then
+            # the EDK2 directory (most common case), then the DSC file's directory
+            inf_path = None
+            for candidate in (self.workspace_dir / module_path,
+                              self.edk2_path / module_path,
+                              dsc_path.parent / module_path):
+                stamp = file_stamp(candidate)
+                if input_files is not None:
+                    # A missing candidate appearing later changes which INF is used
+                    input_files[str(candidate)] = stamp
+                if stamp is not None:
+                    inf_path = candidate
+                    break
+            if inf_path is None:
+                continue
             
             # Parse INF file to get module information
             inf_info = parse_inf_file(str(inf_path))
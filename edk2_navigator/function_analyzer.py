@@ -3,14 +3,179 @@ Function Analyzer - Parses source files to extract function information
 """
 import re
 import os
+import sys
+import pickle
+import hashlib
+import bisect
+import functools
+import itertools
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Set, Optional, Tuple
+from typing import List, Dict, Set, Optional, Tuple, Union
 from dataclasses import dataclass
 from .query_engine import FunctionLocation
 
+try:
+    import orjson  # Optional: faster, non-executable format for the disk cache
+except ImportError:
+    orjson = None
+
+# Names that look like calls but are C keywords or operators
+_NON_CALL_NAMES = ('IF', 'FOR', 'WHILE', 'SWITCH', 'SIZEOF', 'RETURN')
+
+# EDK2-specific names the patterns are built from
+_EDK2_CALLING_CONVENTIONS = ('EFIAPI', 'WINAPI', '__cdecl', '__stdcall')
+_EDK2_TYPES = ('EFI_STATUS', 'BOOLEAN', 'UINT8', 'UINT16', 'UINT32', 'UINT64',
+               'UINTN', 'INTN', 'VOID', 'CHAR8', 'CHAR16', 'EFI_HANDLE',
+               'EFI_GUID', 'EFI_BOOT_SERVICES', 'EFI_RUNTIME_SERVICES')
+_EDK2_KEYWORDS = ('IN', 'OUT', 'OPTIONAL', 'CONST')
+
+# Tokens that matter when matching function braces
+_BRACE_SCAN_PATTERN = re.compile(r'[{}"\']|/[*/]')
+
+# Tokens that matter when splitting a parameter list
+_PARAMETER_SPLIT_PATTERN = re.compile(r'[(),]')
+
+_NEWLINE_PATTERN = re.compile('\n')
+
+# Source files above this size are analyzed in sections
+MAX_ANALYZE_BYTES = 8 * 1024 * 1024
+_ANALYZE_CHUNK_CHARS = 1024 * 1024
+
+# Distinct parameter lists remembered per analyzer
+_PARAMETER_CACHE_SIZE = 8192
+
+def _skip_literal(content: str, pos: int, quote: str) -> int:
+    """Return the position just past a string/char literal whose opening quote ends at pos"""
+    while True:
+        close = content.find(quote, pos)
+        if close == -1:
+            return len(content)
+        
+        # A quote preceded by an odd number of backslashes is escaped
+        backslashes = 0
+        while close - backslashes > pos and content[close - 1 - backslashes] == '\\':
+            backslashes += 1
+        if backslashes % 2 == 0:
+            return close + 1
+        pos = close + 1
+
+def _newline_offsets(content: str) -> List[int]:
+    """Offsets of every newline in the content, in ascending order"""
+    return [match.start() for match in _NEWLINE_PATTERN.finditer(content)]
+
+def _line_at(newlines: List[int], pos: int) -> int:
+    """1-based line number of a position, given the content's newline offsets"""
+    return bisect.bisect_left(newlines, pos) + 1
+
+def _decode(data: bytes) -> str:
+    """Decode a slice of source bytes"""
+    return data.decode('utf-8', errors='ignore')
+
+def _char_offset(source: bytes, byte_offset: int, point: Tuple[int, int],
+                 line_starts: Optional[List[int]]) -> int:
+    """Character offset of a byte offset, given its tree-sitter (row, byte column) point
+    
+    line_starts holds each line's character offset, or None for pure ASCII source.
+    """
+    if line_starts is None:
+        return byte_offset
+    
+    # Only the part of the line before the offset needs decoding
+    row, column = point
+    return line_starts[row] + len(_decode(source[byte_offset - column:byte_offset]))
+
+def _load_tree_sitter_parser():
+    """Build a tree-sitter parser for C (optional dependency)"""
+    try:
+        from tree_sitter import Parser
+        from tree_sitter_languages import get_language
+    except ImportError:
+        raise ImportError("tree-sitter packages not installed. Install with: pip install tree-sitter tree-sitter-languages")
+    
+    language = get_language("c")
+    try:
+        return Parser(language)
+    except TypeError:
+        # Older bindings take the language after construction
+        parser = Parser()
+        parser.set_language(language)
+        return parser
+
+@functools.lru_cache(maxsize=None)
+def _function_patterns(calling_conventions: Tuple[str, ...], keywords: Tuple[str, ...]):
+    """Compile the function parsing patterns for a set of EDK2 conventions and keywords"""
+    # Enhanced function definition pattern with parameter parsing
+    calling_conv = '|'.join(calling_conventions)
+    
+    # Function definition with full signature capture. Leading indentation is
+    # limited to the signature's own line so a match never sweeps across blank
+    # lines, and re.ASCII keeps \w/\s on the fast ASCII tables.
+    function_def_pattern = re.compile(
+        r'^[ \t]*((?:STATIC\s+)?(?:INLINE\s+)?)'  # Optional STATIC/INLINE
+        r'(\w+(?:\s*\*)*)\s+'                    # Return type
+        r'(?:(' + calling_conv + r')\s+)?'       # Optional calling convention
+        r'(\w+)\s*'                              # Function name
+        r'\(([^)]*)\)\s*'                        # Parameters
+        r'\{',                                   # Opening brace
+        re.MULTILINE | re.ASCII
+    )
+    
+    # Function declaration pattern
+    function_decl_pattern = re.compile(
+        r'^[ \t]*((?:STATIC\s+)?(?:INLINE\s+)?)'  # Optional STATIC/INLINE
+        r'(\w+(?:\s*\*)*)\s+'                    # Return type
+        r'(?:(' + calling_conv + r')\s+)?'       # Optional calling convention
+        r'(\w+)\s*'                              # Function name
+        r'\(([^)]*)\)\s*'                        # Parameters
+        r';',                                    # Semicolon
+        re.MULTILINE | re.ASCII
+    )
+    
+    # Definitions and declarations together, told apart by the character after
+    # the parameter list, so one scan finds both
+    function_signature_pattern = re.compile(
+        r'^[ \t]*((?:STATIC\s+)?(?:INLINE\s+)?)'  # Optional STATIC/INLINE
+        r'(\w+(?:\s*\*)*)\s+'                    # Return type
+        r'(?:(' + calling_conv + r')\s+)?'       # Optional calling convention
+        r'(\w+)\s*'                              # Function name
+        r'\(([^)]*)\)\s*'                        # Parameters
+        r'([{;])',                               # Opening brace or semicolon
+        re.MULTILINE | re.ASCII
+    )
+    
+    # Function call pattern - only attempted at word starts, so an identifier
+    # that is not followed by '(' is rejected once rather than once per suffix
+    function_call_pattern = re.compile(
+        r'\b(\w+)\s*\(',
+        re.MULTILINE | re.ASCII
+    )
+    
+    # Parameter parsing pattern - handle pointer types properly
+    parameter_pattern = re.compile(
+        r'(?:\b(' + '|'.join(keywords) + r')\s+)?'  # Optional IN/OUT/OPTIONAL
+        r'(\w+)\s+'                                 # Base type
+        r'(\*?)(\w+)',                              # Optional pointer and name
+        re.MULTILINE | re.ASCII
+    )
+    
+    # Comment block pattern (for documentation)
+    comment_block_pattern = re.compile(
+        r'/\*\*(.*?)\*/',
+        re.DOTALL
+    )
+    
+    return (function_def_pattern, function_decl_pattern, function_signature_pattern,
+            function_call_pattern, parameter_pattern, comment_block_pattern)
+
 @dataclass
 class FunctionCall:
     """Represents a function call in source code"""
+    # No per-instance __dict__; a large tree holds hundreds of thousands of calls
+    __slots__ = ('caller_function', 'called_function', 'file_path', 'line_number',
+                 'line_content', 'call_context')
+    
     caller_function: str
     called_function: str
     file_path: str
@@ -21,6 +186,10 @@ class FunctionCall:
 @dataclass
 class FunctionDefinition:
     """Detailed function definition information"""
+    __slots__ = ('name', 'return_type', 'parameters', 'calling_convention', 'file_path',
+                 'line_number', 'end_line_number', 'signature', 'body_start', 'is_static',
+                 'is_inline', 'documentation')
+    
     name: str
     return_type: str
     parameters: List[Dict[str, str]]    # [{'type': 'UINT32', 'name': 'Value'}]
@@ -34,70 +203,162 @@ class FunctionDefinition:
     is_inline: bool
     documentation: str          # Comment block above function
 
+def _copy_definition(definition: FunctionDefinition) -> FunctionDefinition:
+    """Copy a definition, including its parameter dicts, so a caller's edits stay private"""
+    return FunctionDefinition(
+        definition.name, definition.return_type, [dict(param) for param in definition.parameters],
+        definition.calling_convention, definition.file_path, definition.line_number,
+        definition.end_line_number, definition.signature, definition.body_start,
+        definition.is_static, definition.is_inline, definition.documentation
+    )
+
+def _copy_call(call: FunctionCall) -> FunctionCall:
+    """Copy a call so a caller's edits stay private"""
+    return FunctionCall(call.caller_function, call.called_function, call.file_path,
+                        call.line_number, call.line_content, call.call_context)
+
+def _graph_from_calls(call_lists) -> Dict[str, List[str]]:
+    """Build caller -> unique callees, in first-call order"""
+    call_graph = {}
+    seen = set()
+    for calls in call_lists:
+        for call in calls:
+            edge = (call.caller_function, call.called_function)
+            if edge not in seen:
+                seen.add(edge)
+                call_graph.setdefault(edge[0], []).append(edge[1])
+    return call_graph
+
+class _CallIndex(dict):
+    """file_path -> List[FunctionCall] mapping that also indexes calls by callee"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._by_callee = None  # called_function -> List[FunctionCall], built lazily
+    
+    def __setitem__(self, file_path, calls):
+        replacing = file_path in self
+        super().__setitem__(file_path, calls)
+        
+        # New files extend the index in place; replacing one needs a rebuild to keep file order
+        if replacing:
+            self._by_callee = None
+        elif self._by_callee is not None:
+            self._add_to_index(calls)
+    
+    def __delitem__(self, file_path):
+        super().__delitem__(file_path)
+        self._by_callee = None
+    
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._by_callee = None
+    
+    def setdefault(self, file_path, calls=None):
+        self._by_callee = None
+        return super().setdefault(file_path, calls)
+    
+    def pop(self, *args):
+        self._by_callee = None
+        return super().pop(*args)
+    
+    def popitem(self):
+        self._by_callee = None
+        return super().popitem()
+    
+    def clear(self):
+        super().clear()
+        self._by_callee = None
+    
+    def _add_to_index(self, calls: List[FunctionCall]):
+        """Add one file's calls to the callee index"""
+        for call in calls:
+            self._by_callee[call.called_function].append(call)
+    
+    def _index(self) -> Dict[str, List[FunctionCall]]:
+        """Get the callee index, rebuilding it if the mapping changed"""
+        if self._by_callee is None:
+            self._by_callee = defaultdict(list)
+            for calls in self.values():
+                self._add_to_index(calls)
+        return self._by_callee
+    
+    def callers_of(self, function_name: str) -> List[FunctionCall]:
+        """All calls to a function, in file then line order"""
+        return list(self._index().get(function_name, ()))
+    
+    def caller_count(self, function_name: str) -> int:
+        """Number of calls to a function"""
+        return len(self._index().get(function_name, ()))
+
 class FunctionAnalyzer:
     """Analyzes source files to extract function definitions and calls"""
     
-    def __init__(self):
+    def __init__(self, parser_backend: str = "regex", cache_dir: Optional[str] = None):
+        if parser_backend not in ("regex", "tree-sitter"):
+            raise ValueError(f"Unknown parser backend: {parser_backend}")
+        
         self.function_definitions = {}  # file_path -> List[FunctionDefinition]
-        self.function_calls = {}        # file_path -> List[FunctionCall]
-        self.call_graph = {}           # function_name -> List[called_functions]
+        self.function_calls = {}        # file_path -> List[FunctionCall], indexed by callee
+        self._call_graph = None        # function_name -> List[called_functions], built on first use
+        
+        # Per-file analysis memo: abspath -> (mtime_ns, size, analysis)
+        self._file_cache: Dict[str, Tuple[int, int, Dict[str, List]]] = {}
+        
+        # Files larger than this are analyzed in sections rather than read whole
+        self.max_analyze_bytes = MAX_ANALYZE_BYTES
+        
+        # Optional on-disk cache for reuse across runs
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
         
         # EDK2-specific patterns
-        self.edk2_calling_conventions = ['EFIAPI', 'WINAPI', '__cdecl', '__stdcall']
-        self.edk2_types = ['EFI_STATUS', 'BOOLEAN', 'UINT8', 'UINT16', 'UINT32', 'UINT64',
-                          'UINTN', 'INTN', 'VOID', 'CHAR8', 'CHAR16', 'EFI_HANDLE',
-                          'EFI_GUID', 'EFI_BOOT_SERVICES', 'EFI_RUNTIME_SERVICES']
-        self.edk2_keywords = ['IN', 'OUT', 'OPTIONAL', 'CONST']
+        self.edk2_calling_conventions = list(_EDK2_CALLING_CONVENTIONS)
+        self.edk2_types = list(_EDK2_TYPES)
+        self.edk2_keywords = list(_EDK2_KEYWORDS)
         
         # Compile regex patterns
         self._compile_patterns()
+        
+        # The regex scanner stays the default; tree-sitter is opt-in because
+        # EDK2 macros such as EFIAPI and IN/OUT are not plain C to its grammar
+        self.parser_backend = parser_backend
+        self._ts_parser = _load_tree_sitter_parser() if parser_backend == "tree-sitter" else None
+    
+    @property
+    def function_calls(self) -> Dict[str, List[FunctionCall]]:
+        """Calls found per analyzed file"""
+        return self._function_calls
+    
+    @function_calls.setter
+    def function_calls(self, value: Dict[str, List[FunctionCall]]):
+        self._function_calls = _CallIndex(value)
+    
+    @property
+    def call_graph(self) -> Dict[str, List[str]]:
+        """Caller -> callees for every analyzed file, derived when first needed"""
+        if self._call_graph is None:
+            self._call_graph = _graph_from_calls(self.function_calls.values())
+        return self._call_graph
+    
+    @call_graph.setter
+    def call_graph(self, value: Dict[str, List[str]]):
+        self._call_graph = value
     
     def _compile_patterns(self):
         """Compile regex patterns for function parsing"""
-        # Enhanced function definition pattern with parameter parsing
-        calling_conv = '|'.join(self.edk2_calling_conventions)
-        
-        # Function definition with full signature capture
-        self.function_def_pattern = re.compile(
-            r'^\s*((?:STATIC\s+)?(?:INLINE\s+)?)'  # Optional STATIC/INLINE
-            r'(\w+(?:\s*\*)*)\s+'                  # Return type
-            r'(?:(' + calling_conv + r')\s+)?'     # Optional calling convention
-            r'(\w+)\s*'                            # Function name
-            r'\(([^)]*)\)\s*'                      # Parameters
-            r'\{',                                 # Opening brace
-            re.MULTILINE | re.DOTALL
-        )
-        
-        # Function declaration pattern
-        self.function_decl_pattern = re.compile(
-            r'^\s*((?:STATIC\s+)?(?:INLINE\s+)?)'  # Optional STATIC/INLINE
-            r'(\w+(?:\s*\*)*)\s+'                  # Return type
-            r'(?:(' + calling_conv + r')\s+)?'     # Optional calling convention
-            r'(\w+)\s*'                            # Function name
-            r'\(([^)]*)\)\s*'                      # Parameters
-            r';',                                  # Semicolon
-            re.MULTILINE | re.DOTALL
-        )
+        # Shared by every analyzer using the same conventions and keywords
+        (self.function_def_pattern,
+         self.function_decl_pattern,
+         self.function_signature_pattern,
+         self.function_call_pattern,
+         self.parameter_pattern,
+         self.comment_block_pattern) = _function_patterns(
+            tuple(self.edk2_calling_conventions), tuple(self.edk2_keywords))
         
-        # Function call pattern - more precise
-        self.function_call_pattern = re.compile(
-            r'(\w+)\s*\(',
-            re.MULTILINE
-        )
-        
-        # Parameter parsing pattern - handle pointer types properly
-        self.parameter_pattern = re.compile(
-            r'(?:(' + '|'.join(self.edk2_keywords) + r')\s+)?'  # Optional IN/OUT/OPTIONAL
-            r'(\w+)\s+'                                         # Base type
-            r'(\*?)(\w+)',                                      # Optional pointer and name
-            re.MULTILINE
-        )
-        
-        # Comment block pattern (for documentation)
-        self.comment_block_pattern = re.compile(
-            r'/\*\*(.*?)\*/',
-            re.DOTALL
-        )
+        # Parsed parameter lists depend on the keyword pattern
+        self._parameter_cache: Dict[str, Tuple[Tuple[str, str, str, str], ...]] = {}
     
     def analyze_source_file(self, file_path: str) -> Dict[str, List]:
         """Analyze a source file for functions and calls"""
@@ -111,19 +372,107 @@ class FunctionAnalyzer:
             return {'definitions': [], 'declarations': [], 'calls': []}
         
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-        except Exception:
+            st = os.stat(file_path)
+        except OSError:
             return {'definitions': [], 'declarations': [], 'calls': []}
         
-        # Extract function information
-        definitions = self._extract_function_definitions(content, str(file_path))
-        declarations = self._extract_function_declarations(content, str(file_path))
-        calls = self._extract_function_calls(content, str(file_path))
+        # Reuse the previous analysis while the file is unchanged
+        abs_path = os.path.abspath(file_path)
+        cached = self._file_cache.get(abs_path)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            analysis = cached[2]
+        else:
+            analysis = self._load_cached_analysis(abs_path, st)
+            if analysis is None:
+                try:
+                    if st.st_size > self.max_analyze_bytes:
+                        # Very large (usually generated) files are analyzed a section at a time
+                        analysis = self._analyze_chunked(file_path)
+                    else:
+                        analysis = self._analyze_content(self._read_source(file_path), str(file_path))
+                except Exception:
+                    return {'definitions': [], 'declarations': [], 'calls': []}
+                
+                self._store_cached_analysis(abs_path, st, analysis)
+            
+            self._file_cache[abs_path] = (st.st_mtime_ns, st.st_size, analysis)
+        
+        # Cache results; the call graph is rederived on next use
+        self.function_definitions[str(file_path)] = analysis['definitions']
+        self.function_calls[str(file_path)] = analysis['calls']
+        self._call_graph = None
+        
+        # Fresh records so callers cannot disturb the memo or the analyzer's own tables
+        return {
+            'definitions': [_copy_definition(definition) for definition in analysis['definitions']],
+            'declarations': [_copy_definition(declaration) for declaration in analysis['declarations']],
+            'calls': [_copy_call(call) for call in analysis['calls']]
+        }
+    
+    def _read_source(self, file_path: Path) -> Union[str, bytes]:
+        """Read a source file in the form the active backend scans"""
+        if self._ts_parser is not None:
+            # tree-sitter parses bytes, so skip the decode/encode round trip
+            with open(file_path, 'rb') as f:
+                return f.read().replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+        
+        # Text mode decodes and translates newlines in C; the regex patterns are
+        # ASCII-only, and an ASCII str already costs one byte per character
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            return f.read()
+    
+    def _analyze_chunked(self, file_path: Path) -> Dict[str, List]:
+        """Analyze a large source file in sections so it never sits in memory whole"""
+        analysis = {'definitions': [], 'declarations': [], 'calls': []}
+        line_offset = 0
+        char_offset = 0
+        buffer = ''
+        
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            while True:
+                chunk = f.read(_ANALYZE_CHUNK_CHARS)
+                buffer += chunk
+                
+                if chunk:
+                    # Sections end after a closing brace in column 0, which in EDK2
+                    # style closes a function, so no function spans two sections
+                    cut = buffer.rfind('\n}\n') + 3
+                    if cut < 3:
+                        if len(buffer) < 4 * _ANALYZE_CHUNK_CHARS:
+                            continue
+                        cut = buffer.rfind('\n') + 1 or len(buffer)
+                else:
+                    cut = len(buffer)
+                
+                if cut:
+                    section, buffer = buffer[:cut], buffer[cut:]
+                    section_analysis = self._analyze_content(section, str(file_path))
+                    for key in ('definitions', 'declarations'):
+                        for record in section_analysis[key]:
+                            record.line_number += line_offset
+                            record.end_line_number += line_offset
+                            if record.body_start != -1:
+                                record.body_start += char_offset
+                            analysis[key].append(record)
+                    for call in section_analysis['calls']:
+                        call.line_number += line_offset
+                        analysis['calls'].append(call)
+                    
+                    line_offset += section.count('\n')
+                    char_offset += len(section)
+                
+                if not chunk:
+                    break
         
-        # Cache results
-        self.function_definitions[str(file_path)] = definitions
-        self.function_calls[str(file_path)] = calls
+        return analysis
+    
+    def _analyze_content(self, content: Union[str, bytes], file_path: str) -> Dict[str, List]:
+        """Extract function information from source content"""
+        if self._ts_parser is not None:
+            source = content if isinstance(content, bytes) else content.encode('utf-8')
+            definitions, declarations, calls = self._ts_extract(source, file_path)
+        else:
+            definitions, declarations, calls = self._extract_all(content, file_path)
         
         return {
             'definitions': definitions,
@@ -131,32 +480,119 @@ class FunctionAnalyzer:
             'calls': calls
         }
     
+    def _get_cache_path(self, abs_path: str, st: os.stat_result) -> Path:
+        """Get on-disk cache file path for one version of a source file"""
+        # One directory per source file, so older versions can be found and pruned
+        file_key = f"{self.parser_backend}:{abs_path}"
+        version_key = f"{st.st_mtime_ns}:{st.st_size}"
+        suffix = '.json' if orjson is not None else '.pkl'
+        return (self.cache_dir / hashlib.sha1(file_key.encode()).hexdigest() /
+                f"{hashlib.sha1(version_key.encode()).hexdigest()}{suffix}")
+    
+    def _load_cached_analysis(self, abs_path: str, st: os.stat_result) -> Optional[Dict[str, List]]:
+        """Load an analysis from the on-disk cache, if enabled and present"""
+        if not self.cache_dir:
+            return None
+        
+        try:
+            with open(self._get_cache_path(abs_path, st), 'rb') as f:
+                if orjson is None:
+                    return pickle.load(f)
+                return _revive_analysis(orjson.loads(f.read()))
+        except Exception:
+            return None
+    
+    def _store_cached_analysis(self, abs_path: str, st: os.stat_result, analysis: Dict[str, List]):
+        """Store an analysis in the on-disk cache, if enabled"""
+        if not self.cache_dir:
+            return
+        
+        cache_path = self._get_cache_path(abs_path, st)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            cache_path.parent.mkdir(exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                if orjson is None:
+                    pickle.dump(analysis, f, protocol=pickle.HIGHEST_PROTOCOL)
+                else:
+                    # Dataclasses serialize natively
+                    f.write(orjson.dumps(analysis))
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError):
+            # The disk cache is best-effort
+            if tmp_path.exists():
+                tmp_path.unlink()
+            return
+        
+        # Entries for earlier versions of this file can never be hit again
+        self._prune_cached_versions(cache_path)
+    
+    def _prune_cached_versions(self, cache_path: Path):
+        """Remove every cached version of a source file except cache_path"""
+        try:
+            with os.scandir(cache_path.parent) as entries:
+                for entry in entries:
+                    # Another process's in-flight .tmp file is left alone
+                    if entry.name != cache_path.name and not entry.name.endswith('.tmp'):
+                        try:
+                            os.unlink(entry.path)
+                        except OSError:
+                            pass
+        except OSError:
+            pass
+    
+    def _extract_all(self, content: str, file_path: str) -> Tuple[List[FunctionDefinition], List[FunctionDefinition], List[FunctionCall]]:
+        """Extract definitions, declarations and calls, scanning signatures once"""
+        # Split once; documentation and call scanning index into the same lines
+        lines = content.split('\n')
+        definitions, declarations = self._extract_signatures(content, file_path, lines)
+        calls = self._scan_function_calls(content, file_path, definitions, lines)
+        return definitions, declarations, calls
+    
     def _extract_function_definitions(self, content: str, file_path: str) -> List[FunctionDefinition]:
         """Extract function definitions from source content"""
+        return self._extract_signatures(content, file_path)[0]
+    
+    def _extract_function_declarations(self, content: str, file_path: str) -> List[FunctionDefinition]:
+        """Extract function declarations from source content"""
+        return self._extract_signatures(content, file_path)[1]
+    
+    def _extract_signatures(self, content: str, file_path: str,
+                            lines: Optional[List[str]] = None) -> Tuple[List[FunctionDefinition], List[FunctionDefinition]]:
+        """Extract function definitions and declarations in one pass"""
+        # Records from one file share a single path object, and repeated names are shared too
+        file_path = sys.intern(file_path)
         definitions = []
-        lines = content.split('\n')
+        declarations = []
+        newlines = _newline_offsets(content)
         
-        for match in self.function_def_pattern.finditer(content):
+        for match in self.function_signature_pattern.finditer(content):
             modifiers = match.group(1).strip()  # STATIC, INLINE, etc.
-            return_type = match.group(2).strip()
+            return_type = sys.intern(match.group(2).strip())
             calling_conv = match.group(3) or ''
-            function_name = match.group(4)
+            function_name = sys.intern(match.group(4))
             parameters_str = match.group(5)
+            is_definition = match.group(6) == '{'
             
             # Find line numbers
-            start_line = content[:match.start()].count('\n') + 1
-            end_line = self._find_function_end(content, match.end())
+            start_line = _line_at(newlines, match.start())
+            if is_definition:
+                end_line = self._find_function_end(content, match.end(), newlines)
+                body_start = match.end()
+            else:
+                end_line = start_line
+                body_start = -1  # No body for declarations
             
             # Parse parameters
             parameters = self._parse_parameters(parameters_str)
             
             # Extract documentation (look for comment block before function)
-            documentation = self._extract_function_documentation(content, match.start())
+            documentation = self._extract_function_documentation(content, match.start(), lines, start_line)
             
             # Build full signature
             signature = f"{return_type} {calling_conv} {function_name}({parameters_str})"
             
-            definition = FunctionDefinition(
+            record = FunctionDefinition(
                 name=function_name,
                 return_type=return_type,
                 parameters=parameters,
@@ -165,67 +601,45 @@ class FunctionAnalyzer:
                 line_number=start_line,
                 end_line_number=end_line,
                 signature=signature.strip(),
-                body_start=match.end(),
+                body_start=body_start,
                 is_static='STATIC' in modifiers.upper(),
                 is_inline='INLINE' in modifiers.upper(),
                 documentation=documentation
             )
             
-            definitions.append(definition)
-        
-        return definitions
-    
-    def _extract_function_declarations(self, content: str, file_path: str) -> List[FunctionDefinition]:
-        """Extract function declarations from source content"""
-        declarations = []
-        
-        for match in self.function_decl_pattern.finditer(content):
-            modifiers = match.group(1).strip()
-            return_type = match.group(2).strip()
-            calling_conv = match.group(3) or ''
-            function_name = match.group(4)
-            parameters_str = match.group(5)
-            
-            # Find line number
-            line_num = content[:match.start()].count('\n') + 1
-            
-            # Parse parameters
-            parameters = self._parse_parameters(parameters_str)
-            
-            # Extract documentation
-            documentation = self._extract_function_documentation(content, match.start())
-            
-            # Build signature
-            signature = f"{return_type} {calling_conv} {function_name}({parameters_str})"
-            
-            declaration = FunctionDefinition(
-                name=function_name,
-                return_type=return_type,
-                parameters=parameters,
-                calling_convention=calling_conv,
-                file_path=file_path,
-                line_number=line_num,
-                end_line_number=line_num,
-                signature=signature.strip(),
-                body_start=-1,  # No body for declarations
-                is_static='STATIC' in modifiers.upper(),
-                is_inline='INLINE' in modifiers.upper(),
-                documentation=documentation
-            )
-            
-            declarations.append(declaration)
+            if is_definition:
+                definitions.append(record)
+            else:
+                declarations.append(record)
         
-        return declarations
+        return definitions, declarations
     
     def _extract_function_calls(self, content: str, file_path: str) -> List[FunctionCall]:
         """Extract function calls from source content"""
+        # The file's function definitions determine each call's context
+        definitions = self._extract_function_definitions(content, file_path)
+        return self._scan_function_calls(content, file_path, definitions)
+    
+    def _scan_function_calls(self, content: str, file_path: str, definitions: List[FunctionDefinition],
+                             lines: Optional[List[str]] = None) -> List[FunctionCall]:
+        """Extract function calls given the file's function definitions"""
+        file_path = sys.intern(file_path)
         calls = []
-        lines = content.split('\n')
+        if lines is None:
+            lines = content.split('\n')
         
-        # First, get all function definitions in this file to determine context
-        definitions = self._extract_function_definitions(content, file_path)
+        # Definitions come in source order, so the containing function can be
+        # tracked with a pointer that only moves forward as lines advance
+        in_order = all(previous.line_number <= current.line_number
+                       for previous, current in zip(definitions, definitions[1:]))
+        started = 0   # definitions whose first line has been reached
+        candidate = 0  # first of those that has not ended yet
         
         for line_num, line in enumerate(lines, 1):
+            # Every call needs an opening parenthesis
+            if '(' not in line:
+                continue
+            
             # Skip comment lines and preprocessor directives
             stripped_line = line.strip()
             if (stripped_line.startswith('//') or 
@@ -234,30 +648,38 @@ class FunctionAnalyzer:
                 stripped_line.startswith('*')):
                 continue
             
-            # Find function calls in this line
+            # Skip if this looks like a function definition
+            if stripped_line.endswith('{'):
+                continue
+            
+            containing_function = None
+            call_context = None
             for match in self.function_call_pattern.finditer(line):
                 function_name = match.group(1)
                 
-                # Skip if this looks like a function definition
-                if '{' in line and line.strip().endswith('{'):
-                    continue
-                
                 # Skip common C keywords and macros
-                if function_name.upper() in ['IF', 'FOR', 'WHILE', 'SWITCH', 'SIZEOF', 'RETURN']:
+                if function_name.upper() in _NON_CALL_NAMES:
                     continue
                 
-                # Determine the containing function
-                containing_function = self._find_containing_function_at_line(definitions, line_num)
-                
-                # Get call context (surrounding code)
-                call_context = self._get_call_context(lines, line_num)
+                # Containing function and context are shared by every call on the line
+                if call_context is None:
+                    if in_order:
+                        while started < len(definitions) and definitions[started].line_number <= line_num:
+                            started += 1
+                        while candidate < started and definitions[candidate].end_line_number < line_num:
+                            candidate += 1
+                        if candidate < started:
+                            containing_function = definitions[candidate].name
+                    else:
+                        containing_function = self._find_containing_function_at_line(definitions, line_num)
+                    call_context = self._get_call_context(lines, line_num)
                 
                 call = FunctionCall(
                     caller_function=containing_function or 'global',
-                    called_function=function_name,
+                    called_function=sys.intern(function_name),
                     file_path=file_path,
                     line_number=line_num,
-                    line_content=line.strip(),
+                    line_content=stripped_line,
                     call_context=call_context
                 )
                 
@@ -265,12 +687,162 @@ class FunctionAnalyzer:
         
         return calls
     
+    def _ts_extract(self, source: bytes, file_path: str) -> Tuple[List[FunctionDefinition], List[FunctionDefinition], List[FunctionCall]]:
+        """Extract definitions, declarations and calls from one tree-sitter parse"""
+        file_path = sys.intern(file_path)
+        tree = self._ts_parser.parse(source)
+        content = _decode(source)
+        lines = content.split('\n')
+        
+        # Byte and character offsets only differ in non-ASCII source
+        line_starts = None
+        if not source.isascii():
+            line_starts = [0]
+            line_starts.extend(itertools.accumulate(len(line) + 1 for line in lines))
+        
+        definitions = []
+        declarations = []
+        calls = []
+        enclosing = []  # (depth, function name) for the function bodies being walked
+        
+        # Depth-first walk with the cursor API, visiting every node once
+        cursor = tree.walk()
+        depth = 0
+        walking = True
+        while walking:
+            node = cursor.node
+            while enclosing and enclosing[-1][0] >= depth:
+                enclosing.pop()
+            
+            if node.type == 'function_definition':
+                definition = self._ts_function(node, source, content, lines, line_starts, file_path,
+                                               is_definition=True)
+                if definition:
+                    definitions.append(definition)
+                    enclosing.append((depth, definition.name))
+            elif node.type == 'declaration':
+                declaration = self._ts_function(node, source, content, lines, line_starts, file_path,
+                                                is_definition=False)
+                if declaration:
+                    declarations.append(declaration)
+            elif node.type == 'call_expression':
+                function = node.child_by_field_name('function')
+                if function is not None and function.type == 'identifier':
+                    function_name = sys.intern(_decode(source[function.start_byte:function.end_byte]))
+                    if function_name.upper() not in _NON_CALL_NAMES:
+                        line_num = node.start_point[0] + 1
+                        calls.append(FunctionCall(
+                            caller_function=enclosing[-1][1] if enclosing else 'global',
+                            called_function=function_name,
+                            file_path=file_path,
+                            line_number=line_num,
+                            line_content=lines[line_num - 1].strip(),
+                            call_context=self._get_call_context(lines, line_num)
+                        ))
+            
+            if cursor.goto_first_child():
+                depth += 1
+                continue
+            while not cursor.goto_next_sibling():
+                if not cursor.goto_parent():
+                    walking = False
+                    break
+                depth -= 1
+        
+        return definitions, declarations, calls
+    
+    def _ts_function(self, node, source: bytes, content: str, lines: List[str],
+                     line_starts: Optional[List[int]], file_path: str,
+                     is_definition: bool) -> Optional[FunctionDefinition]:
+        """Build a FunctionDefinition from a tree-sitter definition or declaration node"""
+        declarator = node.child_by_field_name('declarator')
+        while declarator is not None and declarator.type == 'pointer_declarator':
+            declarator = declarator.child_by_field_name('declarator')
+        
+        if declarator is None or declarator.type != 'function_declarator':
+            return None
+        
+        name_node = declarator.child_by_field_name('declarator')
+        params_node = declarator.child_by_field_name('parameters')
+        if name_node is None or name_node.type != 'identifier' or params_node is None:
+            return None
+        
+        # Macros such as EFIAPI can split the return type into a preceding ERROR node
+        start_byte = node.start_byte
+        start_point = node.start_point
+        previous = node.prev_sibling
+        if previous is not None and previous.type == 'ERROR':
+            dangling = source[previous.start_byte:previous.end_byte]
+            if b';' not in dangling and b'}' not in dangling:
+                start_byte = previous.start_byte
+                start_point = previous.start_point
+        
+        prefix_words = _decode(source[start_byte:name_node.start_byte]).replace('*', ' * ').split()
+        
+        modifiers = [word for word in prefix_words if word.upper() in ('STATIC', 'INLINE')]
+        calling_conv = ''
+        type_words = []
+        for word in prefix_words:
+            if word in self.edk2_calling_conventions:
+                calling_conv = word
+            elif word not in modifiers:
+                type_words.append(word)
+        return_type = ' '.join(type_words)
+        
+        function_name = sys.intern(_decode(source[name_node.start_byte:name_node.end_byte]))
+        parameters_str = _decode(source[params_node.start_byte + 1:params_node.end_byte - 1])
+        
+        # Character offsets (the regex path reports str positions, not bytes)
+        start_char = _char_offset(source, start_byte, start_point, line_starts)
+        line_num = start_point[0] + 1
+        
+        body = node.child_by_field_name('body') if is_definition else None
+        if body is not None:
+            end_line = node.end_point[0] + 1
+            # Just past the opening brace, which is a single character
+            body_start = _char_offset(source, body.start_byte, body.start_point, line_starts) + 1
+        else:
+            end_line = line_num
+            body_start = -1  # No body for declarations
+        
+        signature = f"{return_type} {calling_conv} {function_name}({parameters_str})"
+        modifier_text = ' '.join(modifiers).upper()
+        
+        return FunctionDefinition(
+            name=function_name,
+            return_type=return_type,
+            parameters=self._parse_parameters(parameters_str),
+            calling_convention=calling_conv,
+            file_path=file_path,
+            line_number=line_num,
+            end_line_number=end_line,
+            signature=signature.strip(),
+            body_start=body_start,
+            is_static='STATIC' in modifier_text,
+            is_inline='INLINE' in modifier_text,
+            documentation=self._extract_function_documentation(content, start_char, lines, line_num)
+        )
+    
     def _parse_parameters(self, parameters_str: str) -> List[Dict[str, str]]:
         """Parse function parameters string into structured data"""
+        # EDK2 prototypes repeat across headers, sources and protocol members,
+        # so each distinct parameter list is only split and matched once
+        parsed = self._parameter_cache.get(parameters_str)
+        if parsed is None:
+            if len(self._parameter_cache) >= _PARAMETER_CACHE_SIZE:
+                self._parameter_cache.clear()
+            parsed = self._parameter_cache[parameters_str] = self._parse_parameter_fields(parameters_str)
+        
+        # Fresh dicts so callers cannot disturb the cache
+        return [{'keyword': keyword, 'type': param_type, 'name': param_name, 'full': full}
+                for keyword, param_type, param_name, full in parsed]
+    
+    def _parse_parameter_fields(self, parameters_str: str) -> Tuple[Tuple[str, str, str, str], ...]:
+        """Parse a parameter list into (keyword, type, name, full) tuples"""
         parameters = []
         
         if not parameters_str.strip():
-            return parameters
+            return ()
         
         # Split parameters by comma, but be careful of nested parentheses
         param_parts = self._split_parameters(parameters_str)
@@ -300,60 +872,86 @@ class FunctionAnalyzer:
                     param_name = ''
                     keyword = ''
             
-            parameters.append({
-                'keyword': keyword,
-                'type': param_type,
-                'name': param_name,
-                'full': param
-            })
+            parameters.append((keyword, param_type, param_name, param))
         
-        return parameters
+        return tuple(parameters)
     
     def _split_parameters(self, parameters_str: str) -> List[str]:
         """Split parameter string by commas, handling nested parentheses"""
-        parameters = []
-        current_param = ''
-        paren_depth = 0
-        
-        for char in parameters_str:
-            if char == '(':
-                paren_depth += 1
-            elif char == ')':
-                paren_depth -= 1
-            elif char == ',' and paren_depth == 0:
-                parameters.append(current_param.strip())
-                current_param = ''
-                continue
-            
-            current_param += char
+        # Prototypes without function-pointer parameters split directly in C
+        if '(' not in parameters_str and ')' not in parameters_str:
+            parts = parameters_str.split(',')
+        else:
+            # Hop between parens and commas, cutting only at top-level commas
+            parts = []
+            paren_depth = 0
+            part_start = 0
+            for match in _PARAMETER_SPLIT_PATTERN.finditer(parameters_str):
+                token = match.group()
+                if token == '(':
+                    paren_depth += 1
+                elif token == ')':
+                    paren_depth -= 1
+                elif paren_depth == 0:
+                    parts.append(parameters_str[part_start:match.start()])
+                    part_start = match.end()
+            parts.append(parameters_str[part_start:])
         
-        if current_param.strip():
-            parameters.append(current_param.strip())
+        parameters = [part.strip() for part in parts]
+        
+        # A trailing empty parameter is dropped, matching the old char loop
+        if not parameters[-1]:
+            parameters.pop()
         
         return parameters
     
-    def _find_function_end(self, content: str, start_pos: int) -> int:
+    def _find_function_end(self, content: str, start_pos: int, newlines: Optional[List[int]] = None) -> int:
         """Find the end line of a function definition"""
         brace_count = 1
         pos = start_pos
+        end = len(content)
         
-        while pos < len(content) and brace_count > 0:
-            if content[pos] == '{':
+        # Hop between braces, quotes and comment openers; everything else is skipped in C
+        while brace_count > 0:
+            match = _BRACE_SCAN_PATTERN.search(content, pos)
+            if not match:
+                pos = end
+                break
+            
+            token = match.group()
+            pos = match.end()
+            if token == '{':
                 brace_count += 1
-            elif content[pos] == '}':
+            elif token == '}':
                 brace_count -= 1
-            pos += 1
+            elif token == '/*':
+                close = content.find('*/', pos)
+                pos = end if close == -1 else close + 2
+            elif token == '//':
+                newline = content.find('\n', pos)
+                pos = end if newline == -1 else newline + 1
+            else:
+                # String or character literal; braces inside do not count
+                pos = _skip_literal(content, pos, token)
         
-        return content[:pos].count('\n') + 1
+        if newlines is not None:
+            return _line_at(newlines, pos)
+        return content.count('\n', 0, pos) + 1
     
-    def _extract_function_documentation(self, content: str, function_start: int) -> str:
+    def _extract_function_documentation(self, content: str, function_start: int,
+                                        lines: Optional[List[str]] = None, line_num: Optional[int] = None) -> str:
         """Extract documentation comment block before a function"""
         # Look backwards from function start to find comment block
-        lines = content[:function_start].split('\n')
+        if lines is None or line_num is None:
+            preceding = reversed(content[:function_start].split('\n'))
+        else:
+            # With the file's lines at hand, walk up from the function's line without re-splitting
+            partial = content[content.rfind('\n', 0, function_start) + 1:function_start]
+            preceding = itertools.chain((partial,), (lines[i] for i in range(line_num - 2, -1, -1)))
         
         # Find the last non-empty line before the function
         doc_lines = []
-        for line in reversed(lines):
+        for line in preceding:
             stripped = line.strip()
             if not stripped:
                 continue
@@ -397,9 +995,10 @@ class FunctionAnalyzer:
         
         return ' | '.join(context_lines)
     
-    def build_call_graph(self, module_list: List[str]) -> Dict[str, List[str]]:
+    def build_call_graph(self, module_list: List[str], max_workers: Optional[int] = None) -> Dict[str, List[str]]:
         """Build function call graph for included modules"""
-        call_graph = {}
+        source_files = []
+        seen_files = set()
         
         for module_path in module_list:
             # Find all source files in the module
@@ -408,34 +1007,33 @@ class FunctionAnalyzer:
             if not module_dir.exists():
                 continue
             
-            # Analyze all C/C++ files in the module
+            # Modules sharing (or nesting) a directory share sources; analyze each once
             for source_file in module_dir.rglob('*.c'):
-                analysis = self.analyze_source_file(str(source_file))
-                
-                # Build call relationships
-                for call in analysis['calls']:
-                    caller = call.caller_function
-                    called = call.called_function
-                    
-                    if caller not in call_graph:
-                        call_graph[caller] = []
-                    
-                    if called not in call_graph[caller]:
-                        call_graph[caller].append(called)
+                if source_file not in seen_files:
+                    seen_files.add(source_file)
+                    source_files.append(source_file)
+        
+        # Analyze files not yet memoized across processes; tiny batches stay serial
+        pending = [str(f) for f in source_files if os.path.abspath(f) not in self._file_cache]
+        workers = max_workers or os.cpu_count() or 1
+        if workers > 1 and len(pending) >= _MIN_PARALLEL_FILES:
+            worker = functools.partial(_analyze_source_static, parser_backend=self.parser_backend,
+                                       cache_dir=str(self.cache_dir) if self.cache_dir else None)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for file_path, memo in executor.map(worker, pending, chunksize=8):
+                    if memo is not None:
+                        self._file_cache[os.path.abspath(file_path)] = memo
+        
+        # Analyze all C/C++ files in the module (memo hits for anything done above)
+        call_graph = _graph_from_calls(
+            self.analyze_source_file(str(source_file))['calls'] for source_file in source_files)
         
         self.call_graph = call_graph
         return call_graph
     
     def get_function_callers(self, function_name: str) -> List[FunctionCall]:
         """Get all functions that call the specified function"""
-        callers = []
-        
-        for file_path, calls in self.function_calls.items():
-            for call in calls:
-                if call.called_function == function_name:
-                    callers.append(call)
-        
-        return callers
+        return self.function_calls.callers_of(function_name)
     
     def get_function_callees(self, function_name: str) -> List[str]:
         """Get all functions called by the specified function"""
@@ -443,53 +1041,93 @@ class FunctionAnalyzer:
     
     def analyze_call_depth(self, function_name: str, max_depth: int = 5) -> Dict[str, int]:
         """Analyze call depth from a given function"""
-        call_depths = {}
-        visited = set()
+        if max_depth < 0:
+            return {}
         
-        def _analyze_depth(func_name: str, current_depth: int):
-            if current_depth > max_depth or func_name in visited:
-                return
-            
-            visited.add(func_name)
-            call_depths[func_name] = current_depth
+        # Breadth-first, so each function gets its shortest call depth without recursion
+        call_depths = {function_name: 0}
+        queue = deque([(function_name, 0)])
+        
+        while queue:
+            func_name, current_depth = queue.popleft()
+            if current_depth >= max_depth:
+                continue
             
-            # Recurse into called functions
-            callees = self.get_function_callees(func_name)
-            for callee in callees:
-                _analyze_depth(callee, current_depth + 1)
+            for callee in self.get_function_callees(func_name):
+                if callee not in call_depths:
+                    call_depths[callee] = current_depth + 1
+                    queue.append((callee, current_depth + 1))
         
-        _analyze_depth(function_name, 0)
         return call_depths
     
     def find_recursive_calls(self) -> List[List[str]]:
-        """Find recursive call chains in the call graph"""
-        recursive_chains = []
-        
-        def _find_cycles(start_func: str, current_path: List[str], visited: Set[str]):
-            if start_func in current_path:
-                # Found a cycle
-                cycle_start = current_path.index(start_func)
-                cycle = current_path[cycle_start:] + [start_func]
-                if cycle not in recursive_chains:
-                    recursive_chains.append(cycle)
-                return
-            
-            if start_func in visited:
-                return
+        """Find recursive call chains in the call graph
+        
+        Each chain is one strongly connected component of the call graph, in
+        discovery order and closed with its first function (e.g. A, B, C, A).
+        """
+        return [component + [component[0]] for component in self._recursive_components()]
+    
+    def has_cycle(self) -> bool:
+        """Check whether any function in the call graph is recursive"""
+        for _ in self._recursive_components(stop_at_first=True):
+            return True
+        return False
+    
+    def _recursive_components(self, stop_at_first: bool = False) -> List[List[str]]:
+        """Iterative Tarjan SCC pass returning only the components that recurse"""
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        components: List[List[str]] = []
+        
+        for root in list(self.call_graph.keys()):
+            if root in index:
+                continue
             
-            visited.add(start_func)
-            current_path.append(start_func)
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self.get_function_callees(root)))]
             
-            # Follow all calls from this function
-            callees = self.get_function_callees(start_func)
-            for callee in callees:
-                _find_cycles(callee, current_path.copy(), visited.copy())
-        
-        # Check each function as a potential start of a recursive chain
-        for function_name in self.call_graph.keys():
-            _find_cycles(function_name, [], set())
+            while work:
+                node, callees = work[-1]
+                descended = False
+                for callee in callees:
+                    if callee not in index:
+                        index[callee] = lowlink[callee] = len(index)
+                        stack.append(callee)
+                        on_stack.add(callee)
+                        work.append((callee, iter(self.get_function_callees(callee))))
+                        descended = True
+                        break
+                    if callee in on_stack and index[callee] < lowlink[node]:
+                        lowlink[node] = index[callee]
+                if descended:
+                    continue
+                
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if lowlink[node] < lowlink[parent]:
+                        lowlink[parent] = lowlink[node]
+                
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    component.reverse()
+                    if len(component) > 1 or node in self.call_graph.get(node, []):
+                        components.append(component)
+                        if stop_at_first:
+                            return components
         
-        return recursive_chains
+        return components
     
     def get_function_complexity_metrics(self, function_name: str) -> Dict[str, int]:
         """Get complexity metrics for a function"""
@@ -506,8 +1144,7 @@ class FunctionAnalyzer:
         metrics['unique_callees'] = len(set(callees))
         
         # Count how many functions call this one
-        callers = self.get_function_callers(function_name)
-        metrics['called_by'] = len(callers)
+        metrics['called_by'] = self.function_calls.caller_count(function_name)
         
         # Calculate max call depth
         call_depths = self.analyze_call_depth(function_name)
@@ -515,3 +1152,43 @@ class FunctionAnalyzer:
             metrics['max_call_depth'] = max(call_depths.values())
         
         return metrics
+
+def _revive_definition(fields: Dict) -> FunctionDefinition:
+    """Rebuild a definition or declaration loaded from the JSON disk cache"""
+    record = FunctionDefinition(**fields)
+    record.name = sys.intern(record.name)
+    record.file_path = sys.intern(record.file_path)
+    return record
+
+def _revive_call(fields: Dict) -> FunctionCall:
+    """Rebuild a call loaded from the JSON disk cache"""
+    record = FunctionCall(**fields)
+    record.caller_function = sys.intern(record.caller_function)
+    record.called_function = sys.intern(record.called_function)
+    record.file_path = sys.intern(record.file_path)
+    return record
+
+def _revive_analysis(data: Dict[str, List[Dict]]) -> Dict[str, List]:
+    """Rebuild analysis records loaded from the JSON disk cache"""
+    return {
+        'definitions': [_revive_definition(fields) for fields in data['definitions']],
+        'declarations': [_revive_definition(fields) for fields in data['declarations']],
+        'calls': [_revive_call(fields) for fields in data['calls']]
+    }
+
+# Below this many files a process pool costs more than it saves
+_MIN_PARALLEL_FILES = 4
+
+# One analyzer per worker process, reused across the files it is handed
+_worker_analyzer: Optional[FunctionAnalyzer] = None
+
+def _analyze_source_static(file_path: str, parser_backend: str = "regex",
+                           cache_dir: Optional[str] = None) -> Tuple[str, Optional[Tuple[int, int, Dict[str, List]]]]:
+    """Analyze one source file in a worker process, returning its memo entry"""
+    global _worker_analyzer
+    if (_worker_analyzer is None or _worker_analyzer.parser_backend != parser_backend or
+            str(_worker_analyzer.cache_dir or '') != (cache_dir or '')):
+        _worker_analyzer = FunctionAnalyzer(parser_backend, cache_dir)
+    
+    _worker_analyzer.analyze_source_file(file_path)
+    return file_path, _worker_analyzer._file_cache.get(os.path.abspath(file_path))
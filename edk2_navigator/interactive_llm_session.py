@@ -1,6 +1,7 @@
 """
 Interactive LLM Session Manager - Handles context-aware LLM interactions with tool calling
 """
+import copy
 import json
 import os
 import uuid
@@ -612,6 +613,9 @@ class InteractiveLLMSession:
             total_tool_calls=0
         )
         
+        # (state key, summary) cached by get_session_summary
+        self._session_summary = None
+        
         # Logging setup
         self.session_log_file = self.context_dir / f"{self.session_id}.log"
         self.setup_session_logging()
@@ -942,8 +946,36 @@ class InteractiveLLMSession:
         except Exception as e:
             self.session_logger.error(f"Failed to load session: {e}")
 
+    def preload_dsc(self, dsc_path: str, build_flags: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Parse a DSC up front; the session's parse_dsc calls reuse it while its inputs are unchanged"""
+        arguments = {"dsc_path": dsc_path}
+        if build_flags:
+            arguments["build_flags"] = build_flags
+        
+        result = self.mcp_server.handle_tool_call("parse_dsc", arguments)
+        self._update_context_from_tool_result("parse_dsc", result)
+        
+        if result.get("success"):
+            self.session_logger.info(f"Preloaded DSC context: {result.get('dsc_path')}")
+        else:
+            self.session_logger.warning(f"Failed to preload DSC {dsc_path}: {result.get('error')}")
+        
+        return result
+
     def get_session_summary(self) -> Dict[str, Any]:
         """Get a summary of the current session"""
+        # Everything the summary reads changes one of these, so they stand in for it
+        context = self.context
+        key = (id(context), context.total_messages, context.total_tool_calls, context.last_activity,
+               context.current_dsc_context, len(context.active_files), len(self.messages),
+               len(self.mcp_server.tools))
+        if self._session_summary is None or self._session_summary[0] != key:
+            self._session_summary = (key, self._build_session_summary())
+        # Callers get their own copy so they can't alter the cached one
+        return copy.deepcopy(self._session_summary[1])
+
+    def _build_session_summary(self) -> Dict[str, Any]:
+        """Build the summary cached by get_session_summary"""
         return {
             "session_id": self.session_id,
             "context": self.context.to_dict(),
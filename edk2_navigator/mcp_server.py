@@ -4,11 +4,14 @@ MCP Server - Model Context Protocol server for LLM integration
 import json
 import asyncio
 import sys
-from typing import Dict, Any, List, Optional
+import functools
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import asdict
+from pathlib import Path
 from .query_engine import QueryEngine, FunctionLocation, ModuleDependencies, CallPath
 from .function_analyzer import FunctionAnalyzer, FunctionCall, FunctionDefinition
 from .dsc_parser import DSCParser, DSCContext, ModuleInfo
+from .utils import file_stamp
 from .dependency_graph import DependencyGraphBuilder, DependencyGraph
 from .cache_manager import CacheManager
 from .exceptions import EDK2NavigatorError, FunctionNotFoundError, ModuleNotFoundError
@@ -44,7 +47,14 @@ class MCPServer:
     
     def _define_tools(self) -> List[Dict[str, Any]]:
         """Define available MCP tools"""
-        return [
+        # Fresh list each time; subclasses extend it with their own tools
+        return list(self._tool_definitions())
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _tool_definitions() -> Tuple[Dict[str, Any], ...]:
+        """Static MCP tool definitions, built once"""
+        return (
             {
                 "name": "parse_dsc",
                 "description": "Parse DSC file and initialize build context",
@@ -205,11 +215,17 @@ class MCPServer:
                     "properties": {}
                 }
             }
-        ]
+        )
     
     def _define_resources(self) -> List[Dict[str, Any]]:
         """Define available MCP resources"""
-        return [
+        return list(self._resource_definitions())
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _resource_definitions() -> Tuple[Dict[str, Any], ...]:
+        """Static MCP resource definitions, built once"""
+        return (
             {
                 "uri": "edk2://current-build-context",
                 "name": "Current Build Context",
@@ -228,7 +244,7 @@ class MCPServer:
                 "description": "Index of all functions found in build-relevant modules",
                 "mimeType": "application/json"
             }
-        ]
+        )
     
     def handle_tool_call(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Handle incoming MCP tool calls"""
@@ -295,16 +311,18 @@ class MCPServer:
         # Resolve DSC path - try multiple locations
         resolved_dsc_path = self._resolve_dsc_path(dsc_path)
         
-        # Parse DSC file
-        self.current_dsc_context = self.dsc_parser.parse_dsc(resolved_dsc_path, build_flags)
-        
-        # Build dependency graph
-        self.current_dependency_graph = self.dependency_graph_builder.build_from_context(
-            self.current_dsc_context
-        )
-        
-        # Initialize query engine
-        self.query_engine = QueryEngine(self.current_dependency_graph)
+        # Re-parsing is only needed when the DSC, its flags or a file it read changed
+        if not self._is_current_context(resolved_dsc_path, build_flags):
+            # Parse DSC file
+            self.current_dsc_context = self.dsc_parser.parse_dsc(resolved_dsc_path, build_flags)
+            
+            # Build dependency graph
+            self.current_dependency_graph = self.dependency_graph_builder.build_from_context(
+                self.current_dsc_context
+            )
+            
+            # Initialize query engine
+            self.query_engine = QueryEngine(self.current_dependency_graph)
         
         return {
             "success": True,
@@ -316,6 +334,15 @@ class MCPServer:
             "timestamp": self.current_dsc_context.timestamp.isoformat()
         }
     
+    def _is_current_context(self, dsc_path: str, build_flags: Dict[str, str]) -> bool:
+        """Whether the loaded context was parsed from this DSC and flags with every input unchanged"""
+        context = self.current_dsc_context
+        if context is None or not context.input_files or self.query_engine is None:
+            return False
+        if context.dsc_path != str(Path(dsc_path).resolve()) or context.build_flags != build_flags:
+            return False
+        return all(file_stamp(path) == stamp for path, stamp in context.input_files.items())
+    
     def _resolve_dsc_path(self, dsc_path: str) -> str:
         """Resolve DSC path by trying multiple locations"""
         import os
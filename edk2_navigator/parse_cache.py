@@ -0,0 +1,65 @@
+"""
+Parse Cache - Persists parsed INF data across runs
+"""
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+class ParseCache:
+    """SQLite store of parse results keyed by file path, mtime and size"""
+    
+    def __init__(self, db_path: str = "~/.edk2_navigator/cache/parse.db"):
+        self.db_path = Path(db_path).expanduser()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        # It's only a cache: skip the per-commit fsync, a lost write just means a re-parse
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=OFF")
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS inf_cache "
+                "(path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, data TEXT)"
+            )
+    
+    def get(self, path: str, mtime_ns: int, size: int) -> Optional[Dict[str, Any]]:
+        """Return the stored result for path if the file is unchanged"""
+        try:
+            with self._lock:
+                row = self._connection.execute(
+                    "SELECT mtime_ns, size, data FROM inf_cache WHERE path = ?", (path,)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        
+        if row is None or row[0] != mtime_ns or row[1] != size:
+            return None
+        
+        try:
+            return json.loads(row[2])
+        except ValueError:
+            return None
+    
+    def put(self, path: str, mtime_ns: int, size: int, data: Dict[str, Any]):
+        """Store the parse result for path, replacing any older entry"""
+        try:
+            with self._lock, self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO inf_cache VALUES (?, ?, ?, ?)",
+                    (path, mtime_ns, size, json.dumps(data))
+                )
+        except sqlite3.Error:
+            pass
+    
+    def clear(self):
+        """Remove all stored results"""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM inf_cache")
+    
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._connection.close()
@@ -3,6 +3,7 @@ Query Engine - Core query functionality for code navigation
 """
 import os
 import re
+import functools
 from pathlib import Path
 from typing import List, Dict, Optional, Set, Tuple
 from dataclasses import dataclass
@@ -41,6 +42,38 @@ class CallPath:
     file_path: str
     line_number: int
 
+@functools.lru_cache(maxsize=None)
+def _function_patterns(calling_conventions: Tuple[str, ...]):
+    """Compile the function parsing patterns for a set of calling conventions"""
+    # Function definition pattern - matches function definitions with optional calling convention
+    # This pattern handles multi-line function definitions common in EDK2
+    calling_conv = '|'.join(calling_conventions)
+    function_def_pattern = re.compile(
+        r'^\s*(\w+(?:\s*\*)*)\s+(?:(' + calling_conv + r')\s+)?(\w+)\s*\([^)]*\)\s*\{',
+        re.MULTILINE | re.DOTALL
+    )
+    
+    # Alternative pattern for multi-line function definitions
+    function_def_multiline_pattern = re.compile(
+        r'^\s*(\w+(?:\s*\*)*)\s*\n\s*(?:(' + calling_conv + r')\s*\n\s*)?(\w+)\s*\([^)]*\)\s*\{',
+        re.MULTILINE | re.DOTALL
+    )
+    
+    # Function declaration pattern - matches function declarations
+    function_decl_pattern = re.compile(
+        r'^\s*(\w+(?:\s*\*)*)\s+(?:(' + calling_conv + r')\s+)?(\w+)\s*\([^)]*\)\s*;',
+        re.MULTILINE | re.DOTALL
+    )
+    
+    # Function call pattern - matches function calls
+    function_call_pattern = re.compile(
+        r'(\w+)\s*\(',
+        re.MULTILINE
+    )
+    
+    return (function_def_pattern, function_def_multiline_pattern,
+            function_decl_pattern, function_call_pattern)
+
 class QueryEngine:
     """Core query engine for code navigation"""
     
@@ -49,6 +82,7 @@ class QueryEngine:
         self.graph = dependency_graph
         self.function_cache = {}  # Cache for function locations
         self.call_graph_cache = {}  # Cache for call graphs
+        self.source_path_cache = {}  # Cache for resolved source file paths
         
         # EDK2-specific patterns
         self.edk2_calling_conventions = ['EFIAPI', 'WINAPI', '__cdecl', '__stdcall']
@@ -60,31 +94,11 @@ class QueryEngine:
     
     def _compile_patterns(self):
         """Compile regex patterns for function parsing"""
-        # Function definition pattern - matches function definitions with optional calling convention
-        # This pattern handles multi-line function definitions common in EDK2
-        calling_conv = '|'.join(self.edk2_calling_conventions)
-        self.function_def_pattern = re.compile(
-            r'^\s*(\w+(?:\s*\*)*)\s+(?:(' + calling_conv + r')\s+)?(\w+)\s*\([^)]*\)\s*\{',
-            re.MULTILINE | re.DOTALL
-        )
-        
-        # Alternative pattern for multi-line function definitions
-        self.function_def_multiline_pattern = re.compile(
-            r'^\s*(\w+(?:\s*\*)*)\s*\n\s*(?:(' + calling_conv + r')\s*\n\s*)?(\w+)\s*\([^)]*\)\s*\{',
-            re.MULTILINE | re.DOTALL
-        )
-        
-        # Function declaration pattern - matches function declarations
-        self.function_decl_pattern = re.compile(
-            r'^\s*(\w+(?:\s*\*)*)\s+(?:(' + calling_conv + r')\s+)?(\w+)\s*\([^)]*\)\s*;',
-            re.MULTILINE | re.DOTALL
-        )
-        
-        # Function call pattern - matches function calls
-        self.function_call_pattern = re.compile(
-            r'(\w+)\s*\(',
-            re.MULTILINE
-        )
+        # Compiled once per set of calling conventions and shared by all engines
+        (self.function_def_pattern,
+         self.function_def_multiline_pattern,
+         self.function_decl_pattern,
+         self.function_call_pattern) = _function_patterns(tuple(self.edk2_calling_conventions))
     
     def get_included_modules(self, dsc_path: str = None, build_flags: Optional[Dict[str, str]] = None) -> List[ModuleInfo]:
         """Get list of modules included in build"""
@@ -151,6 +165,11 @@ class QueryEngine:
     
     def _find_source_file_paths(self, source_file: str, module_path: str) -> List[str]:
         """Find possible paths for a source file"""
+        # Every query re-resolves the same module sources; probe the disk once
+        cache_key = (source_file, module_path)
+        if cache_key in self.source_path_cache:
+            return self.source_path_cache[cache_key]
+        
         paths = []
         
         # Get module directory
@@ -172,6 +191,7 @@ class QueryEngine:
             if candidate.exists():
                 paths.append(str(candidate))
         
+        self.source_path_cache[cache_key] = paths
         return paths
     
     def _extract_function_definitions(self, content: str, file_path: str, function_name: str) -> List[FunctionLocation]:
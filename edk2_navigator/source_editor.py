@@ -3,14 +3,291 @@ Source Editor - Tools for editing EDK2 source files with build context awareness
 """
 import os
 import re
+import mmap
 import shutil
+import functools
+import hashlib
+import tempfile
+import bisect
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
-from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple, Callable, Union
+from dataclasses import dataclass, field
 from .dsc_parser import DSCContext, ModuleInfo
 from .query_engine import QueryEngine, FunctionLocation
 from .exceptions import EDK2NavigatorError
 
+# Chunk size for raw os.write calls when persisting files
+_WRITE_CHUNK_SIZE = 1 << 20
+
+# A single line break; scanned in C to build newline offset tables
+_NEWLINE_PATTERN = re.compile(rb'\n')
+
+# A line holding only a closing brace, not indented with a space
+_CLOSING_BRACE_LINE_PATTERN = re.compile(rb'^(?:[\t\r\f\v][ \t\r\f\v]*)?\}[ \t\r\f\v]*$', re.MULTILINE)
+
+# Matches either brace; used to walk function bodies without per-byte Python work
+_BRACE_PATTERN = re.compile(rb'[{}]')
+
+@functools.lru_cache(maxsize=256)
+def _compiled(pattern, flags: int = 0):
+    """Compile a regex once and reuse it across edit calls"""
+    return re.compile(pattern, flags)
+
+# One prologue line: an include, another directive, a // comment, or whitespace only
+_PROLOGUE_LINE_PATTERN = re.compile(rb'(?:(#include)[^\n]*|#[^\n]*|//[^\n]*|[ \t\r\f\v]*)(?:\n|\Z)')
+
+def _scan_prologue(data) -> Tuple[int, int, int]:
+    """Walk the leading directive/comment/blank lines of a source buffer
+    
+    Returns (first code line index or -1, line index after the last #include, byte offset after it).
+    """
+    pos = 0
+    line_index = 0
+    include_line = 0
+    include_end = 0
+    
+    while True:
+        match = _PROLOGUE_LINE_PATTERN.match(data, pos)
+        if not match:
+            return line_index, include_line, include_end
+        
+        if match.group(1):
+            include_line = line_index + 1
+            include_end = match.end()
+        
+        # A match without a trailing newline is the final line of the file
+        if match.end() == match.start() or data[match.end() - 1] != 0x0A:
+            return -1, include_line, include_end
+        
+        pos = match.end()
+        line_index += 1
+
+def _current_umask() -> int:
+    """Return the process umask (there is no way to read it without setting it)"""
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+def _advise_sequential(fd: int):
+    """Hint that a file will be read front to back so the kernel reads ahead"""
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            # Advice is best-effort; some filesystems reject it
+            pass
+
+def _write_all(fd: int, data: bytes):
+    """Write a payload to a raw descriptor in bounded chunks"""
+    view = memoryview(data)
+    try:
+        offset = 0
+        while offset < len(view):
+            offset += os.write(fd, view[offset:offset + _WRITE_CHUNK_SIZE])
+    finally:
+        view.release()
+
+def _file_digest(path: Path) -> bytes:
+    """BLAKE2b digest of a file's contents, read in bounded chunks"""
+    digest = hashlib.blake2b()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_WRITE_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+def _copy_range(src_fd: int, dst_fd: int, offset: int, count: int):
+    """Append count bytes of src_fd starting at offset to dst_fd"""
+    if hasattr(os, 'copy_file_range'):
+        try:
+            while count > 0:
+                copied = os.copy_file_range(src_fd, dst_fd, min(count, _WRITE_CHUNK_SIZE), offset)
+                if copied == 0:
+                    return
+                offset += copied
+                count -= copied
+            return
+        except OSError:
+            # Unsupported filesystem pair; fall back to plain reads for the remainder
+            pass
+    
+    os.lseek(src_fd, offset, os.SEEK_SET)
+    while count > 0:
+        chunk = os.read(src_fd, min(count, _WRITE_CHUNK_SIZE))
+        if not chunk:
+            return
+        _write_all(dst_fd, chunk)
+        count -= len(chunk)
+
+def _newline_offsets(data) -> array:
+    """Byte offsets of every newline in a buffer, in ascending order"""
+    return array('q', [match.start() for match in _NEWLINE_PATTERN.finditer(data)])
+
+def _find_line_start(data, index: int) -> int:
+    """Return the byte offset where 0-based line index begins, or -1 if the file is shorter"""
+    pos = 0
+    for _ in range(index):
+        newline = data.find(b'\n', pos)
+        if newline == -1:
+            return -1
+        pos = newline + 1
+    return pos
+
+def _normalize_newlines(text: str) -> str:
+    """Apply the universal-newline translation text-mode reads perform"""
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+def _plan_insert(data, line_number: int, content: str) -> Tuple[int, int, bytes]:
+    """Splice that inserts content before a 1-based line (or appends after the last)"""
+    offset = _find_line_start(data, line_number - 1) if line_number >= 1 else -1
+    if offset != -1:
+        return offset, offset, (content + '\n').encode('utf-8')
+    
+    # One past the last line: append after a separating newline
+    if line_number >= 2 and _find_line_start(data, line_number - 2) != -1:
+        return len(data), len(data), ('\n' + content).encode('utf-8')
+    
+    raise ValueError(f"Invalid line number: {line_number}")
+
+def _plan_delete(data, start_line: int, end_line: int) -> Tuple[int, int, bytes]:
+    """Splice that removes an inclusive 1-based line range"""
+    if 1 <= start_line <= end_line:
+        start = _find_line_start(data, start_line - 1)
+        if start != -1:
+            end = _find_line_start(data, end_line)
+            if end != -1:
+                return start, end, b''
+            
+            # Deleting through the last line also drops the newline before it
+            if _find_line_start(data, end_line - 1) != -1:
+                return max(0, start - 1), len(data), b''
+    
+    raise ValueError(f"Invalid line range: {start_line}-{end_line}")
+
+def _plan_include(data, include_statement: str) -> Tuple[int, int, bytes]:
+    """Splice that adds an include after the last existing one in the prologue"""
+    if data.find(include_statement.encode('utf-8')) != -1:
+        raise ValueError("Include statement already exists")
+    
+    _, _, offset = _scan_prologue(data)
+    
+    # An include on the final line has no newline to insert after
+    if offset and data[offset - 1] != 0x0A:
+        return offset, offset, ('\n' + include_statement).encode('utf-8')
+    return offset, offset, (include_statement + '\n').encode('utf-8')
+
+def _plan_add_function(data, function_code: str, insert_location: str = "end") -> Tuple[Tuple[int, int, bytes], int]:
+    """Splice that adds a function surrounded by blank lines, plus the line index it lands at"""
+    newlines = _newline_offsets(data)
+    line_count = len(newlines) + 1
+    
+    # Determine where to insert the function
+    if insert_location == "end":
+        # Insert before the last closing brace or at the end
+        insert_line = line_count
+        closing = None
+        for closing in _CLOSING_BRACE_LINE_PATTERN.finditer(data):
+            pass
+        if closing is not None:
+            insert_line = bisect.bisect_left(newlines, closing.start())
+    elif insert_location == "beginning":
+        # Insert after includes and defines
+        insert_line = max(0, _scan_prologue(data)[0])
+    else:
+        # Assume it's a line number
+        try:
+            insert_line = int(insert_location)
+        except ValueError:
+            raise ValueError(f"Invalid insert location: {insert_location}")
+    
+    # Clamp the way list slice assignment would
+    index = max(0, line_count + insert_line) if insert_line < 0 else min(insert_line, line_count)
+    
+    # Add function with proper spacing: two blank lines before, one after
+    if index < line_count:
+        offset = newlines[index - 1] + 1 if index else 0
+        return (offset, offset, ('\n\n' + function_code + '\n\n').encode('utf-8')), insert_line
+    
+    return (len(data), len(data), ('\n\n\n' + function_code + '\n').encode('utf-8')), insert_line
+
+def _plan_function_replace(data, function_name: str, new_function_code: str) -> Tuple[int, int, bytes]:
+    """Splice that swaps a function definition for new code"""
+    # This is a simplified pattern - a more robust implementation would use proper C parsing
+    function_pattern = rf'(\w+\s+(?:EFIAPI\s+)?{re.escape(function_name)}\s*\([^{{]*\{{)'
+    
+    match = _compiled(function_pattern.encode('utf-8'), re.MULTILINE | re.DOTALL).search(data)
+    if not match:
+        raise ValueError(f"Function {function_name} not found")
+    
+    # Find the end of the function by counting braces
+    start_pos = match.start()
+    brace_count = 0
+    end_pos = start_pos
+    
+    # Jump from brace to brace at C speed rather than per character
+    for brace in _BRACE_PATTERN.finditer(data, start_pos):
+        if brace.group() == b'{':
+            brace_count += 1
+        else:
+            brace_count -= 1
+            if brace_count == 0:
+                end_pos = brace.end()
+                break
+    
+    return start_pos, end_pos, new_function_code.encode('utf-8')
+
+def _replace_text(content: str, search_pattern: str, replacement: str,
+                  max_replacements: int = -1) -> Tuple[str, int]:
+    """Regex-replace within text, failing when nothing matched"""
+    # count=0 replaces every match
+    count = 0 if max_replacements == -1 else max_replacements
+    new_content, num_replacements = _compiled(search_pattern, re.MULTILINE).subn(
+        replacement, content, count=count)
+    
+    if num_replacements == 0:
+        raise ValueError("No matches found for replacement")
+    
+    return new_content, num_replacements
+
+# Anchors, lookarounds and possessive/atomic forms; with these a match found on a line in
+# isolation might not be found when scanning the whole text, so every line is tried instead
+_LINE_SENSITIVE_PATTERN = re.compile(r'\$|\\[AZ]|\(\?[=!<>]|[*+?}]\+')
+
+def _candidate_lines(regex, text: str):
+    """Yield, in order, each line index a whole-text scan finds a match starting on"""
+    line_num = 0
+    counted = 0
+    pos = 0
+    while True:
+        match = regex.search(text, pos)
+        if match is None:
+            return
+        
+        # Count newlines only since the previous candidate, so the scan stays linear
+        line_num += text.count('\n', counted, match.start())
+        counted = match.start()
+        yield line_num
+        
+        # The per-line pass finds every match on this line; resume at the next one
+        newline = text.find('\n', match.start())
+        if newline == -1:
+            return
+        pos = newline + 1
+
+def _decode_source(data) -> str:
+    """Decode a source buffer the way a text-mode read would, including newline translation"""
+    # C sources are nearly always pure ASCII, which decodes without UTF-8 validation
+    try:
+        content = str(data, 'ascii')
+    except UnicodeDecodeError:
+        content = str(data, 'utf-8', 'ignore')
+    
+    # Same universal-newline translation text mode applied
+    return _normalize_newlines(content)
+
 @dataclass
 class EditResult:
     """Result of a source file edit operation"""
@@ -31,8 +308,18 @@ class FileSearchResult:
     line_content: str
     match_start: int
     match_end: int
-    context_before: List[str]
-    context_after: List[str]
+    context_range: Tuple[int, int] = (0, 0)
+    source_lines: Tuple[str, ...] = field(default=(), repr=False, compare=False)
+    
+    @property
+    def context_before(self) -> List[str]:
+        """Lines preceding the match, sliced from the shared file lines on access"""
+        return list(self.source_lines[self.context_range[0]:self.line_number - 1])
+    
+    @property
+    def context_after(self) -> List[str]:
+        """Lines following the match, sliced from the shared file lines on access"""
+        return list(self.source_lines[self.line_number:self.context_range[1]])
 
 class SourceEditor:
     """Editor for EDK2 source files with build context awareness"""
@@ -44,23 +331,50 @@ class SourceEditor:
         self.create_backups = create_backups
         self.backup_dir = self.workspace_dir / ".edk2_navigator_backups"
         
+        # Latest backup per file: {file_path: (backup_path, mtime_ns, size, content digest)}
+        self._backup_index: Dict[str, Tuple[Path, int, int, bytes]] = {}
+        
         if create_backups:
             self.backup_dir.mkdir(exist_ok=True)
     
     def read_file(self, file_path: str) -> str:
         """Read contents of a source file"""
+        return _decode_source(self.read_file_bytes(file_path))
+    
+    def read_file_bytes(self, file_path: str) -> bytes:
+        """Read the raw contents of a source file without decoding"""
         full_path = self.workspace_dir / file_path
         
         if not full_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
         
         try:
-            with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
+            with open(full_path, 'rb') as f:
+                _advise_sequential(f.fileno())
                 return f.read()
         except Exception as e:
             raise EDK2NavigatorError(f"Failed to read file {file_path}: {e}")
     
-    def write_file(self, file_path: str, content: str, create_backup: bool = None) -> EditResult:
+    @contextmanager
+    def _mmap_file(self, file_path: str):
+        """Map a source file read-only, yielding a bytes-like buffer"""
+        full_path = self.workspace_dir / file_path
+        
+        if not full_path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+        
+        with open(full_path, 'rb') as f:
+            # Empty files cannot be mapped
+            if os.fstat(f.fileno()).st_size == 0:
+                yield b''
+                return
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                yield mm
+    
+    def write_file(self, file_path: str, content: Union[str, bytes], create_backup: bool = None) -> EditResult:
         """Write content to a source file"""
         full_path = self.workspace_dir / file_path
         
@@ -77,9 +391,70 @@ class SourceEditor:
             # Ensure directory exists
             full_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Write new content
-            with open(full_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # Write new content; already-encoded payloads are written as-is
+            data = content if isinstance(content, bytes) else content.encode('utf-8')
+            self._atomic_write(full_path, data)
+            
+            return EditResult(
+                success=True,
+                file_path=file_path,
+                changes_made=["File written"],
+                backup_path=str(backup_path) if backup_path else None
+            )
+            
+        except Exception as e:
+            return EditResult(
+                success=False,
+                file_path=file_path,
+                changes_made=[],
+                error_message=str(e)
+            )
+    
+    def _atomic_write(self, full_path: Path, data: bytes):
+        """Write bytes to a temp file beside the target, then atomically replace it"""
+        self._atomic_replace(full_path, lambda fd: _write_all(fd, data))
+    
+    def _atomic_replace(self, full_path: Path, fill: Callable[[int], None]):
+        """Let fill() write a temp file beside the target, then atomically replace it"""
+        fd, tmp_path = tempfile.mkstemp(dir=str(full_path.parent), prefix=f".{full_path.name}.", suffix=".tmp")
+        try:
+            try:
+                fill(fd)
+            finally:
+                os.close(fd)
+            
+            # Keep the original file's permissions rather than mkstemp's 0600
+            if full_path.exists():
+                shutil.copymode(full_path, tmp_path)
+            else:
+                os.chmod(tmp_path, 0o666 & ~_current_umask())
+            
+            os.replace(tmp_path, full_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+    
+    def _edit_streaming(self, file_path: str, start: int, end: int, replacement: bytes) -> EditResult:
+        """Replace bytes [start, end) of a file without loading it into memory"""
+        full_path = self.workspace_dir / file_path
+        backup_path = None
+        
+        try:
+            if self.create_backups:
+                backup_path = self._create_backup(file_path)
+            
+            with open(full_path, 'rb') as src:
+                src_fd = src.fileno()
+                size = os.fstat(src_fd).st_size
+                
+                def fill(dst_fd: int):
+                    # Untouched ranges are copied in-kernel where supported
+                    _copy_range(src_fd, dst_fd, 0, start)
+                    _write_all(dst_fd, replacement)
+                    _copy_range(src_fd, dst_fd, end, size - end)
+                
+                self._atomic_replace(full_path, fill)
             
             return EditResult(
                 success=True,
@@ -98,31 +473,62 @@ class SourceEditor:
     
     def search_in_file(self, file_path: str, pattern: str, context_lines: int = 3) -> List[FileSearchResult]:
         """Search for a pattern within a file"""
+        # Compile regex pattern
         try:
-            content = self.read_file(file_path)
-            lines = content.split('\n')
-            results = []
+            regex = _compiled(pattern, re.IGNORECASE | re.MULTILINE)
+        except re.error as e:
+            raise EDK2NavigatorError(f"Failed to search in file {file_path}: {e}")
+        return self._search_one(file_path, regex, context_lines)
+    
+    def search_in_files(self, file_paths: List[str], pattern: str, context_lines: int = 3,
+                        max_workers: Optional[int] = None) -> List[FileSearchResult]:
+        """Search for a pattern across several files in parallel"""
+        # Compile once and hand the compiled object to every worker
+        try:
+            regex = _compiled(pattern, re.IGNORECASE | re.MULTILINE)
+        except re.error as e:
+            raise EDK2NavigatorError(f"Failed to search in files: {e}")
+        search = functools.partial(self._search_one, regex=regex, context_lines=context_lines)
+        
+        # Matching holds the GIL; threads only overlap the opening and mapping of each file
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            per_file = list(executor.map(search, file_paths))
+        
+        return [result for results in per_file for result in results]
+    
+    def _search_one(self, file_path: str, regex, context_lines: int = 3) -> List[FileSearchResult]:
+        """Search one file with an already compiled pattern"""
+        try:
+            with self._mmap_file(file_path) as data:
+                text = _decode_source(data)
             
-            # Compile regex pattern
-            regex = re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+            # One C-level scan over the whole text finds the lines worth matching
+            if _LINE_SENSITIVE_PATTERN.search(regex.pattern):
+                candidates = range(text.count('\n') + 1)
+            else:
+                candidates = _candidate_lines(regex, text)
             
-            for line_num, line in enumerate(lines):
+            results = []
+            lines = None
+            
+            # Match each candidate line on its own, so columns are characters and
+            # a match can neither cross nor see past the line break
+            for line_num in candidates:
+                # Split once; every result shares this tuple for its context
+                if lines is None:
+                    lines = tuple(text.split('\n'))
+                
+                line = lines[line_num]
                 for match in regex.finditer(line):
-                    # Get context lines
-                    start_context = max(0, line_num - context_lines)
-                    end_context = min(len(lines), line_num + context_lines + 1)
-                    
-                    context_before = lines[start_context:line_num]
-                    context_after = lines[line_num + 1:end_context]
-                    
                     results.append(FileSearchResult(
                         file_path=file_path,
                         line_number=line_num + 1,  # 1-based line numbers
                         line_content=line,
                         match_start=match.start(),
                         match_end=match.end(),
-                        context_before=context_before,
-                        context_after=context_after
+                        context_range=(max(0, line_num - context_lines),
+                                       min(len(lines), line_num + context_lines + 1)),
+                        source_lines=lines
                     ))
             
             return results
@@ -137,19 +543,8 @@ class SourceEditor:
             original_content = self.read_file(file_path)
             
             # Perform replacement
-            if max_replacements == -1:
-                new_content, num_replacements = re.subn(search_pattern, replacement, original_content, flags=re.MULTILINE)
-            else:
-                new_content, num_replacements = re.subn(search_pattern, replacement, original_content, 
-                                                       count=max_replacements, flags=re.MULTILINE)
-            
-            if num_replacements == 0:
-                return EditResult(
-                    success=False,
-                    file_path=file_path,
-                    changes_made=[],
-                    error_message="No matches found for replacement"
-                )
+            new_content, num_replacements = _replace_text(original_content, search_pattern,
+                                                          replacement, max_replacements)
             
             # Write the modified content
             result = self.write_file(file_path, new_content)
@@ -171,28 +566,17 @@ class SourceEditor:
     def insert_at_line(self, file_path: str, line_number: int, content: str) -> EditResult:
         """Insert content at a specific line number"""
         try:
-            original_content = self.read_file(file_path)
-            lines = original_content.split('\n')
-            
-            # Validate line number
-            if line_number < 1 or line_number > len(lines) + 1:
-                return EditResult(
-                    success=False,
-                    file_path=file_path,
-                    changes_made=[],
-                    error_message=f"Invalid line number: {line_number}"
-                )
-            
-            # Insert content (convert to 0-based index)
-            insert_lines = content.split('\n')
-            lines[line_number - 1:line_number - 1] = insert_lines
+            # Locate the insertion offset without materializing the file
+            with self._mmap_file(file_path) as data:
+                splice = _plan_insert(data, line_number, content)
             
-            new_content = '\n'.join(lines)
-            result = self.write_file(file_path, new_content)
+            # Count lines with a single C-level scan rather than splitting
+            inserted = content.count('\n') + 1
+            result = self._edit_streaming(file_path, *splice)
             
             if result.success:
-                result.changes_made = [f"Inserted {len(insert_lines)} lines at line {line_number}"]
-                result.lines_added = len(insert_lines)
+                result.changes_made = [f"Inserted {inserted} lines at line {line_number}"]
+                result.lines_added = inserted
             
             return result
             
@@ -207,24 +591,11 @@ class SourceEditor:
     def delete_lines(self, file_path: str, start_line: int, end_line: int) -> EditResult:
         """Delete lines from a file"""
         try:
-            original_content = self.read_file(file_path)
-            lines = original_content.split('\n')
+            with self._mmap_file(file_path) as data:
+                splice = _plan_delete(data, start_line, end_line)
             
-            # Validate line numbers
-            if start_line < 1 or end_line < start_line or end_line > len(lines):
-                return EditResult(
-                    success=False,
-                    file_path=file_path,
-                    changes_made=[],
-                    error_message=f"Invalid line range: {start_line}-{end_line}"
-                )
-            
-            # Delete lines (convert to 0-based index)
             lines_to_delete = end_line - start_line + 1
-            del lines[start_line - 1:end_line]
-            
-            new_content = '\n'.join(lines)
-            result = self.write_file(file_path, new_content)
+            result = self._edit_streaming(file_path, *splice)
             
             if result.success:
                 result.changes_made = [f"Deleted {lines_to_delete} lines ({start_line}-{end_line})"]
@@ -243,46 +614,15 @@ class SourceEditor:
     def add_function(self, file_path: str, function_code: str, insert_location: str = "end") -> EditResult:
         """Add a new function to a source file"""
         try:
-            original_content = self.read_file(file_path)
-            lines = original_content.split('\n')
-            
-            # Determine where to insert the function
-            if insert_location == "end":
-                # Insert before the last closing brace or at the end
-                insert_line = len(lines)
-                for i in range(len(lines) - 1, -1, -1):
-                    if lines[i].strip() == '}' and not lines[i].startswith(' '):
-                        insert_line = i
-                        break
-            elif insert_location == "beginning":
-                # Insert after includes and defines
-                insert_line = 0
-                for i, line in enumerate(lines):
-                    if not (line.startswith('#') or line.strip() == '' or line.startswith('//')):
-                        insert_line = i
-                        break
-            else:
-                # Assume it's a line number
-                try:
-                    insert_line = int(insert_location)
-                except ValueError:
-                    return EditResult(
-                        success=False,
-                        file_path=file_path,
-                        changes_made=[],
-                        error_message=f"Invalid insert location: {insert_location}"
-                    )
+            with self._mmap_file(file_path) as data:
+                splice, insert_line = _plan_add_function(data, function_code, insert_location)
             
-            # Add function with proper spacing
-            function_lines = ['', ''] + function_code.split('\n') + ['']
-            lines[insert_line:insert_line] = function_lines
-            
-            new_content = '\n'.join(lines)
-            result = self.write_file(file_path, new_content)
+            result = self._edit_streaming(file_path, *splice)
             
             if result.success:
                 result.changes_made = [f"Added function at line {insert_line}"]
-                result.lines_added = len(function_lines)
+                # Two leading blank lines, the function itself, one trailing blank line
+                result.lines_added = function_code.count('\n') + 4
             
             return result
             
@@ -297,41 +637,10 @@ class SourceEditor:
     def modify_function(self, file_path: str, function_name: str, new_function_code: str) -> EditResult:
         """Modify an existing function in a source file"""
         try:
-            original_content = self.read_file(file_path)
+            with self._mmap_file(file_path) as data:
+                splice = _plan_function_replace(data, function_name, new_function_code)
             
-            # Find function definition using regex
-            # This is a simplified pattern - a more robust implementation would use proper C parsing
-            function_pattern = rf'(\w+\s+(?:EFIAPI\s+)?{re.escape(function_name)}\s*\([^{{]*\{{)'
-            
-            match = re.search(function_pattern, original_content, re.MULTILINE | re.DOTALL)
-            if not match:
-                return EditResult(
-                    success=False,
-                    file_path=file_path,
-                    changes_made=[],
-                    error_message=f"Function {function_name} not found"
-                )
-            
-            # Find the end of the function by counting braces
-            start_pos = match.start()
-            brace_count = 0
-            end_pos = start_pos
-            
-            for i, char in enumerate(original_content[start_pos:], start_pos):
-                if char == '{':
-                    brace_count += 1
-                elif char == '}':
-                    brace_count -= 1
-                    if brace_count == 0:
-                        end_pos = i + 1
-                        break
-            
-            # Replace the function
-            new_content = (original_content[:start_pos] + 
-                          new_function_code + 
-                          original_content[end_pos:])
-            
-            result = self.write_file(file_path, new_content)
+            result = self._edit_streaming(file_path, *splice)
             
             if result.success:
                 result.changes_made = [f"Modified function {function_name}"]
@@ -350,31 +659,12 @@ class SourceEditor:
     def add_include(self, file_path: str, include_statement: str) -> EditResult:
         """Add an include statement to a source file"""
         try:
-            original_content = self.read_file(file_path)
-            lines = original_content.split('\n')
-            
-            # Check if include already exists
-            if include_statement in original_content:
-                return EditResult(
-                    success=False,
-                    file_path=file_path,
-                    changes_made=[],
-                    error_message="Include statement already exists"
-                )
-            
             # Find where to insert the include (after existing includes)
-            insert_line = 0
-            for i, line in enumerate(lines):
-                if line.startswith('#include'):
-                    insert_line = i + 1
-                elif line.strip() and not line.startswith('#') and not line.startswith('//'):
-                    break
+            with self._mmap_file(file_path) as data:
+                splice = _plan_include(data, include_statement)
             
             # Insert the include statement
-            lines.insert(insert_line, include_statement)
-            
-            new_content = '\n'.join(lines)
-            result = self.write_file(file_path, new_content)
+            result = self._edit_streaming(file_path, *splice)
             
             if result.success:
                 result.changes_made = [f"Added include: {include_statement}"]
@@ -390,9 +680,29 @@ class SourceEditor:
                 error_message=str(e)
             )
     
+    @contextmanager
+    def transaction(self, file_path: str):
+        """Batch several edits to one file into a single backup and write"""
+        tx = EditTransaction(self, file_path)
+        yield tx
+        
+        result = tx.commit()
+        if not result.success:
+            raise EDK2NavigatorError(f"Failed to commit edits to {file_path}: {result.error_message}")
+    
     def _create_backup(self, file_path: str) -> Path:
         """Create a backup of a file"""
         full_path = self.workspace_dir / file_path
+        st = full_path.stat()
+        
+        # Reuse the latest backup if the file has not changed since it was taken. A same-size
+        # rewrite can keep its mtime on coarse-timestamp filesystems, so the contents must match too
+        latest = self._backup_index.get(file_path)
+        if latest is not None:
+            latest_path, mtime_ns, size, digest = latest
+            if ((st.st_mtime_ns, st.st_size) == (mtime_ns, size) and latest_path.exists()
+                    and _file_digest(full_path) == digest):
+                return latest_path
         
         # Create backup filename with timestamp
         import datetime
@@ -402,6 +712,8 @@ class SourceEditor:
         
         # Copy file to backup location
         shutil.copy2(full_path, backup_path)
+        # Digest the copy itself, which is what a later reuse would restore
+        self._backup_index[file_path] = (backup_path, st.st_mtime_ns, st.st_size, _file_digest(backup_path))
         
         return backup_path
     
@@ -410,21 +722,27 @@ class SourceEditor:
         if not self.backup_dir.exists():
             return []
         
+        wanted_name = Path(file_path).name if file_path is not None else None
+        
         backups = []
-        for backup_file in self.backup_dir.glob("*.backup"):
-            # Parse backup filename
-            parts = backup_file.name.split('.')
-            if len(parts) >= 3:
-                original_name = '.'.join(parts[:-2])
-                timestamp = parts[-2]
+        with os.scandir(self.backup_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.backup'):
+                    continue
                 
-                if file_path is None or original_name == Path(file_path).name:
-                    backups.append({
-                        "original_file": original_name,
-                        "backup_path": str(backup_file),
-                        "timestamp": timestamp,
-                        "size": backup_file.stat().st_size
-                    })
+                # Parse backup filename
+                parts = entry.name.split('.')
+                if len(parts) >= 3:
+                    original_name = '.'.join(parts[:-2])
+                    timestamp = parts[-2]
+                    
+                    if wanted_name is None or original_name == wanted_name:
+                        backups.append({
+                            "original_file": original_name,
+                            "backup_path": entry.path,
+                            "timestamp": timestamp,
+                            "size": entry.stat(follow_symlinks=False).st_size
+                        })
         
         return sorted(backups, key=lambda x: x["timestamp"], reverse=True)
     
@@ -464,3 +782,124 @@ class SourceEditor:
                 changes_made=[],
                 error_message=str(e)
             )
+
+class EditTransaction:
+    """Edits to one file applied in memory and written once on commit"""
+    
+    def __init__(self, editor: SourceEditor, file_path: str):
+        """Load the file into an editable buffer"""
+        self.editor = editor
+        self.file_path = file_path
+        self.changes_made: List[str] = []
+        self.lines_added = 0
+        self.lines_removed = 0
+        self.lines_modified = 0
+        
+        with editor._mmap_file(file_path) as data:
+            self._content = bytearray(data)
+    
+    def _record(self, change: str, lines_added: int = 0, lines_removed: int = 0,
+                lines_modified: int = 0) -> EditResult:
+        """Track a successful edit and report it"""
+        self.changes_made.append(change)
+        self.lines_added += lines_added
+        self.lines_removed += lines_removed
+        self.lines_modified += lines_modified
+        
+        return EditResult(
+            success=True,
+            file_path=self.file_path,
+            changes_made=[change],
+            lines_added=lines_added,
+            lines_removed=lines_removed,
+            lines_modified=lines_modified
+        )
+    
+    def _failed(self, error: Exception) -> EditResult:
+        """Report an edit that could not be applied"""
+        return EditResult(
+            success=False,
+            file_path=self.file_path,
+            changes_made=[],
+            error_message=str(error)
+        )
+    
+    def _splice(self, start: int, end: int, payload: bytes):
+        """Replace a byte range of the buffer in place"""
+        self._content[start:end] = payload
+    
+    def replace_in_file(self, search_pattern: str, replacement: str, max_replacements: int = -1) -> EditResult:
+        """Replace text in the buffer using regex pattern"""
+        try:
+            content = _normalize_newlines(self._content.decode('utf-8', errors='ignore'))
+            new_content, num_replacements = _replace_text(content, search_pattern,
+                                                          replacement, max_replacements)
+            self._content = bytearray(new_content.encode('utf-8'))
+        except Exception as e:
+            return self._failed(e)
+        
+        return self._record(f"Made {num_replacements} replacements", lines_modified=num_replacements)
+    
+    def insert_at_line(self, line_number: int, content: str) -> EditResult:
+        """Insert content at a specific line number"""
+        try:
+            self._splice(*_plan_insert(self._content, line_number, content))
+        except Exception as e:
+            return self._failed(e)
+        
+        inserted = content.count('\n') + 1
+        return self._record(f"Inserted {inserted} lines at line {line_number}", lines_added=inserted)
+    
+    def delete_lines(self, start_line: int, end_line: int) -> EditResult:
+        """Delete lines from the buffer"""
+        try:
+            self._splice(*_plan_delete(self._content, start_line, end_line))
+        except Exception as e:
+            return self._failed(e)
+        
+        lines_to_delete = end_line - start_line + 1
+        return self._record(f"Deleted {lines_to_delete} lines ({start_line}-{end_line})",
+                            lines_removed=lines_to_delete)
+    
+    def add_function(self, function_code: str, insert_location: str = "end") -> EditResult:
+        """Add a new function to the buffer"""
+        try:
+            splice, insert_line = _plan_add_function(self._content, function_code, insert_location)
+            self._splice(*splice)
+        except Exception as e:
+            return self._failed(e)
+        
+        return self._record(f"Added function at line {insert_line}", lines_added=function_code.count('\n') + 4)
+    
+    def modify_function(self, function_name: str, new_function_code: str) -> EditResult:
+        """Modify an existing function in the buffer"""
+        try:
+            self._splice(*_plan_function_replace(self._content, function_name, new_function_code))
+        except Exception as e:
+            return self._failed(e)
+        
+        return self._record(f"Modified function {function_name}", lines_modified=1)
+    
+    def add_include(self, include_statement: str) -> EditResult:
+        """Add an include statement to the buffer"""
+        try:
+            self._splice(*_plan_include(self._content, include_statement))
+        except Exception as e:
+            return self._failed(e)
+        
+        return self._record(f"Added include: {include_statement}", lines_added=1)
+    
+    def commit(self) -> EditResult:
+        """Write the buffer back with one backup and one atomic replace"""
+        if not self.changes_made:
+            return EditResult(success=True, file_path=self.file_path, changes_made=[])
+        
+        result = self.editor.write_file(self.file_path, bytes(self._content))
+        
+        if result.success:
+            result.changes_made = list(self.changes_made)
+            result.lines_added = self.lines_added
+            result.lines_removed = self.lines_removed
+            result.lines_modified = self.lines_modified
+        
+        return result
@@ -7,7 +7,12 @@ from pathlib import Path
 from edk2_navigator.dsc_parser import DSCParser, DSCContext, ModuleInfo
 from edk2_navigator.dependency_graph import DependencyGraphBuilder
 from edk2_navigator.cache_manager import CacheManager
-from edk2_navigator.utils import validate_edk2_workspace, parse_dsc_section
+from edk2_navigator.utils import (
+    validate_edk2_workspace, parse_dsc_section, is_conditional_line, parse_inf_file, find_inf_files,
+    iter_inf_files, get_edk2_defines, get_edk2_module_type, get_edk2_module_guid,
+    enable_parse_cache, disable_parse_cache, _parse_inf_cached,
+    evaluate_conditional, make_conditional_evaluator
+)
 from edk2_navigator.exceptions import DSCParsingError, WorkspaceValidationError
 
 class TestBasicFunctionality:
@@ -195,6 +200,123 @@ class TestBasicFunctionality:
         assert 'TestPkg/TestModule1/TestModule1.inf' in components
         assert 'TestPkg/TestModule2/TestModule2.inf' in components
     
+    def test_is_conditional_line_utility(self):
+        """Test conditional directive detection"""
+        assert is_conditional_line('  !if $(TARGET) == DEBUG  ') == (True, '$(TARGET) == DEBUG')
+        assert is_conditional_line('!IFDEF SECURE_BOOT_ENABLE') == (True, 'SECURE_BOOT_ENABLE')
+        assert is_conditional_line('!ifndef NETWORK_ENABLE') == (True, 'NETWORK_ENABLE')
+        assert is_conditional_line('!endif') == (True, None)
+        assert is_conditional_line('!else') == (False, None)
+        assert is_conditional_line('!if') == (False, None)
+        assert is_conditional_line('MdePkg/Library/BaseLib/BaseLib.inf') == (False, None)
+    
+    def test_make_conditional_evaluator_utility(self):
+        """Test that a bound evaluator matches evaluate_conditional"""
+        build_flags = {"ARCH": "X64", "TARGET": "DEBUG", "SECURE_BOOT": ""}
+        evaluate = make_conditional_evaluator(build_flags)
+        
+        # Later changes to the caller's dict don't affect the bound evaluator
+        build_flags["ARCH"] = "IA32"
+        flags = {"ARCH": "X64", "TARGET": "DEBUG", "SECURE_BOOT": ""}
+        for condition in ["ARCH == X64", 'TARGET != "RELEASE"', "SECURE_BOOT", "UNKNOWN", ""]:
+            assert evaluate(condition) == evaluate_conditional(condition, flags)
+            assert evaluate(condition) == evaluate_conditional(condition, flags)
+    
+    def test_edk2_defines_utilities(self):
+        """Test reading module type and GUID from INF [Defines]"""
+        inf_content = """
+[Defines]
+  INF_VERSION    = 0x00010005
+  BASE_NAME      = TestModule
+  FILE_GUID      = 12345678-1234-1234-1234-123456789abc
+  module_type    = DXE_DRIVER
+  MODULE_TYPE    = PEIM
+
+[Sources]
+  TestModule.c
+"""
+        defines = get_edk2_defines(inf_content)
+        assert defines['BASE_NAME'] == 'TestModule'
+        assert get_edk2_module_type(inf_content) == 'DXE_DRIVER'  # First entry wins
+        assert get_edk2_module_guid(inf_content) == '12345678-1234-1234-1234-123456789abc'
+        
+        # Callers get their own copy
+        defines['MODULE_TYPE'] = 'Changed'
+        assert get_edk2_module_type(inf_content) == 'DXE_DRIVER'
+        
+        assert get_edk2_module_type("[Sources]\n  TestModule.c\n") == 'UNKNOWN'
+        assert get_edk2_module_guid("[Sources]\n  TestModule.c\n") == ''
+    
+    def test_find_inf_files_utility(self, temp_workspace):
+        """Test INF discovery with and without recursion"""
+        workspace = Path(temp_workspace['workspace'])
+        module_dir = workspace / "TestPkg" / "TestModule1"
+        module_dir.mkdir(parents=True)
+        (workspace / "Top.inf").write_text("[Defines]")
+        (module_dir / "TestModule1.inf").write_text("[Defines]")
+        (module_dir / "TestModule1.c").write_text("")
+        
+        assert sorted(find_inf_files(str(workspace))) == sorted([
+            str(workspace / "Top.inf"),
+            str(module_dir / "TestModule1.inf")
+        ])
+        assert find_inf_files(str(workspace), recursive=False) == [str(workspace / "Top.inf")]
+        assert find_inf_files(str(workspace / "Missing")) == []
+        
+        # The iterator yields lazily and can be abandoned early
+        inf_iter = iter_inf_files(str(workspace))
+        assert next(inf_iter).endswith(".inf")
+        inf_iter.close()
+    
+    def test_parse_inf_file_reuses_parse_until_changed(self, temp_workspace):
+        """Test INF parse memoization hands out copies and sees edits"""
+        inf_file = Path(temp_workspace['workspace']) / "TestModule1.inf"
+        inf_file.write_text("[Defines]\n  BASE_NAME = TestModule1\n\n[Sources]\n  TestModule1.c\n")
+        
+        info = parse_inf_file(str(inf_file))
+        assert info['path'] == str(inf_file)
+        assert info['defines'] == {'BASE_NAME': 'TestModule1'}
+        assert info['sources'] == ['TestModule1.c']
+        
+        # Mutating a result must not leak into the next call
+        info['sources'].append('Other.c')
+        info['defines']['BASE_NAME'] = 'Changed'
+        again = parse_inf_file(str(inf_file))
+        assert again['sources'] == ['TestModule1.c']
+        assert again['defines'] == {'BASE_NAME': 'TestModule1'}
+        
+        # Editing the file invalidates the cached parse
+        inf_file.write_text("[Defines]\n  BASE_NAME = TestModule1\n\n[Sources]\n  TestModule1.c\n  Extra.c\n")
+        assert parse_inf_file(str(inf_file))['sources'] == ['TestModule1.c', 'Extra.c']
+        
+        assert parse_inf_file(str(inf_file.with_name("Missing.inf"))) == {}
+    
+    def test_parse_inf_file_persistent_cache(self, temp_workspace):
+        """Test that INF parses are stored on disk and reused by a fresh process"""
+        workspace = Path(temp_workspace['workspace'])
+        inf_file = workspace / "Persisted.inf"
+        inf_file.write_text("[Defines]\n  BASE_NAME = Persisted\n\n[Sources]\n  Persisted.c\n")
+        
+        parse_cache = enable_parse_cache(str(workspace / "cache" / "parse.db"))
+        try:
+            info = parse_inf_file(str(inf_file))
+            stat = inf_file.stat()
+            abs_path = str(inf_file.absolute())
+            stored = parse_cache.get(abs_path, stat.st_mtime_ns, stat.st_size)
+            assert stored['sources'] == info['sources'] == ['Persisted.c']
+            
+            # A new process starts with an empty in-memory cache and reads the stored parse
+            stored['sources'] = ['FromDisk.c']
+            parse_cache.put(abs_path, stat.st_mtime_ns, stat.st_size, stored)
+            _parse_inf_cached.cache_clear()
+            assert parse_inf_file(str(inf_file))['sources'] == ['FromDisk.c']
+            
+            # A stale entry is ignored
+            assert parse_cache.get(abs_path, stat.st_mtime_ns + 1, stat.st_size) is None
+        finally:
+            disable_parse_cache()
+            _parse_inf_cached.cache_clear()
+    
     def test_cache_clear_functionality(self, temp_workspace):
         """Test cache clearing functionality"""
         cache_manager = CacheManager()
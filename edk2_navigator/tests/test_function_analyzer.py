@@ -122,6 +122,58 @@ InlineFunction (
             assert "CallThirdFunction" in call_names
             assert "TestFunction" in call_names  # Called by StaticFunction
     
+    def test_analyze_source_file_memoized(self, analyzer, sample_c_code):
+        """Test that unchanged files are not re-analyzed"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source_file = Path(temp_dir) / "memo.c"
+            source_file.write_text(sample_c_code)
+            
+            with patch.object(analyzer, '_analyze_content', wraps=analyzer._analyze_content) as analyze:
+                first = analyzer.analyze_source_file(str(source_file))
+                second = analyzer.analyze_source_file(str(source_file))
+                assert analyze.call_count == 1
+                assert first == second
+                
+                # Mutating returned records must not leak into later hits or the analyzer's tables
+                first['definitions'][0].name = "Corrupted"
+                first['definitions'][0].parameters.clear()
+                first['calls'][0].called_function = "Corrupted"
+                again = analyzer.analyze_source_file(str(source_file))
+                assert again == second
+                assert "Corrupted" not in [d.name for d in analyzer.function_definitions[str(source_file)]]
+                
+                # Changing the file invalidates the memo
+                source_file.write_text(sample_c_code + "\nVOID Extra(VOID) {\n}\n")
+                third = analyzer.analyze_source_file(str(source_file))
+                assert analyze.call_count == 2
+                assert "Extra" in [d.name for d in third['definitions']]
+    
+    def test_analyze_source_file_disk_cache(self, sample_c_code):
+        """Test that analyses are reused across analyzer instances via the disk cache"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source_file = Path(temp_dir) / "cached.c"
+            source_file.write_text(sample_c_code)
+            cache_dir = Path(temp_dir) / "cache"
+            
+            first = FunctionAnalyzer(cache_dir=str(cache_dir)).analyze_source_file(str(source_file))
+            assert len(list(cache_dir.iterdir())) == 1
+            
+            fresh = FunctionAnalyzer(cache_dir=str(cache_dir))
+            with patch.object(fresh, '_analyze_content') as analyze:
+                second = fresh.analyze_source_file(str(source_file))
+                analyze.assert_not_called()
+            
+            assert second == first
+            assert str(source_file) in fresh.function_calls
+            
+            # Re-analyzing an edited file replaces its old cache entry instead of adding one
+            source_file.write_text(sample_c_code + "\nVOID Extra(VOID) {\n}\n")
+            fresh.analyze_source_file(str(source_file))
+            entries = [path for path in cache_dir.rglob('*') if path.is_file()]
+            assert len(entries) == 1
+            assert "Extra" in [d.name for d in FunctionAnalyzer(cache_dir=str(cache_dir)).analyze_source_file(
+                str(source_file))['definitions']]
+    
     def test_extract_function_definitions(self, analyzer, sample_c_code):
         """Test extracting function definitions"""
         definitions = analyzer._extract_function_definitions(sample_c_code, "/test/file.c")
@@ -163,6 +215,14 @@ InlineFunction (
         assert declared_func.calling_convention == "EFIAPI"
         assert declared_func.body_start == -1  # No body for declarations
     
+    def test_extract_all_matches_separate_extractors(self, analyzer, sample_c_code):
+        """Test that the single-pass extractor agrees with the per-kind extractors"""
+        definitions, declarations, calls = analyzer._extract_all(sample_c_code, "/test/file.c")
+        
+        assert definitions == analyzer._extract_function_definitions(sample_c_code, "/test/file.c")
+        assert declarations == analyzer._extract_function_declarations(sample_c_code, "/test/file.c")
+        assert calls == analyzer._extract_function_calls(sample_c_code, "/test/file.c")
+    
     def test_extract_function_calls(self, analyzer, sample_c_code):
         """Test extracting function calls"""
         calls = analyzer._extract_function_calls(sample_c_code, "/test/file.c")
@@ -180,6 +240,13 @@ InlineFunction (
             assert call.line_content != ""
             assert call.call_context != ""
     
+    def test_extract_function_calls_share_strings(self, analyzer, sample_c_code):
+        """Test that call records share interned strings and carry no __dict__"""
+        calls = analyzer._extract_function_calls(sample_c_code, "/test/" + "file.c")
+        
+        assert len({id(call.file_path) for call in calls}) == 1
+        assert not hasattr(calls[0], "__dict__")
+    
     def test_parse_parameters(self, analyzer):
         """Test parsing function parameters"""
         test_cases = [
@@ -202,6 +269,16 @@ InlineFunction (
                 assert param["type"] == expected[i]["type"]
                 assert param["name"] == expected[i]["name"]
     
+    def test_parse_parameters_cached_results_are_fresh(self, analyzer):
+        """Test that repeated parameter lists reuse the parse but not the dicts"""
+        first = analyzer._parse_parameters("IN UINTN Size, OUT VOID *Buffer")
+        first[0]["name"] = "Changed"
+        
+        second = analyzer._parse_parameters("IN UINTN Size, OUT VOID *Buffer")
+        
+        assert second[0]["name"] == "Size"
+        assert second[1] == {"keyword": "OUT", "type": "VOID *", "name": "Buffer", "full": "OUT VOID *Buffer"}
+    
     def test_split_parameters(self, analyzer):
         """Test splitting parameter strings"""
         test_cases = [
@@ -231,6 +308,23 @@ EFI_STATUS TestFunction() {
         
         assert end_line > 1  # Should be after the opening line
     
+    def test_find_function_end_ignores_literals_and_comments(self, analyzer):
+        """Test that braces inside strings, chars and comments are not counted"""
+        code = """
+EFI_STATUS TestFunction() {
+  Print (L"}} \\" {");
+  Brace = '}';
+  /* } */
+  // }
+  return EFI_SUCCESS;
+}
+VOID Next() {}
+"""
+        start_pos = code.find('{')
+        end_line = analyzer._find_function_end(code, start_pos + 1)
+        
+        assert end_line == 8  # Line of the real closing brace
+    
     def test_extract_function_documentation(self, analyzer):
         """Test extracting function documentation"""
         code = """
@@ -278,6 +372,52 @@ VOID HelperFunction() {
             # The call graph should contain some relationships
             # (exact content depends on the parsing implementation)
     
+    def test_analyze_source_file_chunked_matches_whole(self, analyzer, sample_c_code):
+        """Test that large files analyzed in sections match a whole-file analysis"""
+        source = sample_c_code * 20
+        whole = analyzer._analyze_content(source, "big.c")
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            test_file = Path(temp_dir) / "big.c"
+            test_file.write_text(source)
+            
+            analyzer.max_analyze_bytes = 1024
+            with patch("edk2_navigator.function_analyzer._ANALYZE_CHUNK_CHARS", 512):
+                result = analyzer.analyze_source_file(str(test_file))
+        
+        def summarize(records):
+            return [(r.name, r.line_number, r.end_line_number, r.body_start) for r in records]
+        
+        assert len(result['definitions']) == len(whole['definitions']) > 20
+        assert summarize(result['definitions']) == summarize(whole['definitions'])
+        assert summarize(result['declarations']) == summarize(whole['declarations'])
+        assert ([(c.caller_function, c.called_function, c.line_number) for c in result['calls']] ==
+                [(c.caller_function, c.called_function, c.line_number) for c in whole['calls']])
+    
+    def test_build_call_graph_parallel_matches_serial(self):
+        """Test that the process pool path builds the same graph as the serial path"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            modules = []
+            for i in range(5):
+                module_dir = Path(temp_dir) / f"Module{i}"
+                module_dir.mkdir()
+                (module_dir / "source.c").write_text(f"""
+VOID Entry{i}() {{
+    Shared();
+    Helper{i}();
+}}
+""")
+                modules.append(str(module_dir / "Module.inf"))
+            
+            serial = FunctionAnalyzer().build_call_graph(modules, max_workers=1)
+            
+            parallel_analyzer = FunctionAnalyzer()
+            parallel = parallel_analyzer.build_call_graph(modules, max_workers=2)
+            
+            assert parallel == serial
+            assert serial["Entry3"] == ["Shared", "Helper3"]
+            assert len(parallel_analyzer.get_function_callers("Shared")) == 5
+    
     def test_get_function_callers(self, analyzer, sample_c_code):
         """Test getting function callers"""
         with tempfile.NamedTemporaryFile(suffix='.c', mode='w', delete=False) as f:
@@ -299,6 +439,39 @@ VOID HelperFunction() {
                 assert caller.called_function == "TestFunction"
                 assert caller.file_path == f.name
     
+    def test_call_graph_derived_lazily(self, analyzer, sample_c_code):
+        """Test that the call graph is built from analyzed calls on first use"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            test_file = Path(temp_dir) / "lazy.c"
+            test_file.write_text(sample_c_code)
+            
+            analyzer.analyze_source_file(str(test_file))
+            assert analyzer._call_graph is None
+            
+            assert "AnotherFunction" in analyzer.get_function_callees("TestFunction")
+            assert analyzer._call_graph is not None
+    
+    def test_get_function_callers_tracks_updates(self, analyzer):
+        """Test that the callers index follows changes to function_calls"""
+        analyzer.function_calls["/a.c"] = [
+            FunctionCall("FuncA", "Target", "/a.c", 5, "Target();", "context")
+        ]
+        assert [c.caller_function for c in analyzer.get_function_callers("Target")] == ["FuncA"]
+        
+        # Adding a file extends the index
+        analyzer.function_calls["/b.c"] = [
+            FunctionCall("FuncB", "Target", "/b.c", 7, "Target();", "context")
+        ]
+        assert [c.caller_function for c in analyzer.get_function_callers("Target")] == ["FuncA", "FuncB"]
+        
+        # Re-analyzing a file replaces its calls
+        analyzer.function_calls["/a.c"] = []
+        assert [c.caller_function for c in analyzer.get_function_callers("Target")] == ["FuncB"]
+        
+        # Reassigning the whole mapping is also picked up
+        analyzer.function_calls = {}
+        assert analyzer.get_function_callers("Target") == []
+    
     def test_get_function_callees(self, analyzer):
         """Test getting function callees"""
         # Set up a simple call graph
@@ -336,6 +509,21 @@ VOID HelperFunction() {
         assert depths["Level2"] == 2
         assert depths["Level3"] == 3
     
+    def test_analyze_call_depth_shortest_path(self, analyzer):
+        """Test that call depth is the shortest path and deep chains do not recurse"""
+        analyzer.call_graph = {
+            "Root": ["Long1", "Target"],
+            "Long1": ["Long2"],
+            "Long2": ["Target"],
+        }
+        analyzer.call_graph.update({f"Chain{i}": [f"Chain{i + 1}"] for i in range(5000)})
+        analyzer.call_graph["Target"] = ["Chain0"]
+        
+        depths = analyzer.analyze_call_depth("Root", max_depth=10000)
+        
+        assert depths["Target"] == 1
+        assert depths["Chain4999"] == 5001
+    
     def test_find_recursive_calls(self, analyzer):
         """Test finding recursive call chains"""
         # Set up a call graph with recursion
@@ -359,6 +547,29 @@ VOID HelperFunction() {
         
         assert found_cycle
     
+    def test_find_recursive_calls_components(self, analyzer):
+        """Test that each recursive component is reported once, including self-loops"""
+        analyzer.call_graph = {
+            "FuncA": ["FuncB"],
+            "FuncB": ["FuncC", "FuncD"],
+            "FuncC": ["FuncA"],
+            "FuncD": ["FuncD", "FuncE"],
+            "FuncE": []
+        }
+        
+        recursive_chains = analyzer.find_recursive_calls()
+        
+        assert sorted(sorted(set(chain)) for chain in recursive_chains) == [
+            ["FuncA", "FuncB", "FuncC"],
+            ["FuncD"]
+        ]
+        assert all(chain[0] == chain[-1] for chain in recursive_chains)
+        assert analyzer.has_cycle()
+        
+        analyzer.call_graph = {"FuncD": ["FuncE"], "FuncE": []}
+        assert analyzer.find_recursive_calls() == []
+        assert not analyzer.has_cycle()
+    
     def test_get_function_complexity_metrics(self, analyzer):
         """Test getting function complexity metrics"""
         # Set up test data
@@ -400,6 +611,14 @@ VOID HelperFunction() {
         matches = list(analyzer.parameter_pattern.finditer(test_param))
         assert len(matches) > 0
     
+    def test_compiled_patterns_shared(self):
+        """Test that analyzers share one set of compiled patterns"""
+        first = FunctionAnalyzer()
+        second = FunctionAnalyzer()
+        
+        assert first.function_def_pattern is second.function_def_pattern
+        assert first.parameter_pattern is second.parameter_pattern
+    
     def test_get_call_context(self, analyzer):
         """Test getting call context"""
         lines = [
@@ -0,0 +1,74 @@
+"""
+Tests for InteractiveLLMSession
+"""
+import pytest
+import tempfile
+from pathlib import Path
+from unittest.mock import Mock, patch
+from edk2_navigator.interactive_llm_session import InteractiveLLMSession, LLMProvider
+
+_DSC_CONTENT = """
+[Defines]
+  PLATFORM_NAME = TestPlatform
+
+[Components]
+  TestPkg/Module1/Module1.inf
+"""
+
+_INF_CONTENT = """
+[Defines]
+  BASE_NAME = Module1
+  MODULE_TYPE = DXE_DRIVER
+"""
+
+@pytest.fixture
+def session():
+    """Session over a temporary workspace with one DSC and one INF"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        workspace = Path(temp_dir)
+        edk2_dir = workspace / "edk2"
+        (edk2_dir / "BaseTools" / "Source" / "Python").mkdir(parents=True)
+        (workspace / "test.dsc").write_text(_DSC_CONTENT)
+        inf_file = workspace / "TestPkg" / "Module1" / "Module1.inf"
+        inf_file.parent.mkdir(parents=True)
+        inf_file.write_text(_INF_CONTENT)
+        
+        yield InteractiveLLMSession(str(workspace), str(edk2_dir), Mock(spec=LLMProvider))
+
+class TestInteractiveLLMSession:
+    """Test cases for InteractiveLLMSession"""
+    
+    def test_preload_dsc_is_reused_by_parse_dsc(self, session):
+        """Test that a parse_dsc tool call after preload_dsc reuses the preloaded context"""
+        dsc_path = str(session.workspace_dir / "test.dsc")
+        parser = session.mcp_server.dsc_parser
+        
+        with patch.object(parser, 'parse_dsc', wraps=parser.parse_dsc) as spy:
+            result = session.preload_dsc(dsc_path)
+            assert result["success"]
+            assert result["modules_found"] == 1
+            assert session.context.current_dsc_context == result["dsc_path"]
+            
+            tool_results = session._execute_tool_calls([{"name": "parse_dsc", "arguments": {"dsc_path": dsc_path}}])
+            assert tool_results[0].success
+            assert spy.call_count == 1
+    
+    def test_preload_dsc_reports_missing_dsc(self, session):
+        """Test that preloading a missing DSC fails without setting a DSC context"""
+        result = session.preload_dsc("Missing/Missing.dsc")
+        
+        assert not result["success"]
+        assert session.context.current_dsc_context is None
+    
+    def test_session_summary_is_cached_and_copied(self, session):
+        """Test that the summary is rebuilt only after the session changes and callers get copies"""
+        with patch.object(session, '_build_session_summary', wraps=session._build_session_summary) as spy:
+            summary = session.get_session_summary()
+            summary["context"]["active_files"].append("Mutated.c")
+            
+            assert session.get_session_summary()["context"]["active_files"] == []
+            assert spy.call_count == 1
+            
+            session.add_message("user", "hello")
+            assert session.get_session_summary()["messages_count"] == 1
+            assert spy.call_count == 2
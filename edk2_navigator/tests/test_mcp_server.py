@@ -1,32 +1,19 @@
 """
 Tests for MCP Server functionality
 """
+import copy
+import os
 import pytest
 import tempfile
 from pathlib import Path
 from unittest.mock import Mock, patch
 from edk2_navigator.mcp_server import MCPServer
+from edk2_navigator.query_engine import FunctionLocation, ModuleDependencies, CallPath, QueryEngine
 from edk2_navigator.dsc_parser import DSCContext, ModuleInfo
 from edk2_navigator.dependency_graph import DependencyGraph
 from datetime import datetime
 
-class TestMCPServer:
-    """Test cases for MCP Server"""
-    
-    @pytest.fixture
-    def temp_workspace(self):
-        """Create temporary workspace for testing"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            workspace = Path(temp_dir)
-            
-            # Create EDK2 directory structure
-            edk2_dir = workspace / "edk2"
-            basetools_dir = edk2_dir / "BaseTools" / "Source" / "Python"
-            basetools_dir.mkdir(parents=True)
-            
-            # Create sample DSC file
-            dsc_file = workspace / "test.dsc"
-            dsc_content = """
+_DSC_CONTENT = """
 [Defines]
   PLATFORM_NAME = TestPlatform
   PLATFORM_GUID = 12345678-1234-1234-1234-123456789abc
@@ -39,48 +26,130 @@ class TestMCPServer:
 [Components]
   TestPkg/Module1/Module1.inf
 """
-            dsc_file.write_text(dsc_content)
-            
-            yield {
-                'workspace': str(workspace),
-                'edk2_path': str(edk2_dir),
-                'dsc_path': str(dsc_file)
-            }
-    
-    @pytest.fixture
-    def mcp_server(self, temp_workspace):
-        """Create MCP server instance"""
-        return MCPServer(temp_workspace['workspace'], temp_workspace['edk2_path'])
+_DSC_BYTES = _DSC_CONTENT.encode("utf-8")
+
+_EXPECTED_TOOLS = frozenset({
+    "parse_dsc",
+    "get_included_modules",
+    "find_function",
+    "get_module_dependencies",
+    "trace_call_path",
+    "analyze_function",
+    "search_code",
+    "get_build_statistics"
+})
+
+_EXPECTED_RESOURCES = frozenset({
+    "edk2://current-build-context",
+    "edk2://dependency-graph",
+    "edk2://function-index"
+})
+
+# Read-only sample build context shared by the tests
+_BASE_MODULES = (
+    ModuleInfo(
+        path="TestPkg/Module1/Module1.inf",
+        name="Module1",
+        type="DXE_DRIVER",
+        guid="11111111-1111-1111-1111-111111111111",
+        architecture=["X64"],
+        dependencies=["BaseLib"],
+        source_files=["Module1.c"],
+        include_paths=[]
+    ),
+)
+
+_BASE_DSC_CONTEXT = DSCContext(
+    dsc_path="test.dsc",
+    workspace_root="/test",
+    build_flags={"TARGET": "DEBUG", "ARCH": "X64"},
+    included_modules=list(_BASE_MODULES),
+    library_mappings={"BaseLib": "MdePkg/Library/BaseLib/BaseLib.inf"},
+    include_paths=[],
+    preprocessor_definitions={},
+    architecture="X64",
+    build_target="DEBUG",
+    toolchain="VS2019",
+    timestamp=datetime(2024, 1, 1)
+)
+
+# Canned query engine results; the handlers only read these
+_INCLUDED_MODULES = (
+    ModuleInfo("TestPkg/Module1/Module1.inf", "Module1", "DXE_DRIVER", 
+              "guid", ["X64"], ["BaseLib"], ["Module1.c"], []),
+    ModuleInfo("TestPkg/Module2/Module2.inf", "Module2", "PEIM", 
+              "guid2", ["X64"], ["BaseLib"], ["Module2.c"], [])
+)
+
+_MODULE_DEPENDENCIES = ModuleDependencies(
+    module_name="TestModule",
+    module_path="TestPkg/TestModule/TestModule.inf",
+    direct_dependencies=["BaseLib", "UefiLib"],
+    transitive_dependencies=["BaseLib", "UefiLib", "DebugLib"],
+    dependents=["OtherModule"],
+    library_mappings={"BaseLib": "MdePkg/Library/BaseLib/BaseLib.inf"}
+)
+
+_CALL_PATHS = (
+    CallPath(
+        caller_function="CallerFunc",
+        called_function="TestFunction",
+        call_chain=["CallerFunc", "TestFunction"],
+        file_path="/test/file.c",
+        line_number=20
+    ),
+)
+
+def _query_engine(**returns):
+    """Build a QueryEngine mock with the given method return values"""
+    engine = Mock(spec=QueryEngine)
+    for method, value in returns.items():
+        getattr(engine, method).return_value = value
+    return engine
+
+
+@pytest.fixture(scope="class")
+def temp_workspace():
+    """Create temporary workspace for testing (read-only, shared by the class)"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        workspace = Path(temp_dir)
+        
+        # Create EDK2 directory structure
+        edk2_dir = workspace / "edk2"
+        basetools_dir = edk2_dir / "BaseTools" / "Source" / "Python"
+        basetools_dir.mkdir(parents=True)
+        
+        # Create sample DSC file
+        dsc_file = workspace / "test.dsc"
+        dsc_file.write_bytes(_DSC_BYTES)
+        
+        yield {
+            'workspace': str(workspace),
+            'edk2_path': str(edk2_dir),
+            'dsc_path': str(dsc_file)
+        }
+
+@pytest.fixture(scope="class")
+def prototype_server(temp_workspace):
+    """Build one MCP server per class; tests get cheap copies of it"""
+    return MCPServer(temp_workspace['workspace'], temp_workspace['edk2_path'])
+
+@pytest.fixture
+def mcp_server(prototype_server):
+    """Copy of the prototype server with no DSC context loaded"""
+    server = copy.copy(prototype_server)
+    server.current_dsc_context = None
+    server.current_dependency_graph = None
+    server.query_engine = None
+    return server
+
+class TestMCPServer:
+    """Test cases for MCP Server"""
     
     @pytest.fixture
     def sample_dsc_context(self):
-        """Sample DSC context for testing"""
-        modules = [
-            ModuleInfo(
-                path="TestPkg/Module1/Module1.inf",
-                name="Module1",
-                type="DXE_DRIVER",
-                guid="11111111-1111-1111-1111-111111111111",
-                architecture=["X64"],
-                dependencies=["BaseLib"],
-                source_files=["Module1.c"],
-                include_paths=[]
-            )
-        ]
-        
-        return DSCContext(
-            dsc_path="test.dsc",
-            workspace_root="/test",
-            build_flags={"TARGET": "DEBUG", "ARCH": "X64"},
-            included_modules=modules,
-            library_mappings={"BaseLib": "MdePkg/Library/BaseLib/BaseLib.inf"},
-            include_paths=[],
-            preprocessor_definitions={},
-            architecture="X64",
-            build_target="DEBUG",
-            toolchain="VS2019",
-            timestamp=datetime.now()
-        )
+        """Sample DSC context for testing (shared; use dataclasses.replace for variants)"""
+        return _BASE_DSC_CONTEXT
     
     def test_mcp_server_initialization(self, mcp_server, temp_workspace):
         """Test MCP server initialization"""
@@ -98,20 +167,8 @@ class TestMCPServer:
         
         assert len(tools) > 0
         
-        tool_names = [tool["name"] for tool in tools]
-        expected_tools = [
-            "parse_dsc",
-            "get_included_modules",
-            "find_function",
-            "get_module_dependencies",
-            "trace_call_path",
-            "analyze_function",
-            "search_code",
-            "get_build_statistics"
-        ]
-        
-        for expected_tool in expected_tools:
-            assert expected_tool in tool_names
+        tool_names = {tool["name"] for tool in tools}
+        assert _EXPECTED_TOOLS <= tool_names
         
         # Check that each tool has required fields
         for tool in tools:
@@ -127,15 +184,8 @@ class TestMCPServer:
         
         assert len(resources) > 0
         
-        resource_uris = [resource["uri"] for resource in resources]
-        expected_resources = [
-            "edk2://current-build-context",
-            "edk2://dependency-graph",
-            "edk2://function-index"
-        ]
-        
-        for expected_resource in expected_resources:
-            assert expected_resource in resource_uris
+        resource_uris = {resource["uri"] for resource in resources}
+        assert _EXPECTED_RESOURCES <= resource_uris
         
         # Check that each resource has required fields
         for resource in resources:
@@ -173,25 +223,59 @@ class TestMCPServer:
                 assert mcp_server.current_dependency_graph is not None
                 assert mcp_server.query_engine is not None
     
-    def test_handle_get_included_modules_no_context(self, mcp_server):
-        """Test get_included_modules without DSC context"""
-        result = mcp_server._handle_get_included_modules({})
+    def test_handle_parse_dsc_reuses_unchanged_context(self, tmp_path):
+        """Test that parse_dsc only re-parses when the flags or a file the parse read change"""
+        (tmp_path / "edk2" / "BaseTools" / "Source" / "Python").mkdir(parents=True)
+        dsc_file = tmp_path / "test.dsc"
+        dsc_file.write_bytes(_DSC_BYTES)
+        server = MCPServer(str(tmp_path), str(tmp_path / "edk2"))
+        arguments = {"dsc_path": str(dsc_file)}
+        
+        with patch.object(server.dsc_parser, 'parse_dsc', wraps=server.dsc_parser.parse_dsc) as spy:
+            assert server._handle_parse_dsc(arguments)["modules_found"] == 0
+            assert server._handle_parse_dsc(arguments)["success"]
+            assert spy.call_count == 1
+        
+            # The INF the DSC names appearing changes the parse
+            inf_file = tmp_path / "TestPkg" / "Module1" / "Module1.inf"
+            inf_file.parent.mkdir(parents=True)
+            inf_file.write_text("[Defines]\n  BASE_NAME = Module1\n  MODULE_TYPE = DXE_DRIVER\n")
+            assert server._handle_parse_dsc(arguments)["modules_found"] == 1
+            assert spy.call_count == 2
+        
+            # So does an edit to it
+            stat_result = inf_file.stat()
+            os.utime(inf_file, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10**9))
+            assert server._handle_parse_dsc(arguments)["success"]
+            assert spy.call_count == 3
+        
+            # And different build flags
+            arguments["build_flags"] = {"TARGET": "RELEASE"}
+            assert server._handle_parse_dsc(arguments)["success"]
+            assert spy.call_count == 4
+    
+    @pytest.mark.parametrize("handler,args,error", [
+        ("_handle_get_included_modules", {}, "No DSC context loaded"),
+        ("_handle_find_function", {"function_name": "TestFunction"}, "No DSC context loaded"),
+        ("_handle_get_module_dependencies", {"module_name": "TestModule"}, "No DSC context loaded"),
+        ("_handle_trace_call_path", {"function_name": "TestFunction"}, "No DSC context loaded"),
+        ("_handle_search_code", {"query": "test query"}, "No DSC context loaded"),
+        ("_handle_get_build_statistics", {}, "No DSC context loaded"),
+        ("_get_build_context_resource", None, "No DSC context loaded"),
+        ("_get_dependency_graph_resource", None, "No dependency graph available"),
+        ("_get_function_index_resource", None, "No query engine available"),
+    ])
+    def test_handler_no_context(self, mcp_server, handler, args, error):
+        """Test tool handlers and resource getters before a DSC is loaded"""
+        method = getattr(mcp_server, handler)
+        result = method() if args is None else method(args)
         
         assert result["success"] == False
-        assert "No DSC context loaded" in result["error"]
+        assert error in result["error"]
     
     def test_handle_get_included_modules_with_context(self, mcp_server, sample_dsc_context):
         """Test get_included_modules with DSC context"""
-        # Set up mock query engine
-        mock_query_engine = Mock()
-        mock_modules = [
-            ModuleInfo("TestPkg/Module1/Module1.inf", "Module1", "DXE_DRIVER", 
-                      "guid", ["X64"], ["BaseLib"], ["Module1.c"], []),
-            ModuleInfo("TestPkg/Module2/Module2.inf", "Module2", "PEIM", 
-                      "guid2", ["X64"], ["BaseLib"], ["Module2.c"], [])
-        ]
-        mock_query_engine.get_included_modules.return_value = mock_modules
-        mcp_server.query_engine = mock_query_engine
+        mcp_server.query_engine = _query_engine(get_included_modules=_INCLUDED_MODULES)
         
         # Test without filter
         result = mcp_server._handle_get_included_modules({})
@@ -207,19 +291,8 @@ class TestMCPServer:
         assert result["count"] == 1  # Only one DXE_DRIVER
         assert result["filter_applied"] == "DXE_DRIVER"
     
-    def test_handle_find_function_no_context(self, mcp_server):
-        """Test find_function without DSC context"""
-        result = mcp_server._handle_find_function({"function_name": "TestFunction"})
-        
-        assert result["success"] == False
-        assert "No DSC context loaded" in result["error"]
-    
     def test_handle_find_function_with_context(self, mcp_server, sample_dsc_context):
         """Test find_function with DSC context"""
-        from edk2_navigator.query_engine import FunctionLocation
-        
-        # Set up mock query engine
-        mock_query_engine = Mock()
         mock_locations = [
             FunctionLocation(
                 function_name="TestFunction",
@@ -232,8 +305,7 @@ class TestMCPServer:
                 return_type="EFI_STATUS"
             )
         ]
-        mock_query_engine.find_function.return_value = mock_locations
-        mcp_server.query_engine = mock_query_engine
+        mcp_server.query_engine = _query_engine(find_function=mock_locations)
         mcp_server.current_dsc_context = sample_dsc_context
         
         result = mcp_server._handle_find_function({"function_name": "TestFunction"})
@@ -250,29 +322,9 @@ class TestMCPServer:
         assert location["is_definition"] == True
         assert location["calling_convention"] == "EFIAPI"
     
-    def test_handle_get_module_dependencies_no_context(self, mcp_server):
-        """Test get_module_dependencies without DSC context"""
-        result = mcp_server._handle_get_module_dependencies({"module_name": "TestModule"})
-        
-        assert result["success"] == False
-        assert "No DSC context loaded" in result["error"]
-    
     def test_handle_get_module_dependencies_with_context(self, mcp_server, sample_dsc_context):
         """Test get_module_dependencies with DSC context"""
-        from edk2_navigator.query_engine import ModuleDependencies
-        
-        # Set up mock query engine
-        mock_query_engine = Mock()
-        mock_dependencies = ModuleDependencies(
-            module_name="TestModule",
-            module_path="TestPkg/TestModule/TestModule.inf",
-            direct_dependencies=["BaseLib", "UefiLib"],
-            transitive_dependencies=["BaseLib", "UefiLib", "DebugLib"],
-            dependents=["OtherModule"],
-            library_mappings={"BaseLib": "MdePkg/Library/BaseLib/BaseLib.inf"}
-        )
-        mock_query_engine.get_module_dependencies.return_value = mock_dependencies
-        mcp_server.query_engine = mock_query_engine
+        mcp_server.query_engine = _query_engine(get_module_dependencies=_MODULE_DEPENDENCIES)
         mcp_server.current_dsc_context = sample_dsc_context
         
         result = mcp_server._handle_get_module_dependencies({
@@ -287,30 +339,9 @@ class TestMCPServer:
         assert "transitive_dependencies" in result
         assert len(result["dependents"]) == 1
     
-    def test_handle_trace_call_path_no_context(self, mcp_server):
-        """Test trace_call_path without DSC context"""
-        result = mcp_server._handle_trace_call_path({"function_name": "TestFunction"})
-        
-        assert result["success"] == False
-        assert "No DSC context loaded" in result["error"]
-    
     def test_handle_trace_call_path_with_context(self, mcp_server, sample_dsc_context):
         """Test trace_call_path with DSC context"""
-        from edk2_navigator.query_engine import CallPath
-        
-        # Set up mock query engine
-        mock_query_engine = Mock()
-        mock_call_paths = [
-            CallPath(
-                caller_function="CallerFunc",
-                called_function="TestFunction",
-                call_chain=["CallerFunc", "TestFunction"],
-                file_path="/test/file.c",
-                line_number=20
-            )
-        ]
-        mock_query_engine.trace_call_path.return_value = mock_call_paths
-        mcp_server.query_engine = mock_query_engine
+        mcp_server.query_engine = _query_engine(trace_call_path=_CALL_PATHS)
         mcp_server.current_dsc_context = sample_dsc_context
         
         result = mcp_server._handle_trace_call_path({
@@ -328,17 +359,8 @@ class TestMCPServer:
         assert call_path["caller_function"] == "CallerFunc"
         assert call_path["called_function"] == "TestFunction"
     
-    def test_handle_search_code_no_context(self, mcp_server):
-        """Test search_code without DSC context"""
-        result = mcp_server._handle_search_code({"query": "test query"})
-        
-        assert result["success"] == False
-        assert "No DSC context loaded" in result["error"]
-    
     def test_handle_search_code_with_context(self, mcp_server, sample_dsc_context):
         """Test search_code with DSC context"""
-        # Set up mock query engine
-        mock_query_engine = Mock()
         mock_results = [
             {
                 "file_path": "/test/file.c",
@@ -348,8 +370,7 @@ class TestMCPServer:
                 "relevance_score": 0.9
             }
         ]
-        mock_query_engine.search_code_semantic.return_value = mock_results
-        mcp_server.query_engine = mock_query_engine
+        mcp_server.query_engine = _query_engine(search_code_semantic=mock_results)
         mcp_server.current_dsc_context = sample_dsc_context
         
         result = mcp_server._handle_search_code({
@@ -368,13 +389,6 @@ class TestMCPServer:
         assert search_result["file_path"] == "/test/file.c"
         assert search_result["line_number"] == 15
     
-    def test_handle_get_build_statistics_no_context(self, mcp_server):
-        """Test get_build_statistics without DSC context"""
-        result = mcp_server._handle_get_build_statistics({})
-        
-        assert result["success"] == False
-        assert "No DSC context loaded" in result["error"]
-    
     def test_handle_get_build_statistics_with_context(self, mcp_server, sample_dsc_context):
         """Test get_build_statistics with DSC context"""
         mcp_server.current_dsc_context = sample_dsc_context
@@ -457,10 +471,8 @@ class TestMCPServer:
     
     def test_handle_resource_request_function_index(self, mcp_server):
         """Test handling function index resource request"""
-        # Set up mock query engine
-        mock_query_engine = Mock()
-        mock_query_engine.function_cache = {"func1": []}
-        mcp_server.query_engine = mock_query_engine
+        mcp_server.query_engine = _query_engine()
+        mcp_server.query_engine.function_cache = {"func1": []}
         
         mock_graph = Mock()
         mock_graph.nodes = {"module1": Mock()}
@@ -490,24 +502,3 @@ class TestMCPServer:
             assert result["success"] == False
             assert "Test error" in result["error"]
             assert result["error_type"] == "Exception"
-    
-    def test_get_build_context_resource_no_context(self, mcp_server):
-        """Test getting build context resource without context"""
-        result = mcp_server._get_build_context_resource()
-        
-        assert result["success"] == False
-        assert "No DSC context loaded" in result["error"]
-    
-    def test_get_dependency_graph_resource_no_graph(self, mcp_server):
-        """Test getting dependency graph resource without graph"""
-        result = mcp_server._get_dependency_graph_resource()
-        
-        assert result["success"] == False
-        assert "No dependency graph available" in result["error"]
-    
-    def test_get_function_index_resource_no_engine(self, mcp_server):
-        """Test getting function index resource without query engine"""
-        result = mcp_server._get_function_index_resource()
-        
-        assert result["success"] == False
-        assert "No query engine available" in result["error"]
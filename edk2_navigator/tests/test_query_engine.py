@@ -254,6 +254,14 @@ TestFunction (
         assert match.group(2) == "EFIAPI"  # Calling convention
         assert match.group(3) == "TestFunction"  # Function name
     
+    def test_compiled_patterns_shared(self, sample_dependency_graph):
+        """Test that query engines share one set of compiled patterns"""
+        first = QueryEngine(sample_dependency_graph)
+        second = QueryEngine(sample_dependency_graph)
+        
+        assert first.function_def_pattern is second.function_def_pattern
+        assert first.function_call_pattern is second.function_call_pattern
+    
     def test_find_source_file_paths(self, sample_dependency_graph):
         """Test finding source file paths"""
         engine = QueryEngine(sample_dependency_graph)
@@ -272,6 +280,23 @@ TestFunction (
             # Should find at least one path (may not be the exact one due to path resolution)
             assert isinstance(paths, list)
     
+    def test_find_source_file_paths_cached(self, sample_dependency_graph):
+        """Test that source file resolution is reused across queries"""
+        engine = QueryEngine(sample_dependency_graph)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            module_dir = Path(temp_dir) / "TestPkg" / "Module1"
+            module_dir.mkdir(parents=True)
+            (module_dir / "Module1.c").write_text("// Test source file")
+            module_path = str(module_dir / "Module1.inf")
+            
+            paths = engine._find_source_file_paths("Module1.c", module_path)
+            assert str(module_dir / "Module1.c") in paths
+            
+            with patch.object(Path, 'exists') as mock_exists:
+                assert engine._find_source_file_paths("Module1.c", module_path) == paths
+                mock_exists.assert_not_called()
+    
     def test_get_transitive_dependencies(self, sample_dependency_graph):
         """Test getting transitive dependencies"""
         engine = QueryEngine(sample_dependency_graph)
@@ -283,27 +308,26 @@ TestFunction (
         assert "BaseLib" in transitive_deps
         assert "UefiLib" in transitive_deps
     
-    def test_extract_function_definitions_with_various_patterns(self, sample_dependency_graph):
+    @pytest.mark.parametrize("code,expected_name,expected_return,expected_conv", [
+        # Standard EFIAPI function
+        ("EFI_STATUS EFIAPI TestFunc1(VOID) {", "TestFunc1", "EFI_STATUS", "EFIAPI"),
+        # Function without calling convention
+        ("VOID TestFunc2(UINTN Param) {", "TestFunc2", "VOID", ""),
+        # Static function
+        ("STATIC EFI_STATUS TestFunc3(VOID) {", "TestFunc3", "EFI_STATUS", ""),
+        # Function with pointer return type
+        ("VOID* EFIAPI TestFunc4(VOID) {", "TestFunc4", "VOID*", "EFIAPI"),
+    ])
+    def test_extract_function_definitions_with_various_patterns(self, sample_dependency_graph, code,
+                                                                expected_name, expected_return, expected_conv):
         """Test extracting function definitions with various EDK2 patterns"""
         engine = QueryEngine(sample_dependency_graph)
         
-        test_cases = [
-            # Standard EFIAPI function
-            ("EFI_STATUS EFIAPI TestFunc1(VOID) {", "TestFunc1", "EFI_STATUS", "EFIAPI"),
-            # Function without calling convention
-            ("VOID TestFunc2(UINTN Param) {", "TestFunc2", "VOID", ""),
-            # Static function
-            ("STATIC EFI_STATUS TestFunc3(VOID) {", "TestFunc3", "EFI_STATUS", ""),
-            # Function with pointer return type
-            ("VOID* EFIAPI TestFunc4(VOID) {", "TestFunc4", "VOID*", "EFIAPI"),
-        ]
+        definitions = engine._extract_function_definitions(code, "/test/file.c", expected_name)
         
-        for code, expected_name, expected_return, expected_conv in test_cases:
-            definitions = engine._extract_function_definitions(code, "/test/file.c", expected_name)
-            
-            if definitions:  # Only test if we found the function
-                definition = definitions[0]
-                assert definition.function_name == expected_name
-                assert definition.return_type == expected_return
-                assert definition.calling_convention == expected_conv
-                assert definition.is_definition == True
+        if definitions:  # Only test if we found the function
+            definition = definitions[0]
+            assert definition.function_name == expected_name
+            assert definition.return_type == expected_return
+            assert definition.calling_convention == expected_conv
+            assert definition.is_definition == True
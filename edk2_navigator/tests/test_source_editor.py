@@ -0,0 +1,249 @@
+"""
+Tests for Source Editor functionality
+"""
+import os
+import re
+import pytest
+import tempfile
+from pathlib import Path
+from edk2_navigator.source_editor import SourceEditor
+from edk2_navigator.exceptions import EDK2NavigatorError
+
+_DRIVER_SOURCE = (
+    b"#include <Uefi.h>\n"
+    b"#include <Library/DebugLib.h>\n"
+    b"\n"
+    b"EFI_STATUS\n"
+    b"EFIAPI\n"
+    b"HelperFunction (\n"
+    b"  VOID\n"
+    b"  )\n"
+    b"{\n"
+    b"  return EFI_SUCCESS;\n"
+    b"}\n"
+)
+
+_NEW_FUNCTION = "VOID\nNewFunction (\n  VOID\n  )\n{\n}"
+
+_HELPER_REPLACEMENT = "EFI_STATUS\nEFIAPI\nHelperFunction (\n  VOID\n  )\n{\n  return EFI_UNSUPPORTED;\n}"
+
+# (method, arguments, expected file bytes) - the same edits the line-list implementation produced
+_EDIT_CASES = [
+    ("insert_at_line", (4, "// Comment"),
+     _DRIVER_SOURCE.replace(b"\nEFI_STATUS", b"\n// Comment\nEFI_STATUS")),
+    ("insert_at_line", (12, "// Tail"), _DRIVER_SOURCE + b"// Tail\n"),
+    ("delete_lines", (4, 5), _DRIVER_SOURCE.replace(b"EFI_STATUS\nEFIAPI\n", b"")),
+    ("delete_lines", (9, 11), _DRIVER_SOURCE.replace(b"{\n  return EFI_SUCCESS;\n}\n", b"")),
+    ("add_include", ("#include <Library/BaseLib.h>",),
+     _DRIVER_SOURCE.replace(b"DebugLib.h>\n", b"DebugLib.h>\n#include <Library/BaseLib.h>\n")),
+    ("add_function", (_NEW_FUNCTION, "end"),
+     _DRIVER_SOURCE.replace(b"SUCCESS;\n}", b"SUCCESS;\n\n\n" + _NEW_FUNCTION.encode() + b"\n\n}")),
+    ("add_function", ("VOID\nFirst (VOID)\n{\n}", "beginning"),
+     _DRIVER_SOURCE.replace(b"\nEFI_STATUS", b"\n\n\nVOID\nFirst (VOID)\n{\n}\n\nEFI_STATUS")),
+    ("modify_function", ("HelperFunction", _HELPER_REPLACEMENT),
+     _DRIVER_SOURCE.replace(b"EFI_SUCCESS", b"EFI_UNSUPPORTED")),
+]
+
+class TestSourceEditor:
+    """Test cases for Source Editor"""
+    
+    @pytest.fixture
+    def temp_workspace(self):
+        """Create temporary workspace for testing"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            workspace = Path(temp_dir)
+            edk2_dir = workspace / "edk2"
+            edk2_dir.mkdir()
+            
+            yield workspace
+    
+    @pytest.fixture
+    def editor(self, temp_workspace):
+        """Source editor rooted at the temporary workspace, without backups"""
+        return SourceEditor(str(temp_workspace), str(temp_workspace / "edk2"), create_backups=False)
+    
+    def test_search_in_file_crlf_line_end(self, editor, temp_workspace):
+        """Test that '$' matches at the end of a CRLF line"""
+        (temp_workspace / "Crlf.c").write_bytes(b"EFI_STATUS\r\nVOID\r\nFoo (VOID)\r\n")
+        
+        results = editor.search_in_file("Crlf.c", r"VOID$")
+        
+        assert [(r.line_number, r.match_start, r.match_end) for r in results] == [(2, 0, 4)]
+        assert results[0].line_content == "VOID"
+    
+    def test_search_in_file_does_not_cross_lines(self, editor, temp_workspace):
+        """Test that patterns are matched one line at a time"""
+        (temp_workspace / "Split.c").write_bytes(b"VOID\r\nFoo (\r\n  VOID\r\n  );\r\n")
+        
+        assert editor.search_in_file("Split.c", r"VOID\s+Foo") == []
+        
+        results = editor.search_in_file("Split.c", r"^\s*VOID")
+        assert [r.line_number for r in results] == [1, 3]
+        assert results[1].context_before == ["VOID", "Foo ("]
+        assert results[1].context_after == ["  );", ""]
+    
+    @pytest.mark.parametrize("method,args,expected", _EDIT_CASES)
+    def test_streaming_edit(self, editor, temp_workspace, method, args, expected):
+        """Test each edit spliced straight into the file"""
+        source = temp_workspace / "Driver.c"
+        source.write_bytes(_DRIVER_SOURCE)
+        
+        result = getattr(editor, method)("Driver.c", *args)
+        
+        assert result.success, result.error_message
+        assert source.read_bytes() == expected
+    
+    @pytest.mark.parametrize("method,args,expected", _EDIT_CASES)
+    def test_transaction_edit(self, editor, temp_workspace, method, args, expected):
+        """Test each edit applied through a transaction buffer"""
+        source = temp_workspace / "Driver.c"
+        source.write_bytes(_DRIVER_SOURCE)
+        
+        with editor.transaction("Driver.c") as tx:
+            result = getattr(tx, method)(*args)
+            assert result.success, result.error_message
+            # Nothing reaches the file before commit
+            assert source.read_bytes() == _DRIVER_SOURCE
+        
+        assert source.read_bytes() == expected
+    
+    def test_failed_edits_leave_file_untouched(self, editor, temp_workspace):
+        """Test that rejected edits report failure without writing"""
+        source = temp_workspace / "Driver.c"
+        source.write_bytes(_DRIVER_SOURCE)
+        
+        assert not editor.add_include("Driver.c", "#include <Uefi.h>").success
+        assert not editor.delete_lines("Driver.c", 5, 20).success
+        assert not editor.modify_function("Driver.c", "MissingFunction", "VOID MissingFunction () {}").success
+        
+        with editor.transaction("Driver.c") as tx:
+            result = tx.insert_at_line(20, "// Too far")
+            assert not result.success
+            assert "Invalid line number" in result.error_message
+        
+        assert source.read_bytes() == _DRIVER_SOURCE
+    
+    def test_transaction_batches_edits(self, temp_workspace):
+        """Test that a transaction applies its edits in order with one backup and one write"""
+        editor = SourceEditor(str(temp_workspace), str(temp_workspace / "edk2"))
+        source = temp_workspace / "Driver.c"
+        source.write_bytes(_DRIVER_SOURCE)
+        
+        with editor.transaction("Driver.c") as tx:
+            tx.add_include("#include <Library/BaseLib.h>")
+            tx.modify_function("HelperFunction", _HELPER_REPLACEMENT)
+            tx.delete_lines(4, 4)
+            tx.add_function(_NEW_FUNCTION, "beginning")
+        
+        # Each edit sees the buffer left by the previous one
+        expected = (
+            b"#include <Uefi.h>\n"
+            b"#include <Library/DebugLib.h>\n"
+            b"#include <Library/BaseLib.h>\n"
+            b"\n\n" + _NEW_FUNCTION.encode() + b"\n\n"
+            b"EFI_STATUS\n"
+            b"EFIAPI\n"
+            b"HelperFunction (\n"
+            b"  VOID\n"
+            b"  )\n"
+            b"{\n"
+            b"  return EFI_UNSUPPORTED;\n"
+            b"}\n"
+        )
+        assert source.read_bytes() == expected
+        assert tx.changes_made[0] == "Added include: #include <Library/BaseLib.h>"
+        assert len(tx.changes_made) == 4
+        assert len(editor.list_backups("Driver.c")) == 1
+        
+        # A transaction that fails to commit surfaces the error
+        with pytest.raises(EDK2NavigatorError):
+            with editor.transaction("Driver.c") as tx:
+                tx.insert_at_line(1, "// Header")
+                # Swap the file for a directory so the final replace cannot succeed
+                source.unlink()
+                source.mkdir()
+    
+    def test_search_in_files(self, editor, temp_workspace):
+        """Test searching several files at once keeps per-file order and line numbers"""
+        (temp_workspace / "Driver.c").write_bytes(_DRIVER_SOURCE)
+        (temp_workspace / "Other.c").write_bytes(b"VOID\nOtherFunction (\n  VOID\n  );\n")
+        (temp_workspace / "Empty.c").write_bytes(b"")
+        
+        results = editor.search_in_files(["Driver.c", "Empty.c", "Other.c"], r"\bVOID\b", context_lines=1)
+        
+        assert [(r.file_path, r.line_number) for r in results] == [
+            ("Driver.c", 7), ("Other.c", 1), ("Other.c", 3)
+        ]
+        assert results[0].context_before == ["HelperFunction ("]
+        assert results[0].context_after == ["  )"]
+        assert results == [result for path in ("Driver.c", "Other.c")
+                           for result in editor.search_in_file(path, r"\bVOID\b", context_lines=1)]
+        
+        with pytest.raises(EDK2NavigatorError):
+            editor.search_in_files(["Driver.c", "Missing.c"], "VOID")
+        
+        # An invalid pattern is reported as a package error, like any other search failure
+        with pytest.raises(EDK2NavigatorError):
+            editor.search_in_file("Driver.c", "VOID(")
+        with pytest.raises(EDK2NavigatorError):
+            editor.search_in_files(["Driver.c"], "VOID(")
+    
+    def test_search_in_file_non_ascii_columns(self, editor, temp_workspace):
+        """Test that match columns count characters, not bytes, on non-ASCII lines"""
+        line = '  Print (L"Größe: %d"); // café'
+        (temp_workspace / "Unicode.c").write_bytes(("VOID\n" + line + "\r\n").encode("utf-8"))
+        
+        results = editor.search_in_file("Unicode.c", "café")
+        assert len(results) == 1
+        assert results[0].line_content == line
+        assert (results[0].match_start, results[0].match_end) == (line.index("café"), len(line))
+        
+        results = editor.search_in_file("Unicode.c", r"%d")
+        assert (results[0].match_start, results[0].match_end) == (line.index("%d"), line.index("%d") + 2)
+    
+    def test_search_in_file_non_ascii_pattern(self, editor, temp_workspace):
+        """Test that non-ASCII patterns match whole characters, case-insensitively"""
+        (temp_workspace / "Accents.c").write_bytes("CAFÉ\r\ncafé x [é]\n".encode("utf-8"))
+        
+        def spans(pattern):
+            return [(r.line_number, r.match_start, r.match_end)
+                    for r in editor.search_in_file("Accents.c", pattern)]
+        
+        assert spans("café") == [(1, 0, 4), (2, 0, 4)]
+        assert spans(r"caf.\s") == [(2, 0, 5)]
+        assert spans(r"x \[.\]") == [(2, 5, 10)]
+        assert spans("[é]") == [(1, 3, 4), (2, 3, 4), (2, 8, 9)]
+    
+    @pytest.mark.parametrize("pattern", [
+        r"VOID", r"\bVOID\b", r"^\s*\)", r"x\s*y|y", r"\s+", r"", r"o*", r"(?s)Foo.*Bar",
+        r"VOID$", r"(?<!\n)VOID", r"(?!\s)\w+", r"\AFoo", r"\w+\Z", r"[é]+", r"(?i)foo",
+    ])
+    def test_search_in_file_matches_each_line(self, editor, temp_workspace, pattern):
+        """Test that the whole-text candidate scan finds exactly the per-line matches"""
+        text = "Foo (\r\n  VOID\r\n  x\n  y )\n\nBar VOID café\nFoo Bar\n  )"
+        (temp_workspace / "Mixed.c").write_bytes(text.encode("utf-8"))
+        
+        regex = re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+        expected = [(line_num, match.start(), match.end())
+                    for line_num, line in enumerate(text.replace("\r\n", "\n").split("\n"), 1)
+                    for match in regex.finditer(line)]
+        
+        results = editor.search_in_file("Mixed.c", pattern)
+        assert [(r.line_number, r.match_start, r.match_end) for r in results] == expected
+    
+    def test_backup_not_reused_after_same_stat_rewrite(self, temp_workspace):
+        """Test that a same-size rewrite keeping the old mtime still gets a fresh backup"""
+        editor = SourceEditor(str(temp_workspace), str(temp_workspace / "edk2"))
+        source = temp_workspace / "Driver.c"
+        source.write_bytes(b"VOID Old (VOID);\n")
+        original = source.stat()
+        
+        first = editor._create_backup("Driver.c")
+        assert editor._create_backup("Driver.c") == first
+        
+        # Simulate a coarse-timestamp filesystem: new bytes, same size and mtime
+        source.write_bytes(b"VOID New (VOID);\n")
+        os.utime(source, ns=(original.st_atime_ns, original.st_mtime_ns))
+        
+        second = editor._create_backup("Driver.c")
+        assert second.read_bytes() == b"VOID New (VOID);\n"
@@ -3,11 +3,27 @@ Utility functions for EDK2 Navigator
 """
 import os
 import re
+import functools
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Iterator, Optional, Tuple
+from .parse_cache import ParseCache
 
+_CONDITIONAL_PATTERN = re.compile(
+    r'!(?:if\s+(.+)|ifdef\s+(\w+)|ifndef\s+(\w+)|endif)', re.IGNORECASE
+)
+
+_INF_LIST_KEYS = ('sources', 'library_classes', 'protocols', 'guids')
+
+# Optional on-disk store behind the in-process INF parse cache
+_parse_cache: Optional[ParseCache] = None
+
+# A line that strips down to "[...]"
+_SECTION_HEADER_PATTERN = re.compile(r'^[^\S\n]*\[[^\n]*\][^\S\n]*$', re.MULTILINE)
+
+@functools.lru_cache(maxsize=65536)
 def normalize_path(path: str, workspace_root: str) -> str:
     """Normalize a path relative to workspace root"""
+    # Purely lexical, and the same module paths come up over and over
     path = Path(path)
     workspace_root = Path(workspace_root)
     
@@ -19,23 +35,87 @@ def normalize_path(path: str, workspace_root: str) -> str:
     else:
         return str(path)
 
+def iter_inf_files(directory: str, recursive: bool = True) -> Iterator[str]:
+    """Yield .inf files in a directory as they are found"""
+    # Walk with os.scandir and plain strings; EDK2 trees are large enough that
+    # building a Path per visited entry dominates the scan
+    root = str(Path(directory))
+    if not os.path.exists(root):
+        return
+    
+    pending = ['' if root == '.' else root]
+    while pending:
+        current = pending.pop()
+        try:
+            entries = os.scandir(current or '.')
+        except OSError:
+            continue
+        
+        with entries:
+            for entry in entries:
+                path = os.path.join(current, entry.name)
+                if os.path.normcase(entry.name).endswith('.inf'):
+                    yield path
+                if recursive and entry.is_dir(follow_symlinks=False):
+                    pending.append(path)
+
 def find_inf_files(directory: str, recursive: bool = True) -> List[str]:
     """Find all .inf files in a directory"""
-    directory = Path(directory)
-    if not directory.exists():
-        return []
-    
-    if recursive:
-        return [str(inf_file) for inf_file in directory.rglob("*.inf")]
-    else:
-        return [str(inf_file) for inf_file in directory.glob("*.inf")]
+    return list(iter_inf_files(directory, recursive))
+
+def file_stamp(path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
 
 def parse_inf_file(inf_path: str) -> Dict[str, any]:
     """Parse an INF file and extract basic information"""
     inf_path = Path(inf_path)
-    if not inf_path.exists():
+    try:
+        stat = inf_path.stat()
+    except OSError:
+        return {}
+    
+    # The same library INFs are parsed for many modules; reuse the parse
+    # until the file changes and hand out copies so callers can't alter it
+    cached = _parse_inf_cached(os.path.abspath(inf_path), stat.st_mtime_ns, stat.st_size)
+    if not cached:
         return {}
     
+    info = dict(cached)
+    info['path'] = str(inf_path)
+    info['defines'] = dict(cached['defines'])
+    for key in _INF_LIST_KEYS:
+        info[key] = list(cached[key])
+    return info
+
+def enable_parse_cache(db_path: Optional[str] = None) -> ParseCache:
+    """Persist parse_inf_file results on disk so later runs can skip parsing"""
+    global _parse_cache
+    if _parse_cache is not None:
+        _parse_cache.close()
+    _parse_cache = ParseCache(db_path) if db_path else ParseCache()
+    return _parse_cache
+
+def disable_parse_cache():
+    """Stop using the on-disk parse cache"""
+    global _parse_cache
+    if _parse_cache is not None:
+        _parse_cache.close()
+        _parse_cache = None
+
+@functools.lru_cache(maxsize=4096)
+def _parse_inf_cached(abs_path: str, mtime_ns: int, size: int) -> Dict[str, any]:
+    """Parse an INF file; keyed on its stat so edits invalidate the entry"""
+    if _parse_cache is not None:
+        stored = _parse_cache.get(abs_path, mtime_ns, size)
+        if stored is not None:
+            return stored
+    
+    inf_path = Path(abs_path)
     try:
         with open(inf_path, 'r', encoding='utf-8', errors='ignore') as f:
             content = f.read()
@@ -52,95 +132,102 @@ def parse_inf_file(inf_path: str) -> Dict[str, any]:
         'guids': []
     }
     
+    # List sections collect their stripped lines as-is
+    list_sections = {
+        'sources': info['sources'],
+        'libraryclasses': info['library_classes'],
+        'protocols': info['protocols'],
+        'guids': info['guids']
+    }
     current_section = None
+    section_items = None
     
     for line in content.split('\n'):
         line = line.strip()
         
         # Skip comments and empty lines
-        if not line or line.startswith('#'):
+        if not line or line[0] == '#':
             continue
         
-        # Check for section headers
-        if line.startswith('[') and line.endswith(']'):
-            current_section = line[1:-1].lower()
+        if line[0] == '[':
+            # Check for section headers
+            if line[-1] == ']':
+                current_section = line[1:-1].lower()
+                section_items = list_sections.get(current_section)
+                continue
+            if section_items is not None:
+                continue
+        elif section_items is not None:
+            section_items.append(line)
             continue
         
-        # Parse content based on current section
         if current_section == 'defines':
-            if '=' in line:
-                key, value = line.split('=', 1)
+            key, separator, value = line.partition('=')
+            if separator:
                 info['defines'][key.strip()] = value.strip()
-        
-        elif current_section == 'sources':
-            if line and not line.startswith('['):
-                info['sources'].append(line)
-        
-        elif current_section == 'libraryclasses':
-            if line and not line.startswith('['):
-                info['library_classes'].append(line)
-        
-        elif current_section == 'protocols':
-            if line and not line.startswith('['):
-                info['protocols'].append(line)
-        
-        elif current_section == 'guids':
-            if line and not line.startswith('['):
-                info['guids'].append(line)
+    
+    if _parse_cache is not None:
+        _parse_cache.put(abs_path, mtime_ns, size, info)
     
     return info
 
+@functools.lru_cache(maxsize=16)
+def _index_sections(content: str) -> Tuple[Tuple[str, ...], Dict[str, int], Tuple[Tuple[int, str], ...]]:
+    """Split content into stripped lines once and locate its section headers"""
+    lines = tuple(line.strip() for line in content.split('\n'))
+    first_header = {}
+    headers = []
+    
+    for index, line in enumerate(lines):
+        if line.startswith('[') and line.endswith(']'):
+            header = line.lower()
+            first_header.setdefault(header, index)
+            headers.append((index, header))
+    
+    return lines, first_header, tuple(headers)
+
 def parse_dsc_section(content: str, section_name: str) -> List[str]:
     """Parse a specific section from DSC file content"""
-    lines = content.split('\n')
-    in_section = False
-    section_content = []
+    # DSC/INF content is queried for several sections in a row, so the
+    # line split and header scan are shared between calls on the same text
+    lines, first_header, headers = _index_sections(content)
+    section_header = f'[{section_name.lower()}]'
     
-    for line in lines:
-        line = line.strip()
-        
-        # Check for section start
-        if line.lower() == f'[{section_name.lower()}]':
-            in_section = True
+    start = first_header.get(section_header)
+    if start is None:
+        return []
+    
+    # The section runs until the next header with a different name
+    end = len(lines)
+    repeated_headers = set()
+    for index, header in headers:
+        if index <= start:
             continue
-        
-        # Check for section end (new section starts)
-        if line.startswith('[') and line.endswith(']') and in_section:
+        if header != section_header:
+            end = index
             break
-        
-        # Collect section content
-        if in_section and line and not line.startswith('#'):
-            section_content.append(line)
+        repeated_headers.add(index)
     
-    return section_content
+    return [
+        lines[index]
+        for index in range(start + 1, end)
+        if lines[index] and not lines[index].startswith('#') and index not in repeated_headers
+    ]
 
 def extract_module_path_from_component(component_line: str) -> Optional[str]:
     """Extract module path from a component line in DSC file"""
-    # Remove any inline comments
-    if '#' in component_line:
-        component_line = component_line.split('#')[0]
-    
-    # Remove any build options (content in braces)
-    if '{' in component_line:
-        component_line = component_line.split('{')[0]
-    
-    component_line = component_line.strip()
+    # Remove any inline comments and build options (content in braces)
+    component_line = component_line.partition('#')[0].partition('{')[0].strip()
     
-    # Skip lines that are not module paths
-    if not component_line or component_line.startswith('<') or component_line.startswith('!') or component_line == '}':
+    # Only INF paths are wanted; skip <Section> markers, !directives and '}'
+    if not component_line.endswith('.inf') or component_line[0] in '<!':
         return None
     
     # Handle library class overrides (NULL|path or LibraryClass|path)
     if '|' in component_line:
-        parts = component_line.split('|', 1)
-        if len(parts) == 2:
-            component_line = parts[1].strip()
+        return component_line.partition('|')[2].strip()
     
-    # The component line should now just be the path to the INF file
-    if component_line.endswith('.inf'):
-        return component_line
-    
-    return None
+    return component_line
 
 def resolve_build_flags(dsc_content: str, build_flags: Dict[str, str]) -> Dict[str, str]:
     """Resolve build flags from DSC content and provided flags"""
@@ -150,8 +237,8 @@ def resolve_build_flags(dsc_content: str, build_flags: Dict[str, str]) -> Dict[s
     defines_section = parse_dsc_section(dsc_content, 'Defines')
     
     for line in defines_section:
-        if '=' in line:
-            key, value = line.split('=', 1)
+        key, separator, value = line.partition('=')
+        if separator:
             key = key.strip()
             value = value.strip()
             
@@ -182,23 +269,10 @@ def resolve_build_flags(dsc_content: str, build_flags: Dict[str, str]) -> Dict[s
 
 def is_conditional_line(line: str) -> Tuple[bool, Optional[str]]:
     """Check if a line contains conditional compilation directives"""
-    line = line.strip()
-    
-    # Check for !if, !ifdef, !ifndef directives
-    conditional_patterns = [
-        r'^\s*!if\s+(.+)',
-        r'^\s*!ifdef\s+(\w+)',
-        r'^\s*!ifndef\s+(\w+)'
-    ]
-    
-    for pattern in conditional_patterns:
-        match = re.match(pattern, line, re.IGNORECASE)
-        if match:
-            return True, match.group(1)
-    
-    # Check for !endif
-    if re.match(r'^\s*!endif', line, re.IGNORECASE):
-        return True, None
+    # !if, !ifdef and !ifndef capture their condition; !endif has none
+    match = _CONDITIONAL_PATTERN.match(line.strip())
+    if match:
+        return True, match.group(match.lastindex) if match.lastindex else None
     
     return False, None
 
@@ -236,29 +310,74 @@ def evaluate_conditional(condition: str, build_flags: Dict[str, str]) -> bool:
     # Default to True for unknown conditions
     return True
 
-def get_edk2_module_type(inf_content: str) -> str:
-    """Extract module type from INF file content"""
-    defines_section = parse_dsc_section(inf_content, 'Defines')
+def make_conditional_evaluator(build_flags: Dict[str, str]) -> Callable[[str], bool]:
+    """Build an evaluate_conditional bound to one set of build flags"""
+    # A platform DSC repeats the same few conditions many times for a fixed
+    # set of flags, so each distinct condition is evaluated only once
+    flags = dict(build_flags)
+    results: Dict[str, bool] = {}
+    
+    def evaluate(condition: str) -> bool:
+        result = results.get(condition)
+        if result is None:
+            result = results[condition] = evaluate_conditional(condition, flags)
+        return result
+    
+    return evaluate
+
+def _inf_defines_lines(inf_content: str) -> List[str]:
+    """parse_dsc_section(inf_content, 'Defines') without splitting the whole file"""
+    # Let the regex engine find the section headers and only split the
+    # [Defines] block itself, which is a handful of lines at the top of an INF
+    start = end = None
+    for header in _SECTION_HEADER_PATTERN.finditer(inf_content):
+        is_defines = header.group().strip().lower() == '[defines]'
+        if start is None:
+            if is_defines:
+                start = header.end()
+        elif not is_defines:
+            end = header.start()
+            break
     
-    for line in defines_section:
-        if '=' in line:
-            key, value = line.split('=', 1)
-            if key.strip().upper() == 'MODULE_TYPE':
-                return value.strip()
+    if start is None:
+        return []
     
-    return 'UNKNOWN'
+    lines = []
+    for line in inf_content[start:end].split('\n'):
+        line = line.strip()
+        if line and not line.startswith('#') and line.lower() != '[defines]':
+            lines.append(line)
+    return lines
+
+@functools.lru_cache(maxsize=1024)
+def _edk2_defines(inf_content: str) -> Dict[str, str]:
+    """Scan [Defines] once; keys are upper-cased and the first value wins"""
+    defines = {}
+    for line in _inf_defines_lines(inf_content):
+        key, separator, value = line.partition('=')
+        if separator:
+            defines.setdefault(key.strip().upper(), value.strip())
+    return defines
+
+def get_edk2_defines(inf_content: str) -> Dict[str, str]:
+    """Extract the [Defines] entries from INF file content"""
+    return dict(_edk2_defines(inf_content))
+
+def get_edk2_module_type(inf_content: str) -> str:
+    """Extract module type from INF file content"""
+    return _edk2_defines(inf_content).get('MODULE_TYPE', 'UNKNOWN')
 
 def get_edk2_module_guid(inf_content: str) -> str:
     """Extract module GUID from INF file content"""
-    defines_section = parse_dsc_section(inf_content, 'Defines')
-    
-    for line in defines_section:
-        if '=' in line:
-            key, value = line.split('=', 1)
-            if key.strip().upper() == 'FILE_GUID':
-                return value.strip()
-    
-    return ''
+    return _edk2_defines(inf_content).get('FILE_GUID', '')
+
+def _path_exists(path: Path) -> bool:
+    """Check a path with a single stat call"""
+    try:
+        os.stat(path)
+    except (OSError, ValueError):
+        return False
+    return True
 
 def validate_edk2_workspace(workspace_path: str, edk2_path: str) -> Tuple[bool, List[str]]:
     """Validate that the workspace contains a proper EDK2 setup"""
@@ -267,21 +386,24 @@ def validate_edk2_workspace(workspace_path: str, edk2_path: str) -> Tuple[bool,
     edk2_path = Path(edk2_path)
     
     # Check if workspace exists
-    if not workspace_path.exists():
+    if not _path_exists(workspace_path):
         errors.append(f"Workspace directory does not exist: {workspace_path}")
     
-    # Check if EDK2 directory exists
-    if not edk2_path.exists():
+    # Check if EDK2 directory exists; nothing below a missing directory
+    # needs its own stat
+    edk2_exists = _path_exists(edk2_path)
+    if not edk2_exists:
         errors.append(f"EDK2 directory does not exist: {edk2_path}")
     
     # Check for BaseTools
     basetools_path = edk2_path / "BaseTools"
-    if not basetools_path.exists():
+    basetools_exists = edk2_exists and _path_exists(basetools_path)
+    if not basetools_exists:
         errors.append(f"BaseTools directory not found: {basetools_path}")
     
     # Check for BaseTools Python scripts
     build_script = basetools_path / "Source" / "Python" / "build" / "build.py"
-    if not build_script.exists():
+    if not (basetools_exists and _path_exists(build_script)):
         errors.append(f"BaseTools build script not found: {build_script}")
     
     return len(errors) == 0, errors
@@ -13,11 +13,18 @@ import argparse
 import json
 import re
 import logging
+import multiprocessing
+import shutil
+import socket
+import stat
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from collections import defaultdict
 import pickle
+import shelve
 import hashlib
-from datetime import datetime
+import time
 
 # Add vendor/edk2 BaseTools to Python path
 SCRIPT_DIR = Path(__file__).parent.absolute()
@@ -46,30 +53,71 @@ except ImportError as e:
     print("Make sure EDK2 BaseTools are properly installed")
     sys.exit(1)
 
+# Below this many modules the pool start-up costs more than it saves
+PARALLEL_MIN_MODULES = 32
+
+# Minimum seconds between progress cache snapshots; each one pickles the whole index
+PROGRESS_SAVE_INTERVAL = 30
+
+# Per-INF parse results, reused while the INF, its DECs and the build context are unchanged
+FILE_CACHE_PATH = ".edk2_search_files.db"
+
+# Tries for --clone-edk2 before giving up on a flaky network
+CLONE_ATTEMPTS = 3
+
+# Most distinct (query, type) results search() remembers before starting over
+SEARCH_MEMO_SIZE = 1024
+
+# (workspace, packages path, arch) that _setup_environment last configured this process for
+_environment_signature = None
+
+
+class ModuleIndexError(Exception):
+    """A module INF from the DSC could not be read; raised the same way by serial and parallel indexing"""
+
 
 class EDK2SearchIndex:
     """Manages the searchable index of EDK2 components"""
     
-    def __init__(self, workspace_dir=None, packages_path=None, arch="X64"):
+    def __init__(self, workspace_dir=None, packages_path=None, arch="X64", jobs=None, resumable=False):
         self.workspace_dir = Path(workspace_dir or os.getcwd()).absolute()
         self.packages_path = packages_path or str(self.workspace_dir)
         self.arch = arch
+        self.jobs = jobs or os.cpu_count() or 1
+        self.resumable = resumable
         self.index = {
             'modules': {},      # module_path -> module_info
             'libraries': {},    # library_path -> library_info
             'packages': {},     # package_path -> package_info
-            'relationships': defaultdict(list),  # component -> [dependencies]
-            'reverse_relationships': defaultdict(list),  # component -> [dependents]
+            # Dicts with None values act as insertion-ordered sets of (type, key) pairs
+            'relationships': defaultdict(dict),  # component -> {dependencies}
+            'reverse_relationships': defaultdict(dict),  # component -> {dependents}
             'files': defaultdict(set),  # component -> set of source files
         }
         self.dsc_info = {}
+        self.macros = {}
+        # Cache stamp of the inputs the index was built from, see is_stale()
+        self._stamp = None
+        self._file_cache = None
+        self._file_digests = {}
+        self._build_context = ''
+        self._reset_search_index()
+        self._last_progress_save = time.monotonic()
         self._setup_environment()
         
     def _setup_environment(self):
         """Setup EDK2 environment variables"""
+        global _environment_signature
         workspace_str = str(self.workspace_dir)
         packages_path_str = self.packages_path or workspace_str
         
+        signature = (workspace_str, packages_path_str, self.arch)
+        if signature == _environment_signature:
+            # Same environment as last time; only the defines parse_dsc fills in need resetting
+            GlobalData.gCommandLineDefines = {}
+            GlobalData.gPlatformDefines = {}
+            return
+            
         # Create cache directory if it doesn't exist
         cache_dir = Path(".cache")
         cache_dir.mkdir(exist_ok=True)
@@ -110,6 +158,8 @@ class EDK2SearchIndex:
                 
         except ImportError:
             pass
+            
+        _environment_signature = signature
         
     def parse_dsc(self, dsc_path, macros=None):
         """Parse a DSC file using BaseTools"""
@@ -120,6 +170,9 @@ class EDK2SearchIndex:
         print(f"Parsing DSC: {dsc_path}")
         
         # Set up macros
+        self.macros = dict(macros or {})
+        # Taken before parsing so an edit made meanwhile still shows as stale
+        self._stamp = self._cache_stamp(dsc_path, self.macros)
         if macros:
             for key, value in macros.items():
                 GlobalData.gCommandLineDefines[key] = value
@@ -142,20 +195,36 @@ class EDK2SearchIndex:
             'arch': self.arch,
         }
         
+        self._open_file_cache()
+        self._last_progress_save = time.monotonic()
+        
         # Index modules with progress saving
         print(f"Indexing modules from {platform.PlatformName}...")
         module_count = 0
         total_modules = len(platform.Modules)
         
-        for module_path, module_info in platform.Modules.items():
-            self._index_module(workspace_db, module_path, module_info)
-            module_count += 1
-            
-            # Save progress every 50 modules
-            if module_count % 50 == 0:
-                print(f"  Processed {module_count}/{total_modules} modules...")
-                self._save_progress_cache()
-            
+        modules_done = False
+        if self.jobs > 1 and total_modules >= PARALLEL_MIN_MODULES:
+            try:
+                self._index_modules_parallel(platform)
+                modules_done = True
+            except ModuleIndexError:
+                # A broken module fails the serial pass too; don't parse everything twice
+                raise
+            except Exception as e:
+                # Anything already merged is skipped by the serial pass below
+                print(f"Warning: Parallel module indexing failed, continuing serially: {e}")
+                
+        if not modules_done:
+            for module_path, module_info in platform.Modules.items():
+                self._index_module(workspace_db, module_path, module_info)
+                module_count += 1
+                
+                # Save progress every 50 modules
+                if module_count % 50 == 0:
+                    print(f"  Processed {module_count}/{total_modules} modules...")
+                    self._save_progress_cache()
+                
         # Index libraries with progress saving
         print(f"Indexing libraries...")
         try:
@@ -189,18 +258,23 @@ class EDK2SearchIndex:
                             lib_items.append((attr_name, attr_value))
             
             lib_count = 0
-            start_time = datetime.now()
-            last_time = start_time
+            start_ns = time.monotonic_ns()
+            last_ns = start_ns
             
             logging.info(f"Found {len(lib_items)} library classes to process")
             
             for i, (lib_class, lib_info) in enumerate(lib_items):
-                current_time = datetime.now()
+                class_start_ns = time.monotonic_ns()
                 logging.debug(f"Processing library class {i+1}/{len(lib_items)}: {lib_class}")
                 
                 if isinstance(lib_info, dict):
                     logging.debug(f"Library class {lib_class} has {len(lib_info)} module types")
+                    # Module types often share one binding; index each object once
+                    seen_paths = set()
                     for module_type, lib_path in lib_info.items():
+                        if id(lib_path) in seen_paths:
+                            continue
+                        seen_paths.add(id(lib_path))
                         logging.debug(f"Indexing {module_type}: {lib_path}")
                         self._index_library(workspace_db, lib_path, lib_class)
                         lib_count += 1
@@ -210,19 +284,20 @@ class EDK2SearchIndex:
                     lib_count += 1
                     
                 # Show timing for slow library classes
-                class_time = datetime.now() - current_time
-                if class_time.total_seconds() > 1.0:
-                    logging.info(f"Library class {lib_class} took {class_time.total_seconds():.2f} seconds")
+                class_ns = time.monotonic_ns() - class_start_ns
+                if class_ns > 1_000_000_000:
+                    logging.info(f"Library class {lib_class} took {class_ns / 1e9:.2f} seconds")
                     
                 # Save progress every 5 library classes
                 if (i + 1) % 5 == 0:
-                    elapsed = datetime.now() - start_time
-                    recent_elapsed = datetime.now() - last_time
+                    now_ns = time.monotonic_ns()
+                    elapsed = (now_ns - start_ns) / 1e9
+                    recent_elapsed = (now_ns - last_ns) / 1e9
                     print(f"  Processed {i+1}/{len(lib_items)} library classes ({lib_count} total libraries) "
-                          f"in {elapsed.total_seconds():.2f} seconds total, "
-                          f"last 5 classes took {recent_elapsed.total_seconds():.2f} seconds", flush=True)
+                          f"in {elapsed:.2f} seconds total, "
+                          f"last 5 classes took {recent_elapsed:.2f} seconds", flush=True)
                     self._save_progress_cache()
-                    last_time = datetime.now()
+                    last_ns = time.monotonic_ns()
                     
         except Exception as e:
             print(f"Warning: Could not index libraries: {e}")
@@ -232,57 +307,103 @@ class EDK2SearchIndex:
         for package in platform.Packages:
             self._index_package(workspace_db, package)
             
+        self._close_file_cache()
+        
         print(f"Index complete: {len(self.index['modules'])} modules, "
               f"{len(self.index['libraries'])} libraries, "
               f"{len(self.index['packages'])} packages")
         
+        self._reset_search_index()
         return self.index
         
+    def _index_modules_parallel(self, platform):
+        """Parse the platform's module INFs in worker processes and merge the results"""
+        tasks = []
+        for module_path, module_info in platform.Modules.items():
+            module_key = str(module_path)
+            if module_key not in self.index['modules']:
+                tasks.append((module_key, module_info.Guid if module_info else None))
+                
+        if self._file_cache is not None:
+            self._prefetch_digests([module_key for module_key, module_guid in tasks])
+            
+        cached_entries = [self._load_cached_entry('module', module_key, module_guid)
+                          for module_key, module_guid in tasks]
+        misses = [task for task, cached_entry in zip(tasks, cached_entries) if cached_entry is None]
+        total_modules = len(platform.Modules)
+        
+        pool = None
+        if misses:
+            initargs = (
+                str(self.workspace_dir),
+                self.packages_path,
+                self.arch,
+                dict(GlobalData.gCommandLineDefines),
+                dict(GlobalData.gPlatformDefines),
+            )
+            pool = multiprocessing.Pool(self.jobs, initializer=_init_index_worker, initargs=initargs)
+            # imap keeps the DSC order, so the index matches a serial run
+            parsed_entries = pool.imap(_index_module_worker, misses, chunksize=8)
+            
+        try:
+            for module_count, module_entry in enumerate(cached_entries, 1):
+                if module_entry is None:
+                    module_entry = next(parsed_entries)
+                    if module_entry:
+                        self._store_cached_entry('module', module_entry)
+                        
+                if module_entry:
+                    self._add_module(module_entry)
+                    
+                if module_count % 50 == 0:
+                    print(f"  Processed {module_count}/{total_modules} modules...")
+                    self._save_progress_cache()
+        finally:
+            if pool is not None:
+                pool.terminate()
+                
     def _index_module(self, workspace_db, module_path, module_info):
         """Index a module and its relationships"""
         module_key = str(module_path)
-        
         if module_key in self.index['modules']:
             return
             
-        # Get module build data
-        module_data = workspace_db.BuildObject[module_path, self.arch, "RELEASE", "VS2019"]
+        module_guid = module_info.Guid if module_info else None
+        module_entry = self._load_cached_entry('module', module_key, module_guid)
+        if module_entry is None:
+            try:
+                module_entry = _read_module(workspace_db, module_path, module_guid, self.arch)
+            except Exception as e:
+                raise ModuleIndexError(f"Failed to index module {module_key}: {e}") from e
+            if module_entry:
+                self._store_cached_entry('module', module_entry)
+                
+        if module_entry:
+            self._add_module(module_entry)
+            
+    def _add_module(self, module_entry):
+        """Add a module entry from _read_module and record its relationships"""
+        module_key = module_entry['path']
         
-        if not module_data:
+        if module_key in self.index['modules']:
             return
             
-        self.index['modules'][module_key] = {
-            'path': module_key,
-            'name': module_data.BaseName if hasattr(module_data, 'BaseName') else Path(module_key).stem,
-            'guid': module_info.Guid if module_info else None,
-            'module_type': module_data.ModuleType if hasattr(module_data, 'ModuleType') else None,
-            'sources': [],
-            'libraries': [],
-            'packages': [],
-        }
+        self.index['modules'][module_key] = module_entry
         
         # Index source files
-        if hasattr(module_data, 'Sources'):
-            for source in module_data.Sources:
-                source_path = str(source)
-                self.index['modules'][module_key]['sources'].append(source_path)
-                self.index['files'][source_path].add(module_key)
-                
+        for source_path in module_entry['sources']:
+            self.index['files'][source_path].add(module_key)
+            
         # Index library dependencies
-        if hasattr(module_data, 'LibraryClasses'):
-            for lib_class in module_data.LibraryClasses:
-                self.index['modules'][module_key]['libraries'].append(lib_class)
-                self.index['relationships'][module_key].append(('library', lib_class))
-                self.index['reverse_relationships'][lib_class].append(('module', module_key))
-                
+        for lib_class in module_entry['libraries']:
+            self.index['relationships'][module_key][('library', lib_class)] = None
+            self.index['reverse_relationships'][lib_class][('module', module_key)] = None
+            
         # Index package dependencies
-        if hasattr(module_data, 'Packages'):
-            for package in module_data.Packages:
-                package_key = str(package.MetaFile)
-                self.index['modules'][module_key]['packages'].append(package_key)
-                self.index['relationships'][module_key].append(('package', package_key))
-                self.index['reverse_relationships'][package_key].append(('module', module_key))
-                
+        for package_key in module_entry['packages']:
+            self.index['relationships'][module_key][('package', package_key)] = None
+            self.index['reverse_relationships'][package_key][('module', module_key)] = None
+            
     def _index_library(self, workspace_db, library_path, library_class):
         """Index a library and its relationships"""
         library_key = str(library_path)
@@ -295,7 +416,7 @@ class EDK2SearchIndex:
         
         try:
             # Get library build data with error handling
-            start_time = datetime.now()
+            start_ns = time.monotonic_ns()
             
             # Validate library_path before attempting to access BuildObject
             if not library_path or library_path == '':
@@ -327,11 +448,22 @@ class EDK2SearchIndex:
                     logging.warning(f"Error extracting PathClass from tdict for library class {library_class}: {e}")
                     return
                     
+            # Several tdict bindings can unwrap to the same INF
+            if library_key in self.index['libraries']:
+                logging.debug(f"Library {library_key} already indexed, skipping")
+                return
+                
+            cached_entry = self._load_cached_entry('library', library_key)
+            if cached_entry is not None:
+                cached_entry['class'] = str(library_class)
+                self._add_library(cached_entry)
+                return
+                
             library_data = workspace_db.BuildObject[library_path, self.arch, "RELEASE", "VS2019"]
-            build_time = datetime.now() - start_time
+            build_ns = time.monotonic_ns() - start_ns
             
-            if build_time.total_seconds() > 0.5:
-                logging.info(f"BuildObject for {library_key} took {build_time.total_seconds():.2f} seconds")
+            if build_ns > 500_000_000:
+                logging.info(f"BuildObject for {library_key} took {build_ns / 1e9:.2f} seconds")
             
             if not library_data:
                 logging.debug(f"No build data found for library: {library_key}")
@@ -341,40 +473,133 @@ class EDK2SearchIndex:
             logging.warning(f"Failed to get build data for library {library_key} (class: {library_class}): {e}")
             return
             
+        complete = True
         try:
-            self.index['libraries'][library_key] = {
+            library_entry = {
                 'path': library_key,
-                'name': library_data.BaseName if hasattr(library_data, 'BaseName') else Path(library_key).stem,
+                'name': getattr(library_data, 'BaseName', None) or Path(library_key).stem,
                 'class': str(library_class),
                 'sources': [],
                 'packages': [],
             }
             
             # Index source files with error handling
-            if hasattr(library_data, 'Sources'):
-                try:
-                    for source in library_data.Sources:
-                        source_path = str(source)
-                        self.index['libraries'][library_key]['sources'].append(source_path)
-                        self.index['files'][source_path].add(library_key)
-                except Exception as e:
-                    logging.debug(f"Error indexing sources for library {library_key}: {e}")
-                    
+            try:
+                for source in getattr(library_data, 'Sources', ()):
+                    library_entry['sources'].append(str(source))
+            except Exception as e:
+                complete = False
+                logging.debug(f"Error indexing sources for library {library_key}: {e}")
+            
             # Index package dependencies with error handling
-            if hasattr(library_data, 'Packages'):
-                try:
-                    for package in library_data.Packages:
-                        package_key = str(package.MetaFile)
-                        self.index['libraries'][library_key]['packages'].append(package_key)
-                        self.index['relationships'][library_key].append(('package', package_key))
-                        self.index['reverse_relationships'][package_key].append(('library', library_key))
-                except Exception as e:
-                    logging.debug(f"Error indexing packages for library {library_key}: {e}")
-                    
+            try:
+                for package in getattr(library_data, 'Packages', ()):
+                    library_entry['packages'].append(str(package.MetaFile))
+            except Exception as e:
+                complete = False
+                logging.debug(f"Error indexing packages for library {library_key}: {e}")
+            
         except Exception as e:
             logging.warning(f"Error creating library index entry for {library_key}: {e}")
             return
+            
+        self._add_library(library_entry)
+        
+        # Don't let a partial read outlive this run
+        if complete:
+            self._store_cached_entry('library', library_entry)
+            
+    def _add_library(self, library_entry):
+        """Add a library entry and record its relationships"""
+        library_key = library_entry['path']
+        self.index['libraries'][library_key] = library_entry
+        
+        for source_path in library_entry['sources']:
+            self.index['files'][source_path].add(library_key)
+            
+        for package_key in library_entry['packages']:
+            self.index['relationships'][library_key][('package', package_key)] = None
+            self.index['reverse_relationships'][package_key][('library', library_key)] = None
+            
+    def _open_file_cache(self):
+        """Open the per-INF cache and fix the build context its entries are keyed on"""
+        self._file_digests = {}
+        self._build_context = repr((
+            self.arch,
+            sorted((str(k), str(v)) for k, v in GlobalData.gCommandLineDefines.items()),
+            sorted((str(k), str(v)) for k, v in GlobalData.gPlatformDefines.items()),
+        ))
+        try:
+            self._file_cache = shelve.open(FILE_CACHE_PATH)
+        except Exception as e:
+            print(f"Warning: Could not open file cache: {e}")
+            self._file_cache = None
+            
+    def _close_file_cache(self):
+        """Flush and close the per-INF cache"""
+        if self._file_cache is not None:
+            self._file_cache.close()
+            self._file_cache = None
+            
+    def _file_digest(self, path):
+        """SHA-1 of a file's contents, computed once per run"""
+        digest = self._file_digests.get(path)
+        if digest is None:
+            digest = self._file_digests[path] = _hash_file(path)
+        return digest
+        
+    def _prefetch_digests(self, paths):
+        """Hash many files on a thread pool; reads and SHA-1 both release the GIL"""
+        paths = [path for path in paths if path not in self._file_digests]
+        if len(paths) < 2:
+            return
+            
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+            for path, digest in zip(paths, executor.map(_hash_file, paths)):
+                self._file_digests[path] = digest
+        
+    def _input_digest(self, path):
+        """Digest of an INF together with the arch and macros it was parsed under"""
+        return hashlib.sha1((self._file_digest(path) + self._build_context).encode()).hexdigest()
+        
+    def _load_cached_entry(self, kind, path, module_guid=None):
+        """Return the cached index entry for an INF if none of its inputs changed"""
+        if self._file_cache is None:
+            return None
+            
+        try:
+            record = self._file_cache.get(f"{kind}:{path}")
+        except Exception:
+            return None
+            
+        if not record or record['hash'] != self._input_digest(path):
+            return None
+            
+        for package_key, digest in record['packages'].items():
+            if self._file_digest(package_key) != digest:
+                return None
                 
+        entry = record['entry']
+        if kind == 'module':
+            # The GUID comes from the DSC, not the INF
+            entry['guid'] = module_guid
+        return entry
+        
+    def _store_cached_entry(self, kind, entry):
+        """Remember a freshly parsed index entry for the next run"""
+        if self._file_cache is None:
+            return
+            
+        path = entry['path']
+        try:
+            self._file_cache[f"{kind}:{path}"] = {
+                'hash': self._input_digest(path),
+                'packages': {package_key: self._file_digest(package_key) for package_key in entry['packages']},
+                'entry': entry,
+            }
+        except Exception as e:
+            logging.debug(f"Could not cache {kind} {path}: {e}")
+            
     def _index_package(self, workspace_db, package):
         """Index a package"""
         package_key = str(package.MetaFile)
@@ -384,21 +609,24 @@ class EDK2SearchIndex:
             
         self.index['packages'][package_key] = {
             'path': package_key,
-            'name': package.PackageName if hasattr(package, 'PackageName') else Path(package_key).stem,
-            'guid': package.Guid if hasattr(package, 'Guid') else None,
-            'version': package.Version if hasattr(package, 'Version') else None,
+            'name': getattr(package, 'PackageName', None) or Path(package_key).stem,
+            'guid': getattr(package, 'Guid', None),
+            'version': getattr(package, 'Version', None),
             'includes': [],
             'libraries': [],
             'modules': [],
         }
         
         # Track which libraries and modules use this package
-        for lib_key, lib_deps in self.index['relationships'].items():
-            if ('package', package_key) in lib_deps:
-                if lib_key in self.index['libraries']:
-                    self.index['packages'][package_key]['libraries'].append(lib_key)
-                elif lib_key in self.index['modules']:
-                    self.index['packages'][package_key]['modules'].append(lib_key)
+        seen = set()
+        for ref_type, ref_key in self.index['reverse_relationships'].get(package_key, ()):
+            if ref_key in seen:
+                continue
+            seen.add(ref_key)
+            if ref_key in self.index['libraries']:
+                self.index['packages'][package_key]['libraries'].append(ref_key)
+            elif ref_key in self.index['modules']:
+                self.index['packages'][package_key]['modules'].append(ref_key)
                     
     def search(self, query, search_type='all'):
         """
@@ -414,54 +642,118 @@ class EDK2SearchIndex:
         results = []
         query_lower = query.lower()
         
+        # Repeated queries reuse earlier results until the index changes
+        memo_key = (query_lower, search_type)
+        cached = self._search_results.get(memo_key)
+        if cached is not None:
+            return [dict(result) for result in cached]
+            
+        self._search_calls += 1
+        if self._search_fields is None:
+            self._build_search_fields()
+        # A one-shot search is cheaper as a plain scan; build postings once searches repeat
+        if self._trigrams is None and self._search_calls > 1:
+            self._build_trigrams()
+            
         # Search modules
         if search_type in ['all', 'modules']:
-            for module_key, module_info in self.index['modules'].items():
-                if (query_lower in module_info['name'].lower() or
-                    query_lower in module_key.lower() or
-                    any(query_lower in src.lower() for src in module_info['sources'])):
-                    results.append({
-                        'type': 'module',
-                        'path': module_key,
-                        'info': module_info
-                    })
-                    
+            for module_key, module_info in self._search_matches('modules', query_lower):
+                results.append({
+                    'type': 'module',
+                    'path': module_key,
+                    'info': module_info
+                })
+                
         # Search libraries
         if search_type in ['all', 'libraries']:
-            for lib_key, lib_info in self.index['libraries'].items():
-                if (query_lower in lib_info['name'].lower() or
-                    query_lower in lib_key.lower() or
-                    query_lower in lib_info['class'].lower() or
-                    any(query_lower in src.lower() for src in lib_info['sources'])):
-                    results.append({
-                        'type': 'library',
-                        'path': lib_key,
-                        'info': lib_info
-                    })
-                    
+            for lib_key, lib_info in self._search_matches('libraries', query_lower):
+                results.append({
+                    'type': 'library',
+                    'path': lib_key,
+                    'info': lib_info
+                })
+                
         # Search packages
         if search_type in ['all', 'packages']:
-            for pkg_key, pkg_info in self.index['packages'].items():
-                if (query_lower in pkg_info['name'].lower() or
-                    query_lower in pkg_key.lower()):
-                    results.append({
-                        'type': 'package',
-                        'path': pkg_key,
-                        'info': pkg_info
-                    })
-                    
+            for pkg_key, pkg_info in self._search_matches('packages', query_lower):
+                results.append({
+                    'type': 'package',
+                    'path': pkg_key,
+                    'info': pkg_info
+                })
+                
         # Search files
         if search_type in ['all', 'files']:
-            for file_path, components in self.index['files'].items():
-                if query_lower in file_path.lower():
-                    results.append({
-                        'type': 'file',
-                        'path': file_path,
-                        'used_by': list(components)
-                    })
-                    
+            for file_path, components in self._search_matches('files', query_lower):
+                results.append({
+                    'type': 'file',
+                    'path': file_path,
+                    'used_by': list(components)
+                })
+                
+        if len(self._search_results) >= SEARCH_MEMO_SIZE:
+            self._search_results.clear()
+        self._search_results[memo_key] = [dict(result) for result in results]
+        
         return results
         
+    def _reset_search_index(self):
+        """Drop the lowercased search fields and remembered results after the index changes"""
+        self._search_fields = None
+        self._trigrams = None
+        self._search_calls = 0
+        self._search_results = {}
+        
+    def _build_search_fields(self):
+        """Lowercase every searchable field once, joined per component"""
+        # NUL can't appear in a query, so a match never spans two fields
+        def blob(*fields):
+            return '\0'.join(fields).lower()
+            
+        self._search_fields = {
+            'modules': [(key, info, blob(info['name'], key, *info['sources']))
+                        for key, info in self.index['modules'].items()],
+            'libraries': [(key, info, blob(info['name'], key, info['class'], *info['sources']))
+                          for key, info in self.index['libraries'].items()],
+            'packages': [(key, info, blob(info['name'], key))
+                         for key, info in self.index['packages'].items()],
+            'files': [(key, components, key.lower())
+                      for key, components in self.index['files'].items()],
+        }
+        
+    def _build_trigrams(self):
+        """Map every 3-character substring to the positions of the entries containing it"""
+        self._trigrams = {}
+        for kind, entries in self._search_fields.items():
+            postings = defaultdict(set)
+            for position, (key, value, text) in enumerate(entries):
+                for i in range(len(text) - 2):
+                    postings[text[i:i + 3]].add(position)
+            self._trigrams[kind] = postings
+            
+    def _search_matches(self, kind, query_lower):
+        """Return (key, value) pairs of one kind whose fields contain query_lower, in index order"""
+        entries = self._search_fields[kind]
+        
+        if self._trigrams is not None and len(query_lower) >= 3:
+            postings = self._trigrams[kind]
+            posting_sets = []
+            for i in range(len(query_lower) - 2):
+                posting = postings.get(query_lower[i:i + 3])
+                if not posting:
+                    return []
+                posting_sets.append(posting)
+            positions = sorted(set.intersection(*sorted(posting_sets, key=len)))
+        else:
+            positions = range(len(entries))
+            
+        matches = []
+        for position in positions:
+            key, value, text = entries[position]
+            if query_lower in text:
+                matches.append((key, value))
+        return matches
+        
     def generate_graph(self, output_path='dependency_graph.dot', component=None):
         """
         Generate a Graphviz DOT file of the dependency relationships
@@ -470,16 +762,6 @@ class EDK2SearchIndex:
             output_path: Path to save the DOT file
             component: Optional specific component to graph (None for all)
         """
-        dot_lines = ['digraph Dependencies {']
-        dot_lines.append('  rankdir=LR;')
-        dot_lines.append('  node [shape=box];')
-        dot_lines.append('')
-        
-        # Define node styles
-        dot_lines.append('  // Node styles')
-        dot_lines.append('  node [shape=box, style=filled];')
-        dot_lines.append('')
-        
         # Track nodes to add
         nodes_to_add = set()
         edges_to_add = []
@@ -495,47 +777,57 @@ class EDK2SearchIndex:
                     nodes_to_add.add(target)
                     edges_to_add.append((source, target))
                     
-        # Add nodes with appropriate styling
-        dot_lines.append('  // Nodes')
-        for node in nodes_to_add:
-            node_id = self._sanitize_dot_id(node)
-            node_label = Path(node).name if '/' in node or '\\' in node else node
-            
-            if node in self.index['modules']:
-                color = 'lightblue'
-                shape = 'box'
-            elif node in self.index['libraries']:
-                color = 'lightgreen'
-                shape = 'box'
-            elif node in self.index['packages']:
-                color = 'lightyellow'
-                shape = 'box3d'
-            else:
-                color = 'lightgray'
-                shape = 'ellipse'
+        # Every edge endpoint is a node, so each ID is sanitized exactly once
+        node_ids = {node: self._sanitize_dot_id(node) for node in nodes_to_add}
+        
+        # Stream the DOT file out instead of joining it in memory
+        output_path = Path(output_path)
+        with open(output_path, 'w', buffering=1 << 20) as out:
+            out.write('digraph Dependencies {\n')
+            out.write('  rankdir=LR;\n')
+            out.write('  node [shape=box];\n')
+            out.write('\n')
+            
+            # Define node styles
+            out.write('  // Node styles\n')
+            out.write('  node [shape=box, style=filled];\n')
+            out.write('\n')
+            
+            # Add nodes with appropriate styling
+            out.write('  // Nodes\n')
+            for node, node_id in node_ids.items():
+                node_label = Path(node).name if '/' in node or '\\' in node else node
                 
-            dot_lines.append(f'  "{node_id}" [label="{node_label}", fillcolor={color}, shape={shape}];')
+                if node in self.index['modules']:
+                    color = 'lightblue'
+                    shape = 'box'
+                elif node in self.index['libraries']:
+                    color = 'lightgreen'
+                    shape = 'box'
+                elif node in self.index['packages']:
+                    color = 'lightyellow'
+                    shape = 'box3d'
+                else:
+                    color = 'lightgray'
+                    shape = 'ellipse'
+                    
+                out.write(f'  "{node_id}" [label="{node_label}", fillcolor={color}, shape={shape}];\n')
+                
+            out.write('\n')
+            out.write('  // Edges\n')
             
-        dot_lines.append('')
-        dot_lines.append('  // Edges')
-        
-        # Add edges
-        for source, target in edges_to_add:
-            source_id = self._sanitize_dot_id(source)
-            target_id = self._sanitize_dot_id(target)
-            dot_lines.append(f'  "{source_id}" -> "{target_id}";')
+            # Add edges
+            for source, target in edges_to_add:
+                out.write(f'  "{node_ids[source]}" -> "{node_ids[target]}";\n')
+                
+            out.write('}')
             
-        dot_lines.append('}')
-        
-        # Write DOT file
-        output_path = Path(output_path)
-        output_path.write_text('\n'.join(dot_lines))
         print(f"Dependency graph saved to: {output_path}")
         
         return output_path
         
     def _collect_component_graph(self, component, nodes, edges, visited=None):
-        """Recursively collect nodes and edges for a component"""
+        """Collect nodes and edges reachable from a component, depth first"""
         if visited is None:
             visited = set()
             
@@ -545,20 +837,28 @@ class EDK2SearchIndex:
         visited.add(component)
         nodes.add(component)
         
-        # Add dependencies
-        if component in self.index['relationships']:
-            for dep_type, dep in self.index['relationships'][component]:
-                nodes.add(dep)
-                edges.append((component, dep))
-                self._collect_component_graph(dep, nodes, edges, visited)
-                
-        # Add dependents
-        if component in self.index['reverse_relationships']:
-            for dep_type, dep in self.index['reverse_relationships'][component]:
+        # An explicit stack of neighbour iterators visits edges in the same order
+        # as a recursive walk, without deep graphs hitting the recursion limit
+        stack = [self._graph_neighbours(component)]
+        while stack:
+            for edge, dep in stack[-1]:
                 nodes.add(dep)
-                edges.append((dep, component))
-                self._collect_component_graph(dep, nodes, edges, visited)
+                edges.append(edge)
+                if dep not in visited:
+                    visited.add(dep)
+                    stack.append(self._graph_neighbours(dep))
+                    break
+            else:
+                stack.pop()
                 
+    def _graph_neighbours(self, component):
+        """Yield (edge, neighbour) for a component's dependencies, then its dependents"""
+        for dep_type, dep in self.index['relationships'].get(component, ()):
+            yield (component, dep), dep
+            
+        for dep_type, dep in self.index['reverse_relationships'].get(component, ()):
+            yield (dep, component), dep
+            
     def _sanitize_dot_id(self, text):
         """Sanitize text for use as a DOT node ID"""
         # Replace problematic characters
@@ -566,66 +866,249 @@ class EDK2SearchIndex:
         text = text.replace('"', '\\"')
         return text
         
-    def _save_progress_cache(self):
-        """Save progress cache during parsing"""
-        if not self.dsc_info:
+    def _save_progress_cache(self, force=False):
+        """Save progress cache during parsing, at most every PROGRESS_SAVE_INTERVAL seconds"""
+        # Snapshots only help a run that may be interrupted and picked up again
+        if not self.resumable or not self.dsc_info:
+            return
+            
+        if not force and time.monotonic() - self._last_progress_save < PROGRESS_SAVE_INTERVAL:
             return
             
         # Generate progress cache filename
-        dsc_hash = hashlib.md5(self.dsc_info.get('path', '').encode()).hexdigest()[:8]
+        dsc_hash = _dsc_cache_hash(self.dsc_info.get('path', ''))
         progress_cache_path = Path(f".edk2_search_progress_{dsc_hash}.pkl")
+        temp_path = progress_cache_path.with_name(progress_cache_path.name + '.tmp')
         
         try:
-            with open(progress_cache_path, 'wb') as f:
+            # Write aside and rename so an interrupted save never leaves a torn file
+            with open(temp_path, 'wb', buffering=1 << 20) as f:
                 pickle.dump({
                     'dsc_info': self.dsc_info,
                     'index': self.index
-                }, f)
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, progress_cache_path)
         except Exception as e:
             print(f"Warning: Could not save progress cache: {e}")
+            
+        self._last_progress_save = time.monotonic()
     
     def save_cache(self, cache_path=None):
         """Save the index to a cache file"""
         if cache_path is None:
             # Generate cache filename based on DSC
-            dsc_hash = hashlib.md5(self.dsc_info.get('path', '').encode()).hexdigest()[:8]
+            dsc_hash = _dsc_cache_hash(self.dsc_info.get('path', ''))
             cache_path = Path(f".edk2_search_cache_{dsc_hash}.pkl")
             
-        with open(cache_path, 'wb') as f:
+        try:
+            stamp = self._cache_stamp(self.dsc_info['path'], self.macros)
+        except (KeyError, OSError):
+            stamp = None
+            
+        with open(cache_path, 'wb', buffering=1 << 20) as f:
             pickle.dump({
                 'dsc_info': self.dsc_info,
+                'stamp': stamp,
                 'index': self.index
-            }, f)
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
             
         print(f"Cache saved to: {cache_path}")
         
         # Clean up progress cache if it exists
-        dsc_hash = hashlib.md5(self.dsc_info.get('path', '').encode()).hexdigest()[:8]
+        dsc_hash = _dsc_cache_hash(self.dsc_info.get('path', ''))
         progress_cache_path = Path(f".edk2_search_progress_{dsc_hash}.pkl")
         if progress_cache_path.exists():
             progress_cache_path.unlink()
             
         return cache_path
         
-    def load_cache(self, cache_path):
-        """Load the index from a cache file"""
-        with open(cache_path, 'rb') as f:
+    def load_cache(self, cache_path, dsc_path=None, macros=None):
+        """
+        Load the index from a cache file
+        
+        If dsc_path is given, the cache is only used when it was built from the
+        same DSC contents (by mtime and size), arch, PACKAGES_PATH and macros.
+        Returns False, leaving the index untouched, when it is out of date.
+        """
+        with open(cache_path, 'rb', buffering=1 << 20) as f:
             data = pickle.load(f)
-            self.dsc_info = data['dsc_info']
-            self.index = data['index']
             
+        if dsc_path is not None:
+            try:
+                current = self._cache_stamp(dsc_path, macros)
+            except OSError:
+                current = None
+            if current is None or data.get('stamp') != current:
+                print(f"Cache {cache_path} is out of date, rebuilding")
+                return False
+                
+        self.dsc_info = data['dsc_info']
+        self.index = data['index']
+        self.macros = dict(data['stamp']['macros']) if data.get('stamp') else {}
+        self._stamp = data.get('stamp')
+        self._reset_search_index()
+        
         print(f"Cache loaded from: {cache_path}")
         return True
+        
+    def _cache_stamp(self, dsc_path, macros):
+        """Inputs a cached index depends on, compared before reusing it"""
+        dsc_stat = os.stat(dsc_path)
+        return {
+            'dsc_mtime_ns': dsc_stat.st_mtime_ns,
+            'dsc_size': dsc_stat.st_size,
+            'arch': self.arch,
+            'packages_path': self.packages_path,
+            'macros': sorted((str(k), str(v)) for k, v in (macros or {}).items()),
+        }
+        
+    def is_stale(self):
+        """Whether the DSC has changed (or gone) since the index was built"""
+        if self._stamp is None:
+            return False
+        try:
+            return self._cache_stamp(self.dsc_info['path'], self.macros) != self._stamp
+        except (KeyError, OSError):
+            return True
+
+
+def _read_module(workspace_db, module_path, module_guid, arch):
+    """Parse a module INF into a plain (picklable) index entry, or None if it has no build data"""
+    module_key = str(module_path)
+    
+    # Get module build data
+    module_data = workspace_db.BuildObject[module_path, arch, "RELEASE", "VS2019"]
+    
+    if not module_data:
+        return None
+        
+    module_entry = {
+        'path': module_key,
+        'name': getattr(module_data, 'BaseName', None) or Path(module_key).stem,
+        'guid': module_guid,
+        'module_type': getattr(module_data, 'ModuleType', None),
+        'sources': [],
+        'libraries': [],
+        'packages': [],
+    }
+    
+    # getattr with a default reads each BuildData property once; hasattr evaluated it twice
+    for source in getattr(module_data, 'Sources', ()):
+        module_entry['sources'].append(str(source))
+        
+    for lib_class in getattr(module_data, 'LibraryClasses', ()):
+        module_entry['libraries'].append(lib_class)
+        
+    for package in getattr(module_data, 'Packages', ()):
+        module_entry['packages'].append(str(package.MetaFile))
+            
+    return module_entry
+
+
+# Per-process state for module indexing workers
+_worker_index = None
+_worker_db = None
+
+
+def _init_index_worker(workspace_dir, packages_path, arch, command_line_defines, platform_defines):
+    """Set up the BaseTools environment in a pool worker"""
+    global _worker_index, _worker_db
+    _worker_index = EDK2SearchIndex(workspace_dir, packages_path, arch, jobs=1)
+    GlobalData.gCommandLineDefines.update(command_line_defines)
+    GlobalData.gPlatformDefines.update(platform_defines)
+    # The workspace database is not fork-safe, so each worker builds its own on first use
+    _worker_db = None
+
+
+def _index_module_worker(task):
+    """Pool task: parse one module INF in a worker process"""
+    global _worker_db
+    module_key, module_guid = task
+    
+    if _worker_db is None:
+        _worker_db = WorkspaceDatabase()
+        
+    module_path = PathClass(module_key, str(_worker_index.workspace_dir))
+    try:
+        return _read_module(_worker_db, module_path, module_guid, _worker_index.arch)
+    except Exception as e:
+        # Pool.imap re-raises this in the parent, so it aborts parse_dsc like the serial path;
+        # only the message crosses the process boundary since BaseTools errors may not pickle
+        raise ModuleIndexError(f"Failed to index module {module_key}: {e}") from None
+
+
+# Macro references in DSC conditionals; bytes patterns so the DSC needn't be decoded
+_IF_MACRO_PATTERN = re.compile(rb'!if\s+.*?\$\(([A-Z_][A-Z0-9_]*)\)', re.IGNORECASE)
+_IFDEF_MACRO_PATTERN = re.compile(rb'!ifdef\s+([A-Z_][A-Z0-9_]*)', re.IGNORECASE)
+
+
+def _dsc_cache_hash(dsc_path):
+    """Short hash of a DSC's absolute path, used to name its cache files"""
+    # Hashing the absolute path means every entry point and working directory agree on the name
+    return hashlib.blake2b(os.path.abspath(dsc_path).encode(), digest_size=4).hexdigest()
+
+
+def _hash_file(path):
+    """SHA-1 hex digest of a file's contents, or '' if it can't be read"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return ''
+
+
+def _read_bytes(path):
+    """Read a whole file with one open/fstat/read, skipping the io layer's extra probes"""
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0) | getattr(os, 'O_CLOEXEC', 0))
+    try:
+        size = os.fstat(fd).st_size
+        # Asking for one byte more than st_size shows whether the file grew since the fstat
+        data = os.read(fd, size + 1)
+        if len(data) <= size:
+            return data
+        
+        chunks = [data]
+        while True:
+            chunk = os.read(fd, 1 << 16)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b''.join(chunks)
+    finally:
+        os.close(fd)
+
+
+def _scan_dsc_macros(dsc_path):
+    """Return the macro names referenced by one DSC's conditionals"""
+    macros = set()
+    dsc_path = Path(dsc_path)
+    
+    # Parse DSC for conditional statements
+    if dsc_path.exists():
+        content = _read_bytes(dsc_path)
+        
+        # Find !if statements
+        macros.update(name.decode() for name in _IF_MACRO_PATTERN.findall(content))
+        
+        # Find !ifdef statements
+        macros.update(name.decode() for name in _IFDEF_MACRO_PATTERN.findall(content))
+        
+    return macros
 
 
 def discover_macros(dsc_path, workspace_dir=None):
     """
     Scan DSC and referenced INF files to discover candidate -D macros
     
-    This helps identify build options that might be needed
+    This helps identify build options that might be needed. dsc_path may
+    also be a list of DSC files, which are scanned concurrently.
     """
+    if isinstance(dsc_path, (str, os.PathLike)):
+        dsc_paths = [dsc_path]
+    else:
+        dsc_paths = list(dsc_path)
+        
     macros = set()
-    dsc_path = Path(dsc_path)
     
     # Common EDK2 macros
     common_macros = [
@@ -639,24 +1122,322 @@ def discover_macros(dsc_path, workspace_dir=None):
         'HTTP_BOOT_ENABLE',
     ]
     
-    # Parse DSC for conditional statements
-    if dsc_path.exists():
-        content = dsc_path.read_text()
-        
-        # Find !if statements
-        if_pattern = re.compile(r'!if\s+.*?\$\(([A-Z_][A-Z0-9_]*)\)', re.IGNORECASE)
-        macros.update(if_pattern.findall(content))
-        
-        # Find !ifdef statements
-        ifdef_pattern = re.compile(r'!ifdef\s+([A-Z_][A-Z0-9_]*)', re.IGNORECASE)
-        macros.update(ifdef_pattern.findall(content))
-        
+    if len(dsc_paths) > 1:
+        # The scans are short and mostly wait on file reads, so threads beat a process pool here
+        with ThreadPoolExecutor(max_workers=min(len(dsc_paths), os.cpu_count() or 1)) as executor:
+            for found in executor.map(_scan_dsc_macros, dsc_paths):
+                macros.update(found)
+    else:
+        for path in dsc_paths:
+            macros.update(_scan_dsc_macros(path))
+            
     # Add common macros
     macros.update(common_macros)
     
     return sorted(macros)
 
 
+def load_or_build_index(args, macros, use_cache=True):
+    """
+    Create the indexer for args.dsc, reusing its cache file when it is current
+    
+    A missing or out-of-date cache means parsing the DSC. The fresh index is
+    saved when --write-cache was given or an older cache is being replaced.
+    """
+    # DSCs live at <workspace>/<Package>/<Platform>.dsc; checking for '/' missed Windows paths
+    dsc_abs = os.path.abspath(args.dsc)
+    dsc_parents = Path(dsc_abs).parents
+    workspace = dsc_parents[1] if len(dsc_parents) > 1 else Path.cwd()
+    indexer = EDK2SearchIndex(
+        workspace_dir=workspace,
+        packages_path=args.packages_path,
+        arch=args.arch[0],
+        jobs=args.jobs,
+        resumable=args.resumable
+    )
+    
+    cache_path = Path(f".edk2_search_cache_{_dsc_cache_hash(dsc_abs)}.pkl")
+    cache_exists = use_cache and cache_path.exists()
+    if cache_exists and indexer.load_cache(cache_path, args.dsc, macros):
+        return indexer
+        
+    if use_cache and not cache_exists and not args.write_cache:
+        print("Building index (use --write-cache to save for next time)...")
+    indexer.parse_dsc(args.dsc, macros)
+    
+    # Replace an out-of-date cache even without --write-cache
+    if args.write_cache or cache_exists:
+        indexer.save_cache(cache_path)
+    return indexer
+
+
+# Handler _configure_logging installed on the root logger, if it installed one
+_log_handler = None
+
+
+def _configure_logging(verbose):
+    """Set the root logger up for this run; safe to call again with a different verbosity"""
+    if verbose:
+        level, fmt = logging.DEBUG, '%(asctime)s - %(levelname)s - %(message)s'
+    else:
+        level, fmt = logging.INFO, '%(levelname)s - %(message)s'
+    
+    global _log_handler
+    
+    # basicConfig does nothing once the root logger has handlers, which would
+    # leave an embedding process (or a second main() call) stuck at its old level
+    root = logging.getLogger()
+    root.setLevel(level)
+    if _log_handler is None:
+        if root.handlers:
+            # Someone else owns the output; the root level is all we change
+            return
+        _log_handler = logging.StreamHandler()
+        root.addHandler(_log_handler)
+    _log_handler.setFormatter(logging.Formatter(fmt))
+
+
+def _print_json(data):
+    """Write --json output to stdout"""
+    if sys.stdout.isatty():
+        # Indented for people, streamed so the text is never built in one piece
+        json.dump(data, sys.stdout, indent=2)
+    else:
+        # Piped to another program: the compact one-shot encoder runs in C and is several times faster
+        sys.stdout.write(json.dumps(data))
+    sys.stdout.write('\n')
+
+
+def parse_macro_definitions(macro_defs):
+    """Turn -D arguments ('NAME=VALUE' or bare 'NAME' for TRUE) into a macro dict"""
+    macros = {}
+    for macro_def in macro_defs or ():
+        key, sep, value = macro_def.partition('=')
+        macros[key] = value if sep else "TRUE"
+    return macros
+
+
+def _handle_request(indexer, request):
+    """Answer one serve-mode request against the loaded index"""
+    if not isinstance(request, dict):
+        return {'error': 'request must be a JSON object'}
+        
+    op = request.get('op')
+    try:
+        if op == 'search':
+            # Refuse rather than answer from an index built for other inputs
+            if (os.path.abspath(request['dsc']) != os.path.abspath(indexer.dsc_info.get('path', '')) or
+                    request.get('arch', indexer.arch) != indexer.arch or
+                    request.get('macros', {}) != indexer.macros):
+                return {'error': 'index was built for a different DSC, arch or macros'}
+            if indexer.is_stale():
+                return {'error': 'DSC changed since the index was built'}
+            return {'result': indexer.search(request['query'], request.get('type', 'all'))}
+        if op == 'discover-macros':
+            return {'result': discover_macros(request['dsc'])}
+        return {'error': f"unknown op: {op}"}
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def _refresh_index(indexer, reload_index):
+    """Swap in a rebuilt index once the DSC has changed; keep the old one if that fails"""
+    if reload_index is None or not indexer.is_stale():
+        return indexer
+        
+    print("DSC changed since the index was built, reloading")
+    try:
+        return reload_index()
+    except Exception as e:
+        # The stale index only refuses searches until a reload succeeds
+        logging.error(f"Reloading index failed: {e}")
+        return indexer
+
+
+def _socket_path_free(socket_path):
+    """Clear socket_path for binding; False if it is not a socket or a server still answers there"""
+    try:
+        mode = os.stat(socket_path).st_mode
+    except FileNotFoundError:
+        return True
+        
+    if not stat.S_ISSOCK(mode):
+        return False
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except OSError:
+            # Left behind by a server that exited without cleaning up
+            os.unlink(socket_path)
+            return True
+    return False
+
+
+def serve_index(indexer, socket_path, reload_index=None):
+    """
+    Serve JSON-line requests for a loaded index on a Unix domain socket
+    
+    Each connection sends {"op": ..., ...} lines and gets back one
+    {"result": ...} or {"error": ...} line per request. When the DSC
+    changes, reload_index() is called for a fresh indexer if given.
+    """
+    if not _socket_path_free(socket_path):
+        print(f"Error: {socket_path} is in use or is not a socket")
+        return 1
+        
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen()
+    print(f"Serving {indexer.dsc_info.get('name', 'index')} on {socket_path} (set EDK2_SEARCH_SOCK to use it)")
+    
+    try:
+        while True:
+            conn, _ = server.accept()
+            # A client hanging up mid-reply only ends its own connection
+            try:
+                with conn, conn.makefile('rwb') as stream:
+                    for line in stream:
+                        try:
+                            request = json.loads(line)
+                            indexer = _refresh_index(indexer, reload_index)
+                            response = _handle_request(indexer, request)
+                        except ValueError as e:
+                            response = {'error': f"bad request: {e}"}
+                        stream.write(json.dumps(response).encode() + b'\n')
+                        stream.flush()
+            except OSError as e:
+                logging.debug(f"Search client connection dropped: {e}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        try:
+            os.unlink(socket_path)
+        except FileNotFoundError:
+            pass
+
+
+def _request_server(request):
+    """Send a request to the server named by $EDK2_SEARCH_SOCK; None if there isn't one or it can't answer"""
+    socket_path = os.environ.get('EDK2_SEARCH_SOCK')
+    if not socket_path or not hasattr(socket, 'AF_UNIX'):
+        return None
+        
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+            with sock.makefile('rwb') as stream:
+                stream.write(json.dumps(request).encode() + b'\n')
+                stream.flush()
+                response = json.loads(stream.readline())
+    except (OSError, ValueError) as e:
+        logging.debug(f"Search server at {socket_path} unavailable: {e}")
+        return None
+        
+    if 'error' in response:
+        logging.debug(f"Search server declined request: {response['error']}")
+        return None
+    return response['result']
+
+
+def _cmd_discover_macros(args):
+    """List candidate -D macros for the DSC file(s)"""
+    macros = discover_macros(args.dsc)
+    if args.json:
+        _print_json(macros)
+    else:
+        print("Discovered macros:")
+        for macro in macros:
+            print(f"  -D {macro}=<value>")
+
+
+def _cmd_build_set(args):
+    """Build (or load) the index and report its size"""
+    # Parse macros
+    macros = parse_macro_definitions(args.macros)
+    
+    # Build index
+    indexer = load_or_build_index(args, macros, use_cache=args.use_cache)
+    
+    # Generate graph if requested
+    if args.graph:
+        indexer.generate_graph(args.graph)
+    
+    # Output summary
+    if args.json:
+        summary = {
+            'dsc': indexer.dsc_info,
+            'modules': len(indexer.index['modules']),
+            'libraries': len(indexer.index['libraries']),
+            'packages': len(indexer.index['packages']),
+            'files': len(indexer.index['files']),
+        }
+        _print_json(summary)
+    else:
+        print(f"\nBuild set complete:")
+        print(f"  DSC: {indexer.dsc_info['name']}")
+        print(f"  Modules: {len(indexer.index['modules'])}")
+        print(f"  Libraries: {len(indexer.index['libraries'])}")
+        print(f"  Packages: {len(indexer.index['packages'])}")
+        print(f"  Files: {len(indexer.index['files'])}")
+
+
+def _cmd_search(args):
+    """Search the file set, through a running server when there is one"""
+    # Parse macros
+    macros = parse_macro_definitions(args.macros)
+    
+    # A running 'serve' process already has the index loaded; it resolves
+    # paths against its own working directory, so send ours resolved
+    results = _request_server({
+        'op': 'search',
+        'dsc': os.path.abspath(args.dsc),
+        'arch': args.arch[0],
+        'macros': macros,
+        'query': args.query,
+        'type': args.type,
+    })
+    
+    if results is None:
+        # Build or load index
+        indexer = load_or_build_index(args, macros)
+        
+        # Perform search
+        results = indexer.search(args.query, args.type)
+    
+    if args.json:
+        _print_json(results)
+    else:
+        print(f"\nSearch results for '{args.query}':")
+        print(f"Found {len(results)} matches\n")
+        
+        for result in results:
+            print(f"Type: {result['type']}")
+            print(f"Path: {result['path']}")
+            if result['type'] == 'file':
+                print(f"Used by: {', '.join(result['used_by'])}")
+            else:
+                info = result['info']
+                print(f"Name: {info.get('name', 'N/A')}")
+                if 'guid' in info and info['guid']:
+                    print(f"GUID: {info['guid']}")
+            print()
+
+
+def _cmd_serve(args):
+    """Keep the index loaded and answer search requests"""
+    if not hasattr(socket, 'AF_UNIX'):
+        print("Error: serve needs Unix domain socket support")
+        return 1
+        
+    # Parse macros
+    macros = parse_macro_definitions(args.macros)
+    
+    # Build or load index
+    indexer = load_or_build_index(args, macros)
+    return serve_index(indexer, args.socket, lambda: load_or_build_index(args, macros))
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='EDK2 DSC Search Tool - Parse and search EDK2 codebases',
@@ -677,6 +1458,10 @@ Examples:
   
   # Generate dependency graph
   %(prog)s build-set OvmfPkg/OvmfPkgX64.dsc --graph dependencies.dot
+  
+  # Keep the index loaded; searches with EDK2_SEARCH_SOCK set are answered by it
+  export EDK2_SEARCH_SOCK=$PWD/.edk2_search.sock
+  %(prog)s serve OvmfPkg/OvmfPkgX64.dsc &
         """
     )
     
@@ -696,6 +1481,10 @@ Examples:
                        default=['X64'],
                        help='Architecture(s) (default: X64)')
     
+    parser.add_argument('--jobs', '-j',
+                       type=int,
+                       help='Worker processes for module indexing (default: CPU count)')
+    
     parser.add_argument('-D',
                        action='append',
                        dest='macros',
@@ -709,6 +1498,10 @@ Examples:
                        action='store_true',
                        help='Write index to cache after building')
     
+    parser.add_argument('--resumable',
+                       action='store_true',
+                       help='Periodically save a progress cache while indexing')
+    
     parser.add_argument('--json',
                        action='store_true',
                        help='Output in JSON format')
@@ -722,7 +1515,8 @@ Examples:
     # discover-macros command
     discover_parser = subparsers.add_parser('discover-macros',
                                            help='Scan DSC to list candidate -D macros')
-    discover_parser.add_argument('dsc', help='DSC file path')
+    discover_parser.add_argument('dsc', nargs='+', help='DSC file path(s)')
+    discover_parser.set_defaults(func=_cmd_discover_macros)
     
     # build-set command
     build_parser = subparsers.add_parser('build-set',
@@ -736,6 +1530,7 @@ Examples:
     build_parser.add_argument('--verbose', '-v',
                              action='store_true',
                              help='Enable verbose logging for debugging')
+    build_parser.set_defaults(func=_cmd_build_set)
     
     # search command
     search_parser = subparsers.add_parser('search',
@@ -746,21 +1541,43 @@ Examples:
                               choices=['all', 'modules', 'libraries', 'packages', 'files'],
                               default='all',
                               help='Type of components to search')
+    search_parser.set_defaults(func=_cmd_search)
+    
+    # serve command
+    serve_parser = subparsers.add_parser('serve',
+                                        help='Keep an index loaded and answer searches over a Unix socket')
+    serve_parser.add_argument('dsc', help='DSC file path')
+    serve_parser.add_argument('--socket',
+                             default=os.environ.get('EDK2_SEARCH_SOCK', '.edk2_search.sock'),
+                             help='Socket path (default: $EDK2_SEARCH_SOCK or .edk2_search.sock)')
+    serve_parser.set_defaults(func=_cmd_serve)
     
     args = parser.parse_args()
     
     # Configure logging
-    if hasattr(args, 'verbose') and args.verbose:
-        logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
-    else:
-        logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    _configure_logging(getattr(args, 'verbose', False))
     
     # Handle --clone-edk2
     if args.clone_edk2:
         edk2_dir = Path(args.edk2_dir)
         if not edk2_dir.exists():
             print(f"Cloning EDK2 to {edk2_dir}...")
-            os.system(f'git clone --depth 1 https://github.com/tianocore/edk2.git {edk2_dir}')
+            clone_cmd = ['git', 'clone', '--depth=1', '--single-branch',
+                         'https://github.com/tianocore/edk2.git', str(edk2_dir)]
+            for attempt in range(1, CLONE_ATTEMPTS + 1):
+                try:
+                    subprocess.run(clone_cmd, check=True)
+                    break
+                except FileNotFoundError:
+                    print("Error: git not found on PATH")
+                    return 1
+                except subprocess.CalledProcessError as e:
+                    # A failed clone can leave a partial directory that would block the retry
+                    shutil.rmtree(edk2_dir, ignore_errors=True)
+                    if attempt == CLONE_ATTEMPTS:
+                        print(f"Error: git clone failed with exit code {e.returncode}")
+                        return 1
+                    print(f"git clone failed (attempt {attempt}/{CLONE_ATTEMPTS}), retrying...")
         else:
             print(f"EDK2 already exists at {edk2_dir}")
         return
@@ -771,127 +1588,12 @@ Examples:
         print(f"Run with --clone-edk2 to download it")
         return 1
     
-    # Process commands
-    if args.command == 'discover-macros':
-        macros = discover_macros(args.dsc)
-        if args.json:
-            print(json.dumps(macros, indent=2))
-        else:
-            print("Discovered macros:")
-            for macro in macros:
-                print(f"  -D {macro}=<value>")
-                
-    elif args.command == 'build-set':
-        # Parse macros
-        macros = {}
-        if args.macros:
-            for macro_def in args.macros:
-                if '=' in macro_def:
-                    key, value = macro_def.split('=', 1)
-                    macros[key] = value
-                else:
-                    macros[macro_def] = "TRUE"
-        
-        # Build index
-        workspace = Path(args.dsc).parent.parent if '/' in args.dsc else Path.cwd()
-        indexer = EDK2SearchIndex(
-            workspace_dir=workspace,
-            packages_path=args.packages_path,
-            arch=args.arch[0]
-        )
-        
-        # Check cache
-        cache_path = None
-        if args.use_cache:
-            dsc_hash = hashlib.md5(args.dsc.encode()).hexdigest()[:8]
-            cache_path = Path(f".edk2_search_cache_{dsc_hash}.pkl")
-            if cache_path.exists():
-                indexer.load_cache(cache_path)
-            else:
-                indexer.parse_dsc(args.dsc, macros)
-                if args.write_cache:
-                    indexer.save_cache(cache_path)
-        else:
-            indexer.parse_dsc(args.dsc, macros)
-            if args.write_cache:
-                indexer.save_cache()
-        
-        # Generate graph if requested
-        if args.graph:
-            indexer.generate_graph(args.graph)
-        
-        # Output summary
-        if args.json:
-            summary = {
-                'dsc': indexer.dsc_info,
-                'modules': len(indexer.index['modules']),
-                'libraries': len(indexer.index['libraries']),
-                'packages': len(indexer.index['packages']),
-                'files': len(indexer.index['files']),
-            }
-            print(json.dumps(summary, indent=2))
-        else:
-            print(f"\nBuild set complete:")
-            print(f"  DSC: {indexer.dsc_info['name']}")
-            print(f"  Modules: {len(indexer.index['modules'])}")
-            print(f"  Libraries: {len(indexer.index['libraries'])}")
-            print(f"  Packages: {len(indexer.index['packages'])}")
-            print(f"  Files: {len(indexer.index['files'])}")
-            
-    elif args.command == 'search':
-        # Parse macros
-        macros = {}
-        if args.macros:
-            for macro_def in args.macros:
-                if '=' in macro_def:
-                    key, value = macro_def.split('=', 1)
-                    macros[key] = value
-                else:
-                    macros[macro_def] = "TRUE"
-        
-        # Build or load index
-        workspace = Path(args.dsc).parent.parent if '/' in args.dsc else Path.cwd()
-        indexer = EDK2SearchIndex(
-            workspace_dir=workspace,
-            packages_path=args.packages_path,
-            arch=args.arch[0]
-        )
-        
-        # Try to load from cache first
-        dsc_hash = hashlib.md5(args.dsc.encode()).hexdigest()[:8]
-        cache_path = Path(f".edk2_search_cache_{dsc_hash}.pkl")
-        if cache_path.exists():
-            indexer.load_cache(cache_path)
-        else:
-            print("Building index (use --write-cache to save for next time)...")
-            indexer.parse_dsc(args.dsc, macros)
-        
-        # Perform search
-        results = indexer.search(args.query, args.type)
-        
-        if args.json:
-            print(json.dumps(results, indent=2))
-        else:
-            print(f"\nSearch results for '{args.query}':")
-            print(f"Found {len(results)} matches\n")
-            
-            for result in results:
-                print(f"Type: {result['type']}")
-                print(f"Path: {result['path']}")
-                if result['type'] == 'file':
-                    print(f"Used by: {', '.join(result['used_by'])}")
-                else:
-                    info = result['info']
-                    print(f"Name: {info.get('name', 'N/A')}")
-                    if 'guid' in info and info['guid']:
-                        print(f"GUID: {info['guid']}")
-                print()
-                
-    else:
+    # Run the selected subcommand
+    if not hasattr(args, 'func'):
         parser.print_help()
         return 1
     
-    return 0
+    return args.func(args) or 0
 
 
 if __name__ == '__main__':
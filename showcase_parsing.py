@@ -2,6 +2,7 @@
 Showcase the real DSC parsing capabilities
 """
 import sys
+from collections import defaultdict
 from pathlib import Path
 
 # Add edk2_navigator to path
@@ -38,12 +39,9 @@ def main():
     
     # Show module breakdown by type
     print("📋 Module Breakdown by Type:")
-    module_types = {}
+    module_types = defaultdict(list)
     for module in context.included_modules:
-        module_type = module.type
-        if module_type not in module_types:
-            module_types[module_type] = []
-        module_types[module_type].append(module)
+        module_types[module.type].append(module)
     
     for module_type, modules in sorted(module_types.items()):
         print(f"   {module_type:20} : {len(modules):3d} modules")
@@ -62,7 +60,8 @@ def main():
     ]
     
     for module_type, description in interesting_modules:
-        modules_of_type = [m for m in context.included_modules if m.type == module_type]
+        # Reuse the grouping above instead of rescanning every module per type
+        modules_of_type = module_types.get(module_type)
         if modules_of_type:
             module = modules_of_type[0]  # Show first one
             print(f"   {description:20} : {module.name}")